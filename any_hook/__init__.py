@@ -1,11 +1,31 @@
-from any_hook.__main__ import Main
-from any_hook._file_data import FileData
+import sys
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from any_hook.__main__ import Main
+    from any_hook._file_data import FileData
+
+_LAZY_ATTRIBUTES = {
+    "Main": "any_hook.__main__",
+    "FileData": "any_hook._file_data",
+}
 
 
 class _Main:
     def __call__(self) -> bool:
-        return Main().cli_cmd()
+        if sys.argv[1:2] == ["daemon"]:
+            daemon = import_module("any_hook._daemon")
+            daemon.Daemon(_cli_parse_args=sys.argv[2:]).cli_cmd()
+            return False
+        return bool(import_module("any_hook.__main__").Main().cli_cmd())
+
+
+def __getattr__(name: str) -> object:
+    if name in _LAZY_ATTRIBUTES:
+        return import_module(_LAZY_ATTRIBUTES[name]).__dict__[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 main = _Main()
-__all__ = ["main", "FileData"]
+__all__ = ["main", "Main", "FileData"]
@@ -1,21 +1,22 @@
 from __future__ import annotations
 
 import importlib.util
+import multiprocessing
+import os
 from pathlib import Path
-from typing import TYPE_CHECKING, Annotated, ClassVar, Optional, Union
+from typing import TYPE_CHECKING, ClassVar, Optional
 
-import libcst
-from pydantic import Field, TypeAdapter, field_validator
+from pydantic import Field, SerializeAsAny, field_validator
 from pydantic_settings import (
     BaseSettings,
     CliPositionalArg,
     SettingsConfigDict,
 )
-from subclass_getter import get_subclasses
 
-from any_hook._file_data import FileData
-from any_hook._transaction import transaction
-from any_hook.files_modifiers import AnyModifier, Modifier
+from any_hook._pipeline import run_pipeline
+from any_hook._transaction import dry_run, transaction
+from any_hook.files_modifiers import Modifier
+from any_hook.files_modifiers._registry import validate_modifiers
 from any_hook.files_modifiers.agito import Agito
 
 
@@ -25,12 +26,13 @@ class Main(BaseSettings):
     )
     paths: CliPositionalArg[list[Path]]
     external_modifiers_path: Optional[Path] = None
-    modifiers: tuple[AnyModifier, ...] = Field(min_length=1)
+    modifiers: tuple[SerializeAsAny[Modifier], ...] = Field(min_length=1)
     convert_to_agito: bool = True
+    jobs: int = Field(default_factory=lambda: os.cpu_count() or 1, ge=1)
+    cache_dir: Optional[Path] = None
+    journal_dir: Optional[Path] = None
+    check: bool = False
 
-    _modifiers_adapter: ClassVar[TypeAdapter[tuple[AnyModifier, ...]]] = (
-        TypeAdapter(tuple[AnyModifier, ...])
-    )
     _loaded_external_path: ClassVar[Optional[Path]] = None
 
     @field_validator("external_modifiers_path")
@@ -51,46 +53,36 @@ class Main(BaseSettings):
             module = importlib.util.module_from_spec(spec)
             spec.loader.exec_module(module)
             cls._loaded_external_path = path
-            extended_union = Annotated[
-                Union.__getitem__(
-                    tuple(
-                        class_
-                        for class_ in get_subclasses(Modifier)
-                        if "type" in class_.model_fields
-                    )
-                ),
-                Field(discriminator="type"),
-            ]
-            new_annotation = Annotated[
-                tuple[extended_union, ...], Field(min_length=1)
-            ]
-            Agito.model_fields["modifiers"].annotation = new_annotation
-            Agito.model_rebuild(force=True)
-            cls._modifiers_adapter = TypeAdapter(new_annotation)
             return path
 
     @field_validator("modifiers", mode="plain")
     @classmethod
-    def _validate_modifiers(cls, data: object) -> tuple[AnyModifier, ...]:
-        return cls._modifiers_adapter.validate_python(data)
+    def _validate_modifiers(cls, data: object) -> tuple[Modifier, ...]:
+        return validate_modifiers(data)
 
     def cli_cmd(self) -> bool:
-        with transaction(self.paths) as (paths, contents):
-            files_data = tuple(
-                map(
-                    lambda path, content_: FileData(
-                        path, content_, libcst.parse_module(content_)
-                    ),
-                    paths,
-                    contents,
-                )
-            )
+        session = (
+            dry_run(self.paths)
+            if self.check
+            else transaction(self.paths, self.journal_dir)
+        )
+        with session as paths:
             modifiers: tuple[Modifier, ...] = (
                 (Agito(modifiers=self.modifiers),)
                 if self.convert_to_agito
                 else self.modifiers
             )
-            return any(list(map(lambda m: m.modify(files_data), modifiers)))
+            return run_pipeline(modifiers, paths, self._jobs(), self.cache_dir)
+
+    def _jobs(self) -> int:
+        # Workers that are not forked unpickle the modifiers by importing
+        # their modules, and the external one cannot be imported by name
+        if (
+            self.external_modifiers_path is not None
+            and multiprocessing.get_start_method() != "fork"
+        ):
+            return 1
+        return self.jobs
 
 
 if __name__ == "__main__":  # pragma: no cover
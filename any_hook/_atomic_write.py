@@ -0,0 +1,40 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+
+def replace_atomically(
+    path: Path, data: str | bytes, sync: bool = True
+) -> None:
+    """Replaces the content of path, following symlinks and keeping its
+    mode, so readers see either the old content or the new one. A failed
+    write leaves no temporary file behind. With sync, the data reaches the
+    disk before the rename; cache entries, which can be rebuilt, skip it."""
+    target = path.resolve()
+    descriptor, temporary = tempfile.mkstemp(
+        dir=target.parent, prefix=f".{target.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(
+            descriptor, "wb" if isinstance(data, bytes) else "w"
+        ) as file:
+            file.write(data)
+            if sync:
+                file.flush()
+                os.fsync(file.fileno())
+        if target.exists():
+            shutil.copymode(target, temporary)
+        os.replace(temporary, target)
+    except BaseException:
+        Path(temporary).unlink(missing_ok=True)
+        raise
+
+
+def write_cache_entry(directory: Path, entry: Path, data: str | bytes) -> None:
+    """Writes entry of the cache kept in directory, which git ignores."""
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    gitignore = directory / ".gitignore"
+    if not gitignore.exists():
+        gitignore.write_text("*\n")
+    replace_atomically(entry, data, sync=False)
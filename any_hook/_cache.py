@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Optional
+
+from any_hook._atomic_write import write_cache_entry
+from any_hook._version import package_version
+from any_hook.files_modifiers._base import Modifier
+
+CachedResult = tuple[bool, tuple[tuple[int, str], ...]]
+
+
+def _strip_outputs(value: object) -> object:
+    if isinstance(value, dict):
+        return {
+            key: _strip_outputs(item)
+            for key, item in value.items()
+            if key != "outputs"
+        }
+    if isinstance(value, list):
+        return [_strip_outputs(item) for item in value]
+    return value
+
+
+class ResultCache:
+    """On-disk cache of per-file pipeline results.
+
+    Entries are keyed by the file path and content, the configuration of
+    every per-file modifier and the any-hook version, so editing a file,
+    changing the hook configuration or upgrading any-hook invalidates them.
+    Only results of files the pipeline left untouched are stored: for
+    transformers such an entry marks a known fixed point, for checkers it
+    holds the violation messages to replay.
+
+    Note:
+        Output channels are not part of the key, so the same cache serves
+        runs that only differ in where messages go. Changes to external
+        modifier code are not detected; clear the directory after editing
+        an external modifiers file.
+    """
+
+    def __init__(self, directory: Path, modifiers: Sequence[Modifier]) -> None:
+        self._directory = directory
+        configuration = json.dumps(
+            [
+                [
+                    type(modifier).__module__,
+                    type(modifier).__qualname__,
+                    _strip_outputs(modifier.model_dump(mode="json")),
+                ]
+                for modifier in modifiers
+            ],
+            sort_keys=True,
+            default=str,
+        )
+        self._salt = hashlib.sha256(
+            f"{package_version()}\0{configuration}".encode()
+        ).digest()
+
+    def load(self, path: Path, content: str) -> Optional[CachedResult]:
+        try:
+            entry = json.loads(self._entry(path, content).read_text())
+            return bool(entry["changed"]), tuple(
+                (int(index), str(text)) for index, text in entry["messages"]
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def store(self, path: Path, content: str, result: CachedResult) -> None:
+        changed, messages = result
+        write_cache_entry(
+            self._directory,
+            self._entry(path, content),
+            json.dumps({"changed": changed, "messages": messages}),
+        )
+
+    def _entry(self, path: Path, content: str) -> Path:
+        digest = hashlib.sha256(
+            self._salt + f"{path}\0{content}".encode()
+        ).hexdigest()
+        return self._directory / digest[:2] / f"{digest}.json"
@@ -0,0 +1,63 @@
+import hashlib
+import json
+import os
+import socket
+import sys
+import tempfile
+from importlib import import_module
+from pathlib import Path
+from typing import Optional
+
+from any_hook._version import package_version
+
+
+def default_socket_path() -> Path:
+    """Per-user socket path, distinct for every installation and version
+    so a daemon never serves a client that runs different code."""
+    installation = f"{Path(__file__).resolve().parent}\0{package_version()}"
+    digest = hashlib.sha256(installation.encode()).hexdigest()[:16]
+    return Path(tempfile.gettempdir()) / (
+        f"any-hook-{os.getuid()}-{digest}.sock"
+    )
+
+
+def main() -> int:
+    """Runs any-hook through the daemon when one is listening and
+    in-process otherwise, with the same arguments and exit code.
+
+    Only the standard library is imported up front, so a run served by the
+    daemon never pays for importing pydantic, libcst or the modifiers.
+    """
+    connection = (
+        None if sys.platform == "win32" else _connect(default_socket_path())
+    )
+    if connection is None:
+        return int(import_module("any_hook").main())
+    request = {
+        "argv": sys.argv[1:],
+        "cwd": os.getcwd(),
+        "env": dict(os.environ),
+    }
+    with connection, connection.makefile("rwb") as stream:
+        stream.write(json.dumps(request).encode() + b"\n")
+        stream.flush()
+        for line in stream:
+            message = json.loads(line)
+            if "exit" in message:
+                return int(message["exit"])
+            if message["stream"] == "stdout":
+                sys.stdout.write(message["data"])
+            else:
+                sys.stderr.write(message["data"])
+    sys.stderr.write("any-hook daemon closed the connection\n")
+    return 1
+
+
+def _connect(path: Path) -> Optional[socket.socket]:
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(str(path))
+    except OSError:
+        connection.close()
+        return None
+    return connection
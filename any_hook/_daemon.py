@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import socketserver
+import traceback
+from collections.abc import Generator, Mapping
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+from io import BufferedIOBase, TextIOBase
+from pathlib import Path
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+from any_hook.__main__ import Main
+from any_hook._client import default_socket_path
+
+
+def _send(wfile: BufferedIOBase, message: Mapping[str, object]) -> None:
+    wfile.write(json.dumps(message).encode() + b"\n")
+    wfile.flush()
+
+
+class _FrameWriter(TextIOBase):
+    """Text stream forwarding every write to the client as a JSON frame."""
+
+    def __init__(self, wfile: BufferedIOBase, stream: str) -> None:
+        super().__init__()
+        self._wfile = wfile
+        self._stream = stream
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        _send(self._wfile, {"stream": self._stream, "data": text})
+        return len(text)
+
+
+@contextmanager
+def _client_context(
+    cwd: str, env: Mapping[str, str]
+) -> Generator[None, None, None]:
+    previous_cwd = os.getcwd()
+    previous_env = dict(os.environ)
+    os.chdir(cwd)
+    os.environ.clear()
+    os.environ.update(env)
+    try:
+        yield
+    finally:
+        os.chdir(previous_cwd)
+        os.environ.clear()
+        os.environ.update(previous_env)
+
+
+def _exit_code(exit_: SystemExit) -> int:
+    if isinstance(exit_.code, int):
+        return exit_.code
+    return int(exit_.code is not None)
+
+
+def _run(argv: list[str]) -> int:
+    try:
+        return int(Main(_cli_parse_args=argv).cli_cmd())
+    except SystemExit as exit_:
+        return _exit_code(exit_)
+    except Exception:
+        traceback.print_exc()
+        return 1
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        request = json.loads(self.rfile.readline())
+        with (
+            _client_context(request["cwd"], request["env"]),
+            redirect_stdout(_FrameWriter(self.wfile, "stdout")),
+            redirect_stderr(_FrameWriter(self.wfile, "stderr")),
+        ):
+            code = _run(request["argv"])
+        _send(self.wfile, {"exit": code})
+
+
+class _Server(socketserver.UnixStreamServer):
+    idle = False
+
+    def handle_timeout(self) -> None:
+        self.idle = True
+
+
+def _is_served(path: Path) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        try:
+            connection.connect(str(path))
+        except OSError:
+            return False
+    return True
+
+
+class Daemon(BaseSettings):
+    """Serves any-hook runs over a Unix socket from a resident process.
+
+    Imports, the modifier union and its validators are built once when the
+    daemon starts, and module-level caches such as compiled regexes stay
+    warm between runs. Each request runs `Main` with the client's arguments
+    in the client's working directory and environment, streaming stdout and
+    stderr back as they are written. Requests are served one at a time.
+
+    Examples:
+        Start the daemon, then run hooks through the client:
+
+            $ any-hook daemon &
+            $ any-hook-client src/*.py --modifiers '[{"type": "len-as-bool"}]'
+
+    Note:
+        The daemon exits after idle_timeout seconds without a request and
+        removes its socket. Clients fall back to an in-process run when no
+        daemon is listening.
+    """
+
+    model_config = SettingsConfigDict(
+        cli_parse_args=True,
+        cli_prog_name="any-hook daemon",
+    )
+    socket_path: Path = Field(
+        default_factory=default_socket_path,
+        description="Unix socket to listen on. Defaults to the path the client connects to.",
+    )
+    idle_timeout: float = Field(
+        default=3600,
+        gt=0,
+        description="Seconds without a request after which the daemon exits.",
+    )
+
+    def cli_cmd(self) -> None:
+        if _is_served(self.socket_path):
+            raise ValueError(
+                f"A daemon is already listening on {self.socket_path}"
+            )
+        self.socket_path.unlink(missing_ok=True)
+        previous_umask = os.umask(0o077)
+        try:
+            server = _Server(str(self.socket_path), _RequestHandler)
+        finally:
+            os.umask(previous_umask)
+        server.timeout = self.idle_timeout
+        try:
+            with server:
+                while not server.idle:
+                    server.handle_request()
+        finally:
+            self.socket_path.unlink(missing_ok=True)
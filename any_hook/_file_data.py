@@ -1,10 +1,71 @@
+from collections.abc import Mapping
 from pathlib import Path
-from typing import NamedTuple
+from typing import Optional
 
-from libcst import Module
+from libcst import CSTNode, Module, parse_module
+from libcst.metadata import CodeRange, MetadataWrapper, PositionProvider
 
+from any_hook._line_index import LineIndex
+from any_hook._transaction import write_file
 
-class FileData(NamedTuple):
-    path: Path
-    content: str
-    module: Module
+
+class FileData:
+    """A source file handed to modifiers.
+
+    The libcst module is parsed on first access and memoized, so files that
+    every modifier rejects by a cheap check on `content` are never parsed.
+    An already parsed module may be passed in to skip the parse entirely.
+    Modifiers persist new content through `write`, which replaces the file
+    atomically, journals it in an active transaction and records that the
+    file on disk no longer matches `content` (in a dry run, that it would
+    not). The comment index used by
+    ignore checks and the node positions used in reports are likewise built
+    on first access, so files without findings never compute them.
+    """
+
+    __slots__ = (
+        "path",
+        "content",
+        "modified",
+        "_module",
+        "_line_index",
+        "_positions",
+    )
+
+    def __init__(
+        self, path: Path, content: str, module: Optional[Module] = None
+    ) -> None:
+        self.path = path
+        self.content = content
+        self.modified = False
+        self._module = module
+        self._line_index: Optional[LineIndex] = None
+        self._positions: Optional[Mapping[CSTNode, CodeRange]] = None
+
+    @property
+    def module(self) -> Module:
+        if self._module is None:
+            self._module = parse_module(self.content)
+        return self._module
+
+    @property
+    def line_index(self) -> LineIndex:
+        if self._line_index is None:
+            self._line_index = LineIndex(self.content)
+        return self._line_index
+
+    def position(self, node: CSTNode) -> CodeRange:
+        """Source range of a node of `module`, resolving the positions of
+        the whole tree on the first call."""
+        if self._positions is None:
+            self._positions = MetadataWrapper(
+                self.module, unsafe_skip_copy=True
+            ).resolve(PositionProvider)
+        return self._positions[node]
+
+    def write(self, content: str) -> None:
+        write_file(self.path, content)
+        self.modified = True
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(path={self.path!r})"
@@ -0,0 +1,56 @@
+import io
+import re
+import tokenize
+
+from libcst.metadata import CodeRange
+
+
+def _comments(content: str) -> dict[int, str]:
+    tokens = tokenize.generate_tokens(io.StringIO(content).readline)
+    try:
+        return {
+            token.start[0]: token.string
+            for token in tokens
+            if token.type == tokenize.COMMENT
+        }
+    except (tokenize.TokenError, SyntaxError):
+        return {
+            number: line[line.index("#") :]
+            for number, line in enumerate(content.splitlines(), 1)
+            if "#" in line
+        }
+
+
+class LineIndex:
+    """Comments of a source file by line number, read in one tokenize pass.
+
+    Lines whose comment matches an ignore pattern are computed once per
+    pattern, so checking whether a node is ignored only looks up the lines
+    it spans instead of scanning the whole file.
+    """
+
+    __slots__ = ("comments", "_ignored")
+
+    def __init__(self, content: str) -> None:
+        self.comments = _comments(content)
+        self._ignored: dict[re.Pattern[str], frozenset[int]] = {}
+
+    def ignored_lines(self, pattern: re.Pattern[str]) -> frozenset[int]:
+        if pattern not in self._ignored:
+            self._ignored[pattern] = frozenset(
+                number
+                for number, comment in self.comments.items()
+                if pattern.search(comment)
+            )
+        return self._ignored[pattern]
+
+    def is_ignored(
+        self, pattern: re.Pattern[str], position: CodeRange
+    ) -> bool:
+        """Whether a comment on any line spanned by position matches
+        pattern."""
+        ignored = self.ignored_lines(pattern)
+        return any(
+            number in ignored
+            for number in range(position.start.line, position.end.line + 1)
+        )
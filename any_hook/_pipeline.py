@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import NamedTuple, Optional, cast
+
+from any_hook._cache import ResultCache
+from any_hook._file_data import FileData
+from any_hook._transaction import (
+    Journal,
+    current_journal,
+    is_dry_run,
+    set_dry_run,
+    set_journal,
+)
+from any_hook.files_modifiers._base import Modifier, redirect_output
+from any_hook.files_modifiers.agito import Agito, split_whole_corpus
+from any_hook.files_modifiers.output import StandardOutput
+from any_hook.services import (
+    refresh_shared_import_path_trackers,
+    refresh_shared_module_indexes,
+    reset_shared_import_path_trackers,
+)
+
+
+class _FileResult(NamedTuple):
+    changed: bool
+    messages: tuple[tuple[int, str], ...]
+
+
+def _walk(modifiers: Iterable[Modifier]) -> Iterator[Modifier]:
+    for modifier in modifiers:
+        yield modifier
+        if isinstance(modifier, Agito):
+            yield from _walk(modifier.modifiers)
+
+
+class ExecutionPlan:
+    """Everything a run derives from its modifiers alone, worked out once in
+    the calling process and handed to the workers.
+
+    Building it compiles the ignore patterns and path filters of every
+    modifier, so forked workers inherit them ready to use. It also estimates
+    the cost of each file from its size, so the largest files are dispatched
+    first and do not end up as stragglers at the tail of a parallel run.
+    """
+
+    def __init__(self, modifiers: Iterable[Modifier]) -> None:
+        self.per_file, self.whole_corpus = split_whole_corpus(modifiers)
+        self.modifiers_by_index = tuple(_walk(self.per_file))
+        self.cacheable = all(
+            modifier.cacheable for modifier in self.modifiers_by_index
+        )
+        for modifier in self.modifiers_by_index:
+            modifier.precompile()
+
+    @staticmethod
+    def schedule(paths: Sequence[Path]) -> list[int]:
+        """Indexes of paths in the order to process them, largest first."""
+        return sorted(
+            range(len(paths)), key=lambda index: -_cost(paths[index])
+        )
+
+
+def _cost(path: Path) -> int:
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return 0
+
+
+class _FilePipeline:
+    """Runs per-file modifiers on a single file, recording every output
+    message together with the position of its modifier in the tree so the
+    parent process can replay it through its own copy of that modifier.
+
+    The file is read, parsed and released within one call, so only one tree
+    per process is alive at a time.
+    """
+
+    def __init__(
+        self, plan: ExecutionPlan, cache: Optional[ResultCache] = None
+    ) -> None:
+        self._modifiers = plan.per_file
+        self._cache = cache
+        self._indexes = {
+            id(modifier): index
+            for index, modifier in enumerate(plan.modifiers_by_index)
+        }
+
+    def __call__(self, path: Path) -> _FileResult:
+        content = path.read_text()
+        if self._cache is not None:
+            hit = self._cache.load(path, content)
+            if hit is not None:
+                return _FileResult(*hit)
+        file_data = FileData(path, content)
+        result = self._run(file_data)
+        if self._cache is not None and not file_data.modified:
+            self._cache.store(path, content, result)
+        return result
+
+    def _run(self, file_data: FileData) -> _FileResult:
+        messages: list[tuple[int, str]] = []
+
+        def record(modifier: Modifier, text: str) -> None:
+            messages.append((self._indexes.get(id(modifier), -1), text))
+
+        with redirect_output(record):
+            changed = any([m.modify((file_data,)) for m in self._modifiers])
+        return _FileResult(changed, tuple(messages))
+
+
+_worker_pipeline: Optional[_FilePipeline] = None
+
+
+def _init_worker(
+    plan: ExecutionPlan,
+    cache: Optional[ResultCache] = None,
+    journal: Optional[Journal] = None,
+    dry_run: bool = False,
+    import_cache_dir: Optional[Path] = None,
+) -> None:
+    global _worker_pipeline
+    _worker_pipeline = _FilePipeline(plan, cache)
+    set_journal(journal)
+    set_dry_run(dry_run)
+    reset_shared_import_path_trackers(import_cache_dir)
+
+
+def _run_in_worker(path: Path) -> _FileResult:
+    return cast(_FilePipeline, _worker_pipeline)(path)
+
+
+def _files_data(paths: Iterable[Path]) -> Iterator[FileData]:
+    for path in paths:
+        yield FileData(path, path.read_text())
+
+
+def run_pipeline(
+    modifiers: Iterable[Modifier],
+    paths: Iterable[Path],
+    jobs: int,
+    cache_dir: Optional[Path] = None,
+) -> bool:
+    """Runs modifiers over paths, streaming one file at a time.
+
+    Whole-corpus modifiers get a pass of their own first, each over a fresh
+    stream of the files. Every other modifier runs file by file: a file is
+    read, parsed, processed and released before the next one, in a process
+    pool of up to `jobs` workers when there is more than one file. Output
+    messages are replayed in the calling process in file order, so the
+    result does not depend on scheduling.
+
+    With `cache_dir` set, files whose result is already cached are not
+    parsed nor processed; their recorded messages are replayed instead.
+    Import resolution results are kept under its "imports" subdirectory,
+    which serves runs that cannot use the result cache as well.
+
+    What import resolution learns in this process outlives the run, less
+    what was derived from files changed since, so successive runs of a
+    daemon start warm.
+    """
+    paths = tuple(paths)
+    import_cache_dir = cache_dir / "imports" if cache_dir else None
+    refresh_shared_import_path_trackers(import_cache_dir)
+    refresh_shared_module_indexes()
+    plan = ExecutionPlan(modifiers)
+    changed = any([m.modify(_files_data(paths)) for m in plan.whole_corpus])
+    if not plan.per_file or not paths:
+        return changed
+    cache = (
+        ResultCache(cache_dir, plan.per_file)
+        if cache_dir is not None and plan.cacheable
+        else None
+    )
+    for result in _compute(plan, cache, import_cache_dir, paths, jobs):
+        for index, text in result.messages:
+            _replay(plan.modifiers_by_index, index, text)
+        changed = result.changed or changed
+    return changed
+
+
+def _compute(
+    plan: ExecutionPlan,
+    cache: Optional[ResultCache],
+    import_cache_dir: Optional[Path],
+    paths: Sequence[Path],
+    jobs: int,
+) -> Iterator[_FileResult]:
+    if jobs == 1 or len(paths) < 2:
+        yield from map(_FilePipeline(plan, cache), paths)
+        return
+    workers = min(jobs, len(paths))
+    order = plan.schedule(paths)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(
+            plan,
+            cache,
+            current_journal(),
+            is_dry_run(),
+            import_cache_dir,
+        ),
+    ) as executor:
+        try:
+            yield from _in_file_order(
+                order,
+                executor.map(
+                    _run_in_worker,
+                    [paths[index] for index in order],
+                    chunksize=max(1, len(paths) // (workers * 4)),
+                ),
+            )
+        except BaseException:
+            executor.shutdown(wait=True, cancel_futures=True)
+            raise
+
+
+def _in_file_order(
+    order: Sequence[int], results: Iterable[_FileResult]
+) -> Iterator[_FileResult]:
+    """Yields results computed in order as soon as every earlier file's
+    result is available."""
+    pending: dict[int, _FileResult] = {}
+    next_index = 0
+    for index, result in zip(order, results):
+        pending[index] = result
+        while next_index in pending:
+            yield pending.pop(next_index)
+            next_index += 1
+
+
+def _replay(
+    modifiers_by_index: tuple[Modifier, ...], index: int, text: str
+) -> None:
+    if index < 0:
+        StandardOutput().process(text)
+        return
+    modifiers_by_index[index]._output(text)
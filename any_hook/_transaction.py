@@ -1,25 +1,244 @@
 from __future__ import annotations
 
-from collections.abc import Generator, Iterable
+import ctypes
+import difflib
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+from collections.abc import Generator, Iterable, Iterator
 from contextlib import contextmanager
-from itertools import tee
+from contextvars import ContextVar
 from pathlib import Path
+from typing import Optional
+from uuid import uuid4
+
+from any_hook._atomic_write import replace_atomically
+
+
+def _digest(content: str) -> str:
+    return hashlib.sha256(content.encode(errors="surrogateescape")).hexdigest()
+
+
+def _current_digest(path: Path) -> Optional[str]:
+    try:
+        return _digest(path.read_text(errors="surrogateescape"))
+    except OSError:
+        return None
+
+
+class Journal:
+    """Write-ahead journal holding the original content of every file
+    modified during a transaction.
+
+    A file is backed up the first time it is written: its original bytes go
+    to `<key>.bak`, then its path to `<key>.path`, so an entry only counts
+    once both exist. Before every write, the digest of the new content is
+    added to `<key>.written`, and a file is only restored while it still
+    holds one of them: a file edited since is left alone and its backup
+    kept. Entries live on disk, which keeps memory independent of the
+    number of files and lets worker processes and later runs roll back.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+
+    def write(self, path: Path, content: str) -> None:
+        key = self._back_up(path)
+        written = self.directory / f"{key}.written"
+        digests = written.read_text().split() if written.exists() else []
+        replace_atomically(written, "\n".join([*digests, _digest(content)]))
+        replace_atomically(path, content)
+
+    def roll_back(self) -> bool:
+        """Restores the files this journal wrote, and tells whether all of
+        them were; the backups of files edited since are kept on disk."""
+        restored_all = True
+        for record in self.directory.glob("*.path"):
+            path = Path(record.read_text())
+            backup = record.with_suffix(".bak")
+            written = record.with_suffix(".written")
+            if _current_digest(path) in written.read_text().split():
+                replace_atomically(path, backup.read_bytes())
+                continue
+            print(
+                f"{path} was changed after any-hook wrote it, so it is not "
+                f"restored; its original content is kept in {backup}"
+            )
+            restored_all = False
+        return restored_all
+
+    def revert(self) -> None:
+        """Rolls back, then discards the journal, or keeps it aside when
+        some backups still hold content that was not restored."""
+        if self.roll_back():
+            self.discard()
+        else:
+            self.directory.rename(
+                self.directory.with_name(f"kept-{self.directory.name}")
+            )
+
+    def discard(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _back_up(self, path: Path) -> str:
+        original = path.resolve()
+        key = hashlib.sha256(str(original).encode()).hexdigest()
+        record = self.directory / f"{key}.path"
+        if not record.exists():
+            replace_atomically(
+                self.directory / f"{key}.bak", original.read_bytes()
+            )
+            replace_atomically(self.directory / f"{key}.written", "")
+            replace_atomically(record, str(original))
+        return key
+
+
+_journal: ContextVar[Optional[Journal]] = ContextVar("_journal", default=None)
+_dry_run: ContextVar[bool] = ContextVar("_dry_run", default=False)
+
+
+def current_journal() -> Optional[Journal]:
+    return _journal.get()
+
+
+def set_journal(journal: Optional[Journal]) -> None:
+    """Makes journal the active one for the rest of the current context,
+    e.g. in a worker process serving a transaction of its parent."""
+    _journal.set(journal)
+
+
+def is_dry_run() -> bool:
+    return _dry_run.get()
+
+
+def set_dry_run(enabled: bool) -> None:
+    """Turns dry runs on or off for the rest of the current context, e.g. in
+    a worker process serving a dry run of its parent."""
+    _dry_run.set(enabled)
+
+
+def write_file(path: Path, content: str) -> None:
+    """Replaces the content of path atomically, journaling the original
+    first when a transaction is active. Does nothing in a dry run."""
+    if _dry_run.get():
+        return
+    journal = _journal.get()
+    if journal is None:
+        replace_atomically(path, content)
+    else:
+        journal.write(path, content)
+
+
+def unified_diff(path: Path, old: str, new: str) -> str:
+    """Patch turning old into new, the content of path, in the format of
+    `git diff`."""
+    return "".join(
+        (
+            line
+            if line.endswith("\n")
+            else f"{line}\n\\ No newline at end of file\n"
+        )
+        for line in difflib.unified_diff(
+            old.splitlines(keepends=True),
+            new.splitlines(keepends=True),
+            f"a/{path}",
+            f"b/{path}",
+        )
+    ).removesuffix("\n")
+
+
+def default_journal_dir() -> Path:
+    """Journal directory of the repository in the working directory, per
+    user where the temporary directory is shared between users."""
+    repository = hashlib.sha256(os.getcwd().encode()).hexdigest()[:16]
+    if sys.platform == "win32":
+        return Path(tempfile.gettempdir()) / f"any-hook-journal-{repository}"
+    return Path(tempfile.gettempdir()) / (
+        f"any-hook-journal-{os.getuid()}-{repository}"
+    )
+
+
+_PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+_ERROR_ACCESS_DENIED = 5
+_STILL_ACTIVE = 259
+
+
+def _is_running(pid: int) -> bool:
+    if sys.platform == "win32":
+        # os.kill would terminate the process on Windows
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(
+            _PROCESS_QUERY_LIMITED_INFORMATION, False, pid
+        )
+        if not handle:
+            return bool(kernel32.GetLastError() == _ERROR_ACCESS_DENIED)
+        try:
+            exit_code = ctypes.c_ulong()
+            kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))
+            return exit_code.value == _STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _recover(journal_dir: Path) -> None:
+    for directory in journal_dir.iterdir():
+        pid = directory.name.partition("-")[0]
+        if not pid.isdigit() or _is_running(int(pid)):
+            continue
+        print(f"Restoring files changed by an interrupted run ({directory})")
+        Journal(directory).revert()
+
+
+def _python_files(paths: Iterable[Path]) -> Iterator[Path]:
+    return filter(lambda path_: path_.suffix == ".py", paths)
 
 
 @contextmanager
 def transaction(
     paths: Iterable[Path],
-) -> Generator[tuple[Iterable[Path], Iterable[str]], None, None]:
-    paths1, paths2, paths3 = tee(
-        filter(lambda path_: path_.suffix == ".py", paths),
-        3,
-    )
-    contents1, contents2 = tee(map(Path.read_text, paths1), 2)
+    journal_dir: Optional[Path] = None,
+) -> Generator[Iterator[Path], None, None]:
+    """Yields the Python files among paths and rolls back every file
+    written through `write_file` if the body raises.
+
+    Journals left behind by runs that died before finishing are rolled back
+    first.
+    """
+    journal_dir = journal_dir or default_journal_dir()
+    journal_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+    _recover(journal_dir)
+    journal = Journal(journal_dir / f"{os.getpid()}-{uuid4().hex}")
+    journal.directory.mkdir(mode=0o700)
+    token = _journal.set(journal)
     try:
-        yield paths2, contents1
+        yield _python_files(paths)
     except BaseException:
         print("Reverting changes please wait until process is done...")
-        for path, content in zip(paths3, contents2):
-            path.write_text(content)
+        journal.revert()
         print("Changes reverted")
         raise
+    else:
+        journal.discard()
+    finally:
+        _journal.reset(token)
+
+
+@contextmanager
+def dry_run(paths: Iterable[Path]) -> Generator[Iterator[Path], None, None]:
+    """Yields the Python files among paths and suppresses every write
+    through `write_file` meanwhile, so nothing on disk changes and nothing
+    needs journaling."""
+    token = _dry_run.set(True)
+    try:
+        yield _python_files(paths)
+    finally:
+        _dry_run.reset(token)
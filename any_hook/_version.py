@@ -0,0 +1,8 @@
+from importlib.metadata import PackageNotFoundError, version
+
+
+def package_version() -> str:
+    try:
+        return version("any-hook")
+    except PackageNotFoundError:
+        return "unknown"
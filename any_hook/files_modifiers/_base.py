@@ -1,13 +1,42 @@
+import re
 from abc import ABC, abstractmethod
-from collections.abc import Iterable
-from functools import reduce
+from collections.abc import Callable, Generator, Iterable, Set
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import cache, reduce
 from pathlib import Path
+from typing import ClassVar, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 from any_hook._file_data import FileData
+from any_hook._transaction import is_dry_run, unified_diff
+from any_hook.files_modifiers._path_filter import path_filter
 from any_hook.files_modifiers.output import AnyOutput, StandardOutput
 
+OutputSink = Callable[["Modifier", str], None]
+_output_sink: ContextVar[Optional[OutputSink]] = ContextVar(
+    "_output_sink", default=None
+)
+
+
+@contextmanager
+def redirect_output(sink: OutputSink) -> Generator[None, None, None]:
+    """Routes every Modifier._output call to sink instead of the
+    modifier's configured outputs for the duration of the context."""
+    token = _output_sink.set(sink)
+    try:
+        yield
+    finally:
+        _output_sink.reset(token)
+
+
+@cache
+def compile_pattern(pattern: str, flags: int = 0) -> re.Pattern[str]:
+    """re.compile memoized for the life of the process, so patterns from
+    the configuration are compiled once rather than once per file."""
+    return re.compile(pattern, flags)
+
 
 class Modifier(BaseModel, ABC):
     """Base class for all file modifiers.
@@ -37,9 +66,15 @@ class Modifier(BaseModel, ABC):
         violations (like LocalImports). The return value indicates whether
         any files were modified or violations were found.
         Use excluded_paths or included_paths (but not both) to filter files.
+        Modifiers that need every file at once (or ignore FileData entirely)
+        set whole_corpus to True so parallel runs invoke them only once.
+        Modifiers whose result depends on files other than the one being
+        processed set cacheable to False to opt the run out of result caching.
     """
 
     model_config = ConfigDict(extra="forbid")
+    whole_corpus: ClassVar[bool] = False
+    cacheable: ClassVar[bool] = True
 
     ignore_pattern: str = Field(
         default=r"#\s*ignore",
@@ -70,14 +105,69 @@ class Modifier(BaseModel, ABC):
     def modify(self, data: Iterable[FileData]) -> bool:
         """Returns either 1 if file was modified 0 otherwise"""
 
+    @property
+    def ignore_regex(self) -> re.Pattern[str]:
+        return compile_pattern(self.ignore_pattern, re.IGNORECASE)
+
+    def precompile(self) -> None:
+        """Compiles the patterns this modifier matches files against ahead
+        of the first file, e.g. before worker processes are forked."""
+        compile_pattern(self.ignore_pattern, re.IGNORECASE)
+        path_filter(self.included_paths, self.excluded_paths)
+
     def should_process_file(self, path: Path) -> bool:
-        if self.included_paths:
-            return any(path.match(pattern) for pattern in self.included_paths)
-        if self.excluded_paths:
-            return not any(
-                path.match(pattern) for pattern in self.excluded_paths
-            )
+        """Whether path passes included_paths or excluded_paths, matched
+        like `Path.match`; the globs are compiled once and the verdict for
+        each path is shared by every modifier with the same globs."""
+        return path_filter(self.included_paths, self.excluded_paths).accepts(
+            path
+        )
+
+    def required_tokens(self) -> Optional[tuple[str, ...]]:
+        """Strings of which a file must contain at least one for this
+        modifier to have anything to do with it, or None to consider every
+        file. Agito matches the tokens of all its modifiers in one pass over
+        each file."""
+        return None
+
+    def should_process_content(self, content: str) -> bool:
+        """Prefilter on the raw source of a file for conditions beyond
+        required_tokens.
+
+        Returning False, like lacking every required token, promises that
+        the modifier would leave the file alone, so the file is neither
+        parsed nor visited for this modifier.
+        """
         return True
 
+    def accepts_content(
+        self, content: str, found_tokens: Optional[Set[str]] = None
+    ) -> bool:
+        """Whether content passes both prefilters; found_tokens, the tokens
+        already known to occur in content, saves scanning it again."""
+        tokens = self.required_tokens()
+        if tokens is not None and not (
+            any(token in content for token in tokens)
+            if found_tokens is None
+            else not found_tokens.isdisjoint(tokens)
+        ):
+            return False
+        return self.should_process_content(content)
+
+    def _write(self, file_data: FileData, content: str) -> None:
+        """Writes content to the file and reports it, as a unified diff
+        against the current content in a dry run."""
+        file_data.write(content)
+        if is_dry_run():
+            self._output(
+                unified_diff(file_data.path, file_data.content, content)
+            )
+        else:
+            self._output(f"File {file_data.path} was modified")
+
     def _output(self, text: str) -> None:
+        sink = _output_sink.get()
+        if sink is not None:
+            sink(self, text)
+            return
         reduce(lambda text_, output: output.process(text_), self.outputs, text)
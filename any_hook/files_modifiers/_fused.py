@@ -0,0 +1,154 @@
+from collections.abc import Callable, Iterator, Sequence
+from functools import cache
+from types import FunctionType
+from typing import Generic, Literal, Optional, TypeVar, Union, cast
+
+from libcst import (
+    CSTNode,
+    CSTNodeT,
+    CSTTransformer,
+    CSTVisitor,
+    FlattenSentinel,
+    RemovalSentinel,
+)
+
+_LIBCST_BASES = frozenset((*CSTTransformer.__mro__, *CSTVisitor.__mro__))
+_GENERIC_HOOKS = frozenset(("on_visit", "on_leave"))
+_Handler = Callable[..., object]
+MemberType = TypeVar("MemberType", bound=Union[CSTTransformer, CSTVisitor])
+
+
+@cache
+def _handlers(
+    member_type: type[CSTVisitor | CSTTransformer],
+) -> dict[str, _Handler]:
+    """visit_/leave_ methods and on_visit/on_leave overrides defined by
+    member_type, leaving out libcst's no-op defaults."""
+    handlers: dict[str, _Handler] = {}
+    for class_ in reversed(member_type.__mro__):
+        if class_ in _LIBCST_BASES:
+            continue
+        handlers.update(
+            (name, value)
+            for name, value in vars(class_).items()
+            if isinstance(value, FunctionType)
+            and (
+                name in _GENERIC_HOOKS or name.startswith(("visit_", "leave_"))
+            )
+        )
+    return handlers
+
+
+class Dispatch:
+    """Handlers of a fused set of visitors or transformers per node type,
+    resolved the first time each node type is seen.
+
+    A member overriding on_visit or on_leave handles every node type.
+    """
+
+    def __init__(
+        self, member_types: tuple[type[CSTVisitor | CSTTransformer], ...]
+    ) -> None:
+        self._member_types = member_types
+        self._table: dict[str, tuple[tuple[int, _Handler], ...]] = {}
+
+    def handlers(
+        self, kind: Literal["visit", "leave"], node_type: str
+    ) -> tuple[tuple[int, _Handler], ...]:
+        key = f"{kind}_{node_type}"
+        if key not in self._table:
+            self._table[key] = tuple(
+                (index, handler)
+                for index, member_type in enumerate(self._member_types)
+                if (
+                    handler := _handlers(member_type).get(f"on_{kind}")
+                    or _handlers(member_type).get(key)
+                )
+            )
+        return self._table[key]
+
+
+@cache
+def dispatch(
+    member_types: tuple[type[CSTVisitor | CSTTransformer], ...],
+) -> Dispatch:
+    return Dispatch(member_types)
+
+
+class FusedTraversal(Generic[MemberType]):
+    """Traversal state of visitors or transformers sharing one walk.
+
+    A member whose visit_ method returns False for a node is not called
+    again until the traversal leaves that node, and the node's children are
+    only walked while some member is still interested in them.
+    """
+
+    def __init__(self, members: Sequence[MemberType]) -> None:
+        self._members = members
+        self._dispatch = dispatch(tuple(map(type, members)))
+        self._pruned_at: list[Optional[CSTNode]] = [None] * len(members)
+        self._active = len(members)
+
+    def visit(self, node: CSTNode) -> bool:
+        for index, visit in self._dispatch.handlers(
+            "visit", type(node).__name__
+        ):
+            if self._pruned_at[index] is not None:
+                continue
+            if visit(self._members[index], node) is False:
+                self._pruned_at[index] = node
+                self._active -= 1
+        return self._active > 0
+
+    def leave(self, node: CSTNode) -> Iterator[tuple[MemberType, _Handler]]:
+        """Yields the members to notify of leaving node with their
+        handlers, in order."""
+        if self._active < len(self._members):
+            self._restore(node)
+        for index, leave in self._dispatch.handlers(
+            "leave", type(node).__name__
+        ):
+            if self._pruned_at[index] is None:
+                yield self._members[index], leave
+
+    def _restore(self, node: CSTNode) -> None:
+        for index, pruned_at in enumerate(self._pruned_at):
+            if pruned_at is node:
+                self._pruned_at[index] = None
+                self._active += 1
+
+
+class FusedTransformer(CSTTransformer):
+    """Applies transformers in one traversal, composing their changes in
+    order.
+
+    `changed` records whether any of them returned a node other than the
+    one it was given, so callers can skip generating code for a tree nobody
+    touched.
+    """
+
+    def __init__(self, transformers: Sequence[CSTTransformer]) -> None:
+        super().__init__()
+        self._fused = FusedTraversal(transformers)
+        self.changed = False
+
+    def on_visit(self, node: CSTNode) -> bool:
+        return self._fused.visit(node)
+
+    def on_leave(
+        self, original_node: CSTNodeT, updated_node: CSTNodeT
+    ) -> Union[CSTNodeT, RemovalSentinel, FlattenSentinel[CSTNodeT]]:
+        updated: CSTNode = updated_node
+        for transformer, leave in self._fused.leave(original_node):
+            node = cast(
+                Union[CSTNode, RemovalSentinel, FlattenSentinel[CSTNode]],
+                leave(transformer, original_node, updated),
+            )
+            if node is not updated:
+                self.changed = True
+            if not isinstance(node, CSTNode):
+                return cast(
+                    Union[RemovalSentinel, FlattenSentinel[CSTNodeT]], node
+                )
+            updated = node
+        return cast(CSTNodeT, updated)
@@ -0,0 +1,85 @@
+import fnmatch
+import os
+import re
+from collections.abc import Sequence
+from functools import cache
+from pathlib import PurePath
+from typing import Optional, cast
+
+_FNMATCH_PREFIX, _FNMATCH_SUFFIX = fnmatch.translate("_").split("_")
+_SWAP_SEP_AND_NEWLINE = str.maketrans({os.sep: "\n", "\n": os.sep})
+_FLAGS = re.MULTILINE | (
+    re.NOFLAG if os.path.normcase("Aa") == "Aa" else re.IGNORECASE
+)
+
+
+def _lines(path: PurePath) -> str:
+    path_str = str(path)
+    return "" if path_str == "." else path_str.translate(_SWAP_SEP_AND_NEWLINE)
+
+
+def _translate(pattern: str) -> str:
+    pattern_path = PurePath(pattern)
+    absolute = bool(pattern_path.drive or pattern_path.root)
+    if not (absolute or pattern_path.parts):
+        raise ValueError("empty pattern")
+    parts = [r"\A" if absolute else "^"]
+    for part in _lines(pattern_path).splitlines(keepends=True):
+        if part == "*\n":
+            parts.append(r".+\n")
+        elif part == "*":
+            parts.append(r".+")
+        else:
+            parts.append(
+                fnmatch.translate(part)[
+                    len(_FNMATCH_PREFIX) : -len(_FNMATCH_SUFFIX)
+                ]
+            )
+    parts.append(r"\Z")
+    return "".join(parts)
+
+
+def _compile(patterns: Sequence[str]) -> Optional[re.Pattern[str]]:
+    if not patterns:
+        return None
+    return re.compile(
+        "|".join(f"(?:{_translate(pattern)})" for pattern in patterns),
+        _FLAGS,
+    )
+
+
+class PathFilter:
+    """Include or exclude globs of a modifier compiled into one regular
+    expression, matching paths like `PurePath.match`.
+
+    Verdicts are memoized per path, so in a run each distinct filter
+    matches a file once, however many modifiers share it and however often
+    they ask.
+    """
+
+    def __init__(
+        self, included: Sequence[str], excluded: Sequence[str]
+    ) -> None:
+        self._included = _compile(included)
+        self._excluded = _compile(excluded)
+        self._verdicts: dict[PurePath, bool] = {}
+
+    def accepts(self, path: PurePath) -> bool:
+        if self._included is None and self._excluded is None:
+            return True
+        verdict = self._verdicts.get(path)
+        if verdict is None:
+            verdict = self._verdicts[path] = self._match(_lines(path))
+        return verdict
+
+    def _match(self, lines: str) -> bool:
+        if self._included is not None:
+            return self._included.search(lines) is not None
+        return cast(re.Pattern[str], self._excluded).search(lines) is None
+
+
+@cache
+def path_filter(
+    included: tuple[str, ...], excluded: tuple[str, ...]
+) -> PathFilter:
+    return PathFilter(included, excluded)
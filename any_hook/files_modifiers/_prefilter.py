@@ -0,0 +1,22 @@
+from functools import cache
+
+
+class TokenMatcher:
+    """Finds which of a set of tokens occur in a text.
+
+    Each distinct token is looked up once with the C-level substring
+    search of `str`, which beats compiling the tokens into one regex
+    alternation several times over; modifiers sharing a token share the
+    lookup.
+    """
+
+    def __init__(self, tokens: frozenset[str]) -> None:
+        self._tokens = tuple(sorted(tokens))
+
+    def find(self, text: str) -> frozenset[str]:
+        return frozenset(token for token in self._tokens if token in text)
+
+
+@cache
+def token_matcher(tokens: frozenset[str]) -> TokenMatcher:
+    return TokenMatcher(tokens)
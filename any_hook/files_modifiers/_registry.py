@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import inspect
+import logging
+from collections.abc import Iterable, Iterator
+from functools import cache
+from importlib import import_module
+from operator import getitem
+from types import GenericAlias
+from typing import TYPE_CHECKING, Annotated, Optional, Union, cast
+
+from pydantic import Field, TypeAdapter
+from subclass_getter import get_subclasses
+
+from any_hook.files_modifiers._base import Modifier
+
+_logger = logging.getLogger(__name__)
+_PACKAGE = "any_hook.files_modifiers"
+MODIFIER_PATHS: dict[str, tuple[str, str]] = {
+    "any-to-object": ("any_to_object", "AnyToObject"),
+    "object-to-any": ("object_to_any", "ObjectToAny"),
+    "pydantic-config-to-model-config": (
+        "pydantic_config_to_model_config",
+        "PydanticConfigToModelConfig",
+    ),
+    "pydantic-v1-to-v2": ("pydantic_v1_to_v2", "PydanticV1ToV2"),
+    "str-enum-inheritance": ("str_enum_inheritance", "StrEnumInheritance"),
+    "local-imports": ("local_imports", "LocalImports"),
+    "local-imports-to-top": ("local_imports_to_top", "LocalImportsToTop"),
+    "forbidden-functions": ("forbidden_functions", "ForbiddenFunctions"),
+    "leaky-mapping-typing": ("leaky_mapping_typing", "LeakyMappingTyping"),
+    "field-validator-check": ("field_validator_check", "FieldValidatorCheck"),
+    "utcnow-to-datetime-now": (
+        "utcnow_to_datetime_now",
+        "UtcNowToDatetimeNow",
+    ),
+    "len-as-bool": ("len_as_bool", "LenAsBool"),
+    "typing-to-builtin": ("typing_to_builtin", "TypingToBuiltin"),
+    "return-tuple-parens-drop": (
+        "return_tuple_parens_drop",
+        "ReturnTupleParensDrop",
+    ),
+    "remove-f-prefix": ("remove_f_prefix", "RemoveFPrefix"),
+    "open-to-path": ("open_to_path", "OpenToPath"),
+    "check-untracked": ("check_untracked", "CheckUntracked"),
+    "test-if-checker": ("test_if_checker", "TestIfChecker"),
+    "agito": ("agito", "Agito"),
+    "combine-with": ("combine_with", "CombineWith"),
+    "comment-detector": ("comment_detector", "CommentDetector"),
+    "private-import-detector": (
+        "private_import_detector",
+        "PrivateImportDetector",
+    ),
+    "arbitrary-types-allowed-check": (
+        "arbitrary_types_allowed_check",
+        "ArbitraryTypesAllowedCheck",
+    ),
+    "instance-of-pydantic-model-detector": (
+        "instance_of_pydantic_model_detector",
+        "InstanceOfPydanticModelDetector",
+    ),
+    "workflow-env-to-example": (
+        "workflow_env_to_example",
+        "WorkflowEnvToExample",
+    ),
+    "generate-stubs": ("generate_stubs", "GenerateStubs"),
+}
+
+
+@cache
+def modifier_class(type_: str) -> Optional[type[Modifier]]:
+    """Imports and returns the built-in modifier registered for `type_`.
+
+    Returns None for unregistered types and for modifiers whose optional
+    dependencies are not installed; the latter is logged once.
+    """
+    if type_ not in MODIFIER_PATHS:
+        return None
+    module_name, class_name = MODIFIER_PATHS[type_]
+    try:
+        module = import_module(f"{_PACKAGE}.{module_name}")
+    except ImportError as e:
+        _logger.warning(
+            f"Package necessary to use {type_} is not installed, "
+            f"{type_} is disabled.\n{e}"
+        )
+        return None
+    modifier: type[Modifier] = module.__dict__[class_name]
+    return modifier
+
+
+def _modifiers_type(
+    classes: Iterable[type[Modifier]],
+) -> type[tuple[Modifier, ...]]:
+    """A non-empty tuple of the classes given, told apart by their type
+    field; spelled with getitem since the classes are only known at
+    runtime."""
+    item = getitem(
+        Annotated,
+        (getitem(Union, tuple(classes)), Field(discriminator="type")),
+    )
+    return cast(
+        type[tuple[Modifier, ...]],
+        getitem(
+            Annotated,
+            (GenericAlias(tuple, (item, ...)), Field(min_length=1)),
+        ),
+    )
+
+
+def _adapter(
+    classes: Iterable[type[Modifier]],
+) -> TypeAdapter[tuple[Modifier, ...]]:
+    return TypeAdapter(_modifiers_type(classes))
+
+
+def _configured_types(data: object) -> Iterator[str]:
+    if not isinstance(data, (list, tuple)):
+        return
+    for item in data:
+        if isinstance(item, dict) and isinstance(item.get("type"), str):
+            yield item["type"]
+        elif isinstance(item, Modifier) and "type" in type(item).model_fields:
+            yield type(item).model_fields["type"].default
+
+
+def all_modifier_classes() -> list[type[Modifier]]:
+    return list(filter(None, map(modifier_class, MODIFIER_PATHS)))
+
+
+@cache
+def _known_types_adapter(
+    types: frozenset[str],
+) -> TypeAdapter[tuple[Modifier, ...]]:
+    classes = list(filter(None, map(modifier_class, sorted(types))))
+    return _adapter(classes or all_modifier_classes())
+
+
+def validate_modifiers(data: object) -> tuple[Modifier, ...]:
+    """Validates a modifiers configuration, importing only the modifier
+    modules whose `type` appears in it.
+
+    Types that are not registered (external modifiers) are resolved among
+    every loaded Modifier subclass instead.
+    """
+    types = frozenset(_configured_types(data))
+    if types <= MODIFIER_PATHS.keys():
+        return _known_types_adapter(types).validate_python(data)
+    classes = _one_per_type(
+        [
+            *filter(None, map(modifier_class, sorted(types))),
+            *_loaded_modifier_classes(),
+        ]
+    )
+    return _adapter(classes).validate_python(data)
+
+
+def _loaded_modifier_classes() -> Iterator[type[Modifier]]:
+    if TYPE_CHECKING:
+        # get_subclasses is typed for concrete classes only
+        return iter(())
+    return (
+        class_
+        for class_ in get_subclasses(Modifier)
+        if "type" in class_.model_fields and not inspect.isabstract(class_)
+    )
+
+
+def _one_per_type(
+    classes: Iterable[type[Modifier]],
+) -> list[type[Modifier]]:
+    """Keeps a single class per `type` discriminator: the one defining it
+    rather than subclasses inheriting it unchanged, or the first of
+    unrelated classes claiming the same type, which is logged."""
+    by_type: dict[str, type[Modifier]] = {}
+    for class_ in classes:
+        type_ = class_.model_fields["type"].default
+        known = by_type.setdefault(type_, class_)
+        if issubclass(known, class_):
+            by_type[type_] = class_
+        elif not issubclass(class_, known):
+            _logger.warning(
+                f"Modifiers {_qualified_name(known)} and "
+                f"{_qualified_name(class_)} share the type {type_!r}, "
+                f"{_qualified_name(known)} is used."
+            )
+    return list(by_type.values())
+
+
+def _qualified_name(class_: type[Modifier]) -> str:
+    return f"{class_.__module__}.{class_.__qualname__}"
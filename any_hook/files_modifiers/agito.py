@@ -1,42 +1,20 @@
-import re
-from collections.abc import Iterable
-from typing import TYPE_CHECKING, Annotated, Literal, Union
-
-from libcst import (
-    CSTNode,
-    CSTNodeT,
-    CSTTransformer,
-    FlattenSentinel,
-    RemovalSentinel,
-)
-from pydantic import Field
+from collections.abc import Iterable, Sequence, Set
+from typing import Literal
+
+from libcst import CSTVisitor
+from pydantic import Field, SerializeAsAny, field_validator
 
 from any_hook._file_data import FileData
 from any_hook.files_modifiers._base import Modifier
+from any_hook.files_modifiers._fused import FusedTransformer
+from any_hook.files_modifiers._prefilter import TokenMatcher, token_matcher
+from any_hook.files_modifiers._registry import validate_modifiers
+from any_hook.files_modifiers.checker_modifier import (
+    CheckerModifier,
+    run_visitors,
+)
 from any_hook.files_modifiers.separate_modifier import SeparateModifier
 
-if TYPE_CHECKING:
-    from any_hook.files_modifiers import AnyModifier
-
-
-class _AgitoTransformer(CSTTransformer):
-    def __init__(self, transformers: tuple[CSTTransformer, ...]) -> None:
-        super().__init__()
-        self._transformers = transformers
-
-    def on_visit(self, node: CSTNode) -> bool:
-        return any([t.on_visit(node) for t in self._transformers])
-
-    def on_leave(
-        self, original_node: CSTNodeT, updated_node: CSTNodeT
-    ) -> Union[CSTNodeT, RemovalSentinel, FlattenSentinel[CSTNodeT]]:
-        for transformer in self._transformers:
-            node = transformer.on_leave(original_node, updated_node)
-            if not isinstance(node, CSTNode):
-                return node
-            updated_node = node
-        return updated_node
-
 
 class Agito(Modifier):
     """Composite modifier that merges all assigned shikigami into a single pass.
@@ -50,42 +28,147 @@ class Agito(Modifier):
     redundant tree walks and reduces file writes to at most one per file.
 
     Transformer-based modifiers (subclasses of SeparateModifier) are merged
-    into a single _AgitoTransformer whose on_visit and on_leave delegate to
-    each sub-transformer in order, composing their changes. Checker-type
-    modifiers (ForbiddenFunctions, FieldValidatorCheck, LocalImports) run
-    independently after the combined transform since they only read the tree.
+    into a single FusedTransformer whose on_visit and on_leave delegate to
+    each sub-transformer in order, composing their changes. Only the
+    sub-transformers defining a visit_/leave_ method for a node's type are
+    called for it; the table is built once per set of transformer types.
+    A sub-transformer pruning a subtree skips it without affecting the
+    others, and a subtree pruned by all of them is not walked. A modifier
+    whose prefilters reject a file contributes no transformer for it, and a
+    file rejected by all of them is not parsed at all. The required tokens
+    of every modifier are looked up in a single pass over each file. Code
+    is only generated for a file when some sub-transformer replaced a node.
+
+    Checkers (subclasses of CheckerModifier such as ForbiddenFunctions,
+    FieldValidatorCheck, LocalImports) run on each file right before the
+    combined transform, sharing its parsed tree: their visitors are fused
+    into one traversal that resolves metadata once. Files are processed one
+    at a time, so their trees can be released as soon as the next file
+    starts. Whole-corpus modifiers (CheckUntracked, GenerateStubs) get a
+    pass of their own over every file first, which holds all files in
+    memory for its duration.
 
     WorkflowEnvToExample is the Mahoraga of this system — too powerful and
     autonomous to be absorbed — and should be kept outside Agito.
     """
 
     type: Literal["agito"] = "agito"
-    modifiers: Annotated[tuple["AnyModifier", ...], Field(min_length=1)]
+    modifiers: tuple[SerializeAsAny[Modifier], ...] = Field(min_length=1)
+
+    @field_validator("modifiers", mode="plain")
+    @classmethod
+    def _validate_modifiers(cls, data: object) -> tuple[Modifier, ...]:
+        return validate_modifiers(data)
 
     def modify(self, data: Iterable[FileData]) -> bool:
-        all_files = list(data)
-        global_changed = any(
-            m.modify(iter(all_files))
-            for m in self.modifiers
-            if not isinstance(m, SeparateModifier)
+        per_file, whole_corpus = split_whole_corpus(self.modifiers)
+        if whole_corpus:
+            data = tuple(data)
+        corpus_changed = any([m.modify(iter(data)) for m in whole_corpus])
+        checkers = tuple(m for m in per_file if isinstance(m, CheckerModifier))
+        others = tuple(
+            m
+            for m in per_file
+            if not isinstance(m, (SeparateModifier, CheckerModifier))
+        )
+        matcher = token_matcher(
+            frozenset(
+                token
+                for m in per_file
+                if isinstance(m, (SeparateModifier, CheckerModifier))
+                for token in m.required_tokens() or ()
+            )
+        )
+        changed = any(
+            [
+                self._process_file(file_data, matcher, checkers, others)
+                for file_data in data
+            ]
+        )
+        return changed or corpus_changed
+
+    def _process_file(
+        self,
+        file_data: FileData,
+        matcher: TokenMatcher,
+        checkers: Sequence[CheckerModifier[CSTVisitor]],
+        others: Sequence[Modifier],
+    ) -> bool:
+        found_tokens = matcher.find(file_data.content)
+        checked = self._check_file(file_data, checkers, found_tokens)
+        modified = any([m.modify((file_data,)) for m in others])
+        return (
+            self._modify_file(file_data, found_tokens) or checked or modified
+        )
+
+    @staticmethod
+    def _check_file(
+        file_data: FileData,
+        checkers: Sequence[CheckerModifier[CSTVisitor]],
+        found_tokens: Set[str],
+    ) -> bool:
+        visitors = [
+            (checker, checker.create_visitor(file_data))
+            for checker in checkers
+            if checker.accepts(file_data, found_tokens)
+        ]
+        if not visitors:
+            return False
+        run_visitors(file_data.module, [visitor for _, visitor in visitors])
+        return any(
+            [
+                checker.report(file_data, visitor)
+                for checker, visitor in visitors
+            ]
         )
-        return any(list(map(self._modify_file, all_files))) or global_changed
 
-    def _modify_file(self, file_data: FileData) -> bool:
+    def _modify_file(
+        self, file_data: FileData, found_tokens: Set[str]
+    ) -> bool:
         if not self.should_process_file(file_data.path):
             return False
-        compiled = re.compile(self.ignore_pattern, re.IGNORECASE)
         transformers = tuple(
-            m.create_transformer(compiled)
+            m.create_transformer(self.ignore_regex)
             for m in self.modifiers
             if isinstance(m, SeparateModifier)
             and m.should_process_file(file_data.path)
+            and m.accepts_content(file_data.content, found_tokens)
         )
         if not transformers:
             return False
-        new_code = file_data.module.visit(_AgitoTransformer(transformers)).code
+        fused = FusedTransformer(transformers)
+        new_module = file_data.module.visit(fused)
+        if not fused.changed:
+            return False
+        new_code = new_module.code
         if new_code == file_data.content:
             return False
-        file_data.path.write_text(new_code)
-        self._output(f"File {file_data.path} was modified")
+        self._write(file_data, new_code)
         return True
+
+
+def split_whole_corpus(
+    modifiers: Iterable[Modifier],
+) -> tuple[tuple[Modifier, ...], tuple[Modifier, ...]]:
+    """Splits modifiers into per-file ones and whole-corpus ones.
+
+    Agito instances are split recursively: their whole-corpus members are
+    lifted out and the remaining members stay fused in a shallow copy.
+    """
+    per_file: list[Modifier] = []
+    whole_corpus: list[Modifier] = []
+    for modifier in modifiers:
+        if isinstance(modifier, Agito):
+            nested_per_file, nested_whole_corpus = split_whole_corpus(
+                modifier.modifiers
+            )
+            whole_corpus.extend(nested_whole_corpus)
+            if nested_per_file:
+                per_file.append(
+                    modifier.model_copy(update={"modifiers": nested_per_file})
+                )
+        elif modifier.whole_corpus:
+            whole_corpus.append(modifier)
+        else:
+            per_file.append(modifier)
+    return tuple(per_file), tuple(whole_corpus)
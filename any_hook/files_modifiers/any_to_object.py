@@ -18,7 +18,6 @@ from libcst import (
 )
 from libcst.helpers import get_absolute_module_for_import
 
-from any_hook._file_data import FileData
 from any_hook.files_modifiers._ignore_aware_transformer import (
     IgnoreAwareTransformer,
 )
@@ -154,7 +153,5 @@ class AnyToObject(SeparateModifier[_AnyToObjectTransformer]):
     ) -> _AnyToObjectTransformer:
         return _AnyToObjectTransformer(ignore_pattern)
 
-    def _modify_file(self, file_data: FileData) -> bool:
-        if Any.__name__ not in file_data.content:
-            return False
-        return super()._modify_file(file_data)
+    def required_tokens(self) -> tuple[str, ...]:
+        return (Any.__name__,)
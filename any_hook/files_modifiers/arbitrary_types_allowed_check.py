@@ -1,5 +1,4 @@
 import re
-from collections.abc import Iterable
 from typing import Literal
 
 from libcst import (
@@ -10,21 +9,20 @@ from libcst import (
     CSTVisitor,
     Name,
 )
-from libcst.metadata import MetadataWrapper, PositionProvider
 from pydantic import ConfigDict
 
 from any_hook._file_data import FileData
-from any_hook.files_modifiers._base import Modifier
+from any_hook.files_modifiers.checker_modifier import CheckerModifier
 
 _ARBITRARY_TYPES_ALLOWED = "arbitrary_types_allowed"
 
 
 class _ArbitraryTypesAllowedVisitor(CSTVisitor):
-    METADATA_DEPENDENCIES = (PositionProvider,)
-
-    def __init__(self, content: str, ignore_pattern: re.Pattern[str]) -> None:
+    def __init__(
+        self, file_data: FileData, ignore_pattern: re.Pattern[str]
+    ) -> None:
         super().__init__()
-        self._content = content
+        self._file_data = file_data
         self._ignore_pattern = ignore_pattern
         self.violations: list[int] = []
 
@@ -34,8 +32,7 @@ class _ArbitraryTypesAllowedVisitor(CSTVisitor):
             and target.target.value == "model_config"
             for target in node.targets
         ):
-            line_num = self.get_metadata(PositionProvider, node).start.line
-            self._check_value(node.value, line_num)
+            self._check_value(node.value, node)
         return True
 
     def visit_AnnAssign(self, node: AnnAssign) -> bool:
@@ -45,16 +42,20 @@ class _ArbitraryTypesAllowedVisitor(CSTVisitor):
             isinstance(node.target, Name)
             and node.target.value == "model_config"
         ):
-            line_num = self.get_metadata(PositionProvider, node).start.line
-            self._check_value(node.value, line_num)
+            self._check_value(node.value, node)
         return True
 
-    def _check_value(self, value: BaseExpression, line_num: int) -> None:
+    def _check_value(
+        self, value: BaseExpression, node: Assign | AnnAssign
+    ) -> None:
         if not self._has_arbitrary_types_allowed_true(value):
             return
-        if self._is_ignored():
+        position = self._file_data.position(node)
+        if self._file_data.line_index.is_ignored(
+            self._ignore_pattern, position
+        ):
             return
-        self.violations.append(line_num)
+        self.violations.append(position.start.line)
 
     @staticmethod
     def _has_arbitrary_types_allowed_true(value: BaseExpression) -> bool:
@@ -73,15 +74,10 @@ class _ArbitraryTypesAllowedVisitor(CSTVisitor):
             for arg in value.args
         )
 
-    def _is_ignored(self) -> bool:
-        return any(
-            _ARBITRARY_TYPES_ALLOWED in line
-            and self._ignore_pattern.search(line)
-            for line in self._content.splitlines()
-        )
-
 
-class ArbitraryTypesAllowedCheck(Modifier):
+class ArbitraryTypesAllowedCheck(
+    CheckerModifier[_ArbitraryTypesAllowedVisitor]
+):
     """Detects arbitrary_types_allowed=True in Pydantic model_config.
 
     Reports model_config assignments using ConfigDict(arbitrary_types_allowed=True),
@@ -115,17 +111,17 @@ class ArbitraryTypesAllowedCheck(Modifier):
         "arbitrary-types-allowed-check"
     )
 
-    def modify(self, data: Iterable[FileData]) -> bool:
-        return any(list(map(self._check_file, data)))
+    def required_tokens(self) -> tuple[str, ...]:
+        return (_ARBITRARY_TYPES_ALLOWED,)
 
-    def _check_file(self, file_data: FileData) -> bool:
-        if _ARBITRARY_TYPES_ALLOWED not in file_data.content:
-            return False
-        if not self.should_process_file(file_data.path):
-            return False
-        compiled = re.compile(self.ignore_pattern, re.IGNORECASE)
-        visitor = _ArbitraryTypesAllowedVisitor(file_data.content, compiled)
-        MetadataWrapper(file_data.module).visit(visitor)
+    def create_visitor(
+        self, file_data: FileData
+    ) -> _ArbitraryTypesAllowedVisitor:
+        return _ArbitraryTypesAllowedVisitor(file_data, self.ignore_regex)
+
+    def report(
+        self, file_data: FileData, visitor: _ArbitraryTypesAllowedVisitor
+    ) -> bool:
         if not visitor.violations:
             return False
         for line_num in visitor.violations:
@@ -1,6 +1,6 @@
 import subprocess
 from collections.abc import Iterable
-from typing import Literal
+from typing import ClassVar, Literal
 
 from pydantic import Field
 
@@ -26,6 +26,7 @@ class CheckUntracked(Modifier):
     """
 
     type: Literal["check-untracked"] = "check-untracked"
+    whole_corpus: ClassVar[bool] = True
     directories: tuple[str, ...] = Field(
         min_length=1,
         description="Directories (relative to repo root) to check for untracked files.",
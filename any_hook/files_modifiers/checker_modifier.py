@@ -0,0 +1,72 @@
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Sequence, Set
+from contextlib import ExitStack
+from typing import Generic, Optional, TypeVar
+
+from libcst import CSTNode, CSTVisitor, Module
+from libcst.metadata import MetadataWrapper
+
+from any_hook._file_data import FileData
+from any_hook.files_modifiers._base import Modifier
+from any_hook.files_modifiers._fused import FusedTraversal
+
+VisitorType = TypeVar("VisitorType", bound=CSTVisitor)
+
+
+class _FusedVisitor(CSTVisitor):
+    def __init__(self, visitors: Sequence[CSTVisitor]) -> None:
+        super().__init__()
+        self._fused = FusedTraversal(visitors)
+
+    def on_visit(self, node: CSTNode) -> bool:
+        return self._fused.visit(node)
+
+    def on_leave(self, original_node: CSTNode) -> None:
+        for visitor, leave in self._fused.leave(original_node):
+            leave(visitor, original_node)
+
+
+def run_visitors(module: Module, visitors: Sequence[CSTVisitor]) -> None:
+    """Runs read-only visitors over module in a single traversal.
+
+    The metadata they depend on is resolved once for all of them, on the
+    module itself rather than a copy, since none of them changes it.
+    """
+    wrapper = MetadataWrapper(module, unsafe_skip_copy=True)
+    with ExitStack() as stack:
+        for visitor in visitors:
+            stack.enter_context(visitor.resolve(wrapper))
+        module.visit(_FusedVisitor(visitors))
+
+
+class CheckerModifier(Modifier, ABC, Generic[VisitorType]):
+    """Read-only modifier reporting what a CST visitor finds in each file.
+
+    Agito runs the visitors of all checkers it holds in one traversal per
+    file, so subclasses only build a visitor and report its findings.
+    """
+
+    def modify(self, data: Iterable[FileData]) -> bool:
+        return any(list(map(self._check_file, data)))
+
+    def _check_file(self, file_data: FileData) -> bool:
+        if not self.accepts(file_data):
+            return False
+        visitor = self.create_visitor(file_data)
+        run_visitors(file_data.module, (visitor,))
+        return self.report(file_data, visitor)
+
+    def accepts(
+        self, file_data: FileData, found_tokens: Optional[Set[str]] = None
+    ) -> bool:
+        return self.accepts_content(
+            file_data.content, found_tokens
+        ) and self.should_process_file(file_data.path)
+
+    @abstractmethod
+    def create_visitor(self, file_data: FileData) -> VisitorType: ...
+
+    @abstractmethod
+    def report(self, file_data: FileData, visitor: VisitorType) -> bool:
+        """Outputs the findings of visitor and returns whether there were
+        any."""
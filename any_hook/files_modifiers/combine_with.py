@@ -9,7 +9,6 @@ from libcst import (
     With,
 )
 
-from any_hook._file_data import FileData
 from any_hook.files_modifiers._ignore_aware_transformer import (
     IgnoreAwareTransformer,
 )
@@ -68,7 +67,5 @@ class CombineWith(SeparateModifier[_CombineWithTransformer]):
     ) -> _CombineWithTransformer:
         return _CombineWithTransformer(ignore_pattern)
 
-    def _modify_file(self, file_data: FileData) -> bool:
-        if "with " not in file_data.content:
-            return False
-        return super()._modify_file(file_data)
+    def required_tokens(self) -> tuple[str, ...]:
+        return ("with ", "with(")
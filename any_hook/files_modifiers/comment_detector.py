@@ -1,31 +1,31 @@
 import re
-from collections.abc import Iterable
 from typing import Literal
 
 from libcst import Comment, CSTVisitor
-from libcst.metadata import MetadataWrapper, PositionProvider
 from pydantic import Field
 
 from any_hook._file_data import FileData
-from any_hook.files_modifiers._base import Modifier
+from any_hook.files_modifiers._base import compile_pattern
+from any_hook.files_modifiers.checker_modifier import CheckerModifier
 
 
 class _CommentDetectorVisitor(CSTVisitor):
-    METADATA_DEPENDENCIES = (PositionProvider,)
-
-    def __init__(self, patterns: tuple[re.Pattern[str], ...]) -> None:
+    def __init__(
+        self, file_data: FileData, patterns: tuple[re.Pattern[str], ...]
+    ) -> None:
         super().__init__()
+        self._file_data = file_data
         self._patterns = patterns
         self.violations: list[tuple[str, int]] = []
 
     def visit_Comment(self, node: Comment) -> None:
         text = node.value
         if any(p.search(text) for p in self._patterns):
-            line_num = self.get_metadata(PositionProvider, node).start.line
+            line_num = self._file_data.position(node).start.line
             self.violations.append((text, line_num))
 
 
-class CommentDetector(Modifier):
+class CommentDetector(CheckerModifier[_CommentDetectorVisitor]):
     """Detects comments matching forbidden regex patterns."""
 
     type: Literal["comment-detector"] = "comment-detector"
@@ -33,17 +33,22 @@ class CommentDetector(Modifier):
         description="Regex patterns; any comment matching one is a violation.",
     )
 
-    def modify(self, data: Iterable[FileData]) -> bool:
-        return any(list(map(self._check_file, data)))
-
-    def _check_file(self, file_data: FileData) -> bool:
-        if not self.patterns:
-            return False
-        if not self.should_process_file(file_data.path):
-            return False
-        compiled = tuple(re.compile(p) for p in self.patterns)
-        visitor = _CommentDetectorVisitor(compiled)
-        MetadataWrapper(file_data.module).visit(visitor)
+    def required_tokens(self) -> tuple[str, ...]:
+        return ("#",) if self.patterns else ()
+
+    def precompile(self) -> None:
+        super().precompile()
+        for pattern in self.patterns:
+            compile_pattern(pattern)
+
+    def create_visitor(self, file_data: FileData) -> _CommentDetectorVisitor:
+        return _CommentDetectorVisitor(
+            file_data, tuple(map(compile_pattern, self.patterns))
+        )
+
+    def report(
+        self, file_data: FileData, visitor: _CommentDetectorVisitor
+    ) -> bool:
         if visitor.violations:
             for comment, line_num in visitor.violations:
                 self._output(
@@ -1,24 +1,19 @@
 import re
-from collections.abc import Iterable
 from typing import TYPE_CHECKING, Literal
 
 from libcst import (
     Call,
     CSTVisitor,
     Decorator,
-    Expr,
     FunctionDef,
-    Module,
     Name,
-    SimpleStatementLine,
     SimpleString,
 )
-from libcst.metadata import MetadataWrapper, PositionProvider
 from pydantic import field_validator
 from typing_extensions import TypeIs
 
 from any_hook._file_data import FileData
-from any_hook.files_modifiers._base import Modifier
+from any_hook.files_modifiers.checker_modifier import CheckerModifier
 
 if TYPE_CHECKING:
     from dataclasses import dataclass
@@ -43,11 +38,11 @@ class _ClsUsageVisitor(CSTVisitor):
 
 
 class _FieldValidatorVisitor(CSTVisitor):
-    METADATA_DEPENDENCIES = (PositionProvider,)
-
-    def __init__(self, content: str, ignore_pattern: re.Pattern[str]) -> None:
+    def __init__(
+        self, file_data: FileData, ignore_pattern: re.Pattern[str]
+    ) -> None:
         super().__init__()
-        self._content = content
+        self._file_data = file_data
         self._ignore_pattern = ignore_pattern
         self.violations: list[tuple[str, int]] = []
 
@@ -60,7 +55,7 @@ class _FieldValidatorVisitor(CSTVisitor):
         field_names = self._extract_field_names(decorator)
         cls_used = self._is_cls_used(node)
         if not cls_used and "*" not in field_names:
-            line_num = self.get_metadata(PositionProvider, node).start.line
+            line_num = self._file_data.position(node).start.line
             self.violations.append(
                 (
                     f"{node.name.value}({', '.join(repr(f) for f in field_names)}): "
@@ -118,17 +113,13 @@ class _FieldValidatorVisitor(CSTVisitor):
         return checker.cls_used
 
     def _has_ignore_comment(self, decorator: Decorator) -> bool:
-        temp_module = Module(
-            body=[SimpleStatementLine(body=[Expr(value=decorator.decorator)])]
+        return self._file_data.line_index.is_ignored(
+            self._ignore_pattern,
+            self._file_data.position(decorator.decorator),
         )
-        decorator_code = temp_module.code.strip()
-        for line in self._content.splitlines():
-            if decorator_code in line and self._ignore_pattern.search(line):
-                return True
-        return False
 
 
-class FieldValidatorCheck(Modifier):
+class FieldValidatorCheck(CheckerModifier[_FieldValidatorVisitor]):
     """Detects misused pydantic @field_validator decorators.
 
     Reports validators where cls is not referenced in the method body,
@@ -163,17 +154,15 @@ class FieldValidatorCheck(Modifier):
 
     type: Literal["field-validator-check"] = "field-validator-check"
 
-    def modify(self, data: Iterable[FileData]) -> bool:
-        return any(list(map(self._check_file, data)))
+    def required_tokens(self) -> tuple[str, ...]:
+        return ("field_validator",)
 
-    def _check_file(self, file_data: FileData) -> bool:
-        if "field_validator" not in file_data.content:
-            return False
-        if not self.should_process_file(file_data.path):
-            return False
-        compiled = re.compile(self.ignore_pattern, re.IGNORECASE)
-        visitor = _FieldValidatorVisitor(file_data.content, compiled)
-        MetadataWrapper(file_data.module).visit(visitor)
+    def create_visitor(self, file_data: FileData) -> _FieldValidatorVisitor:
+        return _FieldValidatorVisitor(file_data, self.ignore_regex)
+
+    def report(
+        self, file_data: FileData, visitor: _FieldValidatorVisitor
+    ) -> bool:
         if not visitor.violations:
             return False
         for violation, line_num in visitor.violations:
@@ -1,26 +1,22 @@
 import re
-from collections.abc import Iterable
 from typing import Literal
 
 from libcst import Call, CSTVisitor, Expr, Module, Name, SimpleStatementLine
-from libcst.metadata import MetadataWrapper, PositionProvider
 from pydantic import Field
 
 from any_hook._file_data import FileData
-from any_hook.files_modifiers._base import Modifier
+from any_hook.files_modifiers.checker_modifier import CheckerModifier
 
 
 class _ForbiddenFunctionsVisitor(CSTVisitor):
-    METADATA_DEPENDENCIES = (PositionProvider,)
-
     def __init__(
         self,
-        content: str,
+        file_data: FileData,
         ignore_pattern: re.Pattern[str],
         forbidden_functions: tuple[str, ...],
     ) -> None:
         super().__init__()
-        self._content = content
+        self._file_data = file_data
         self._ignore_pattern = ignore_pattern
         self._forbidden_functions = forbidden_functions
         self.violations: list[tuple[str, str, int]] = []
@@ -30,22 +26,16 @@ class _ForbiddenFunctionsVisitor(CSTVisitor):
             isinstance(node.func, Name)
             and node.func.value in self._forbidden_functions
         ):
-            if not self._has_ignore_comment(node):
+            position = self._file_data.position(node)
+            if not self._file_data.line_index.is_ignored(
+                self._ignore_pattern, position
+            ):
                 call_text = self._format_call(node)
-                line_num = self.get_metadata(PositionProvider, node).start.line
-                self.violations.append((node.func.value, call_text, line_num))
+                self.violations.append(
+                    (node.func.value, call_text, position.start.line)
+                )
         return True
 
-    def _has_ignore_comment(self, node: Call) -> bool:
-        expr_stmt = Expr(value=node)
-        statement = SimpleStatementLine(body=[expr_stmt])
-        temp_module = Module(body=[statement])
-        code = temp_module.code.strip()
-        for line in self._content.splitlines():
-            if code in line and self._ignore_pattern.search(line):
-                return True
-        return False
-
     @staticmethod
     def _format_call(node: Call) -> str:
         expr_stmt = Expr(value=node)
@@ -54,7 +44,7 @@ class _ForbiddenFunctionsVisitor(CSTVisitor):
         return temp_module.code.strip()
 
 
-class ForbiddenFunctions(Modifier):
+class ForbiddenFunctions(CheckerModifier[_ForbiddenFunctionsVisitor]):
     """Detects calls to forbidden function names.
 
     Reports any direct function calls matching the specified forbidden names.
@@ -95,19 +85,19 @@ class ForbiddenFunctions(Modifier):
         description="Tuple of function names that should not be called in the codebase.",
     )
 
-    def modify(self, data: Iterable[FileData]) -> bool:
-        return any(list(map(self._check_file, data)))
-
-    def _check_file(self, file_data: FileData) -> bool:
-        if not self.forbidden_functions:
-            return False
-        if not self.should_process_file(file_data.path):
-            return False
-        compiled_pattern = re.compile(self.ignore_pattern, re.IGNORECASE)
-        visitor = _ForbiddenFunctionsVisitor(
-            file_data.content, compiled_pattern, self.forbidden_functions
+    def required_tokens(self) -> tuple[str, ...]:
+        return self.forbidden_functions
+
+    def create_visitor(
+        self, file_data: FileData
+    ) -> _ForbiddenFunctionsVisitor:
+        return _ForbiddenFunctionsVisitor(
+            file_data, self.ignore_regex, self.forbidden_functions
         )
-        MetadataWrapper(file_data.module).visit(visitor)
+
+    def report(
+        self, file_data: FileData, visitor: _ForbiddenFunctionsVisitor
+    ) -> bool:
         if visitor.violations:
             for func_name, call_text, line_num in visitor.violations:
                 self._output(
@@ -1,7 +1,7 @@
 import subprocess
 from collections.abc import Iterable
 from pathlib import Path
-from typing import TYPE_CHECKING, Literal, NamedTuple
+from typing import TYPE_CHECKING, ClassVar, Literal, NamedTuple
 
 import libcst as cst
 from autoimport import fix_code
@@ -15,6 +15,7 @@ from pydantic import BaseModel, Field, RootModel
 from pydantic_settings import BaseSettings
 
 from any_hook._file_data import FileData
+from any_hook._transaction import is_dry_run
 from any_hook.files_modifiers._base import Modifier
 
 _PYDANTIC_BASES = frozenset(
@@ -197,28 +198,26 @@ def _build_registry(
                     pydantic_keys.add(_ClassKey(stub_file, class_name))
                     break
 
-    changed = True
-    while changed:
-        changed = False
-        for stub_file, info in file_infos.items():
-            for class_name, bases in info.class_bases.items():
-                class_key = _ClassKey(stub_file, class_name)
-                if class_key in pydantic_keys:
-                    continue
-                for base in bases:
-                    if _ClassKey(stub_file, base) in pydantic_keys:
-                        pydantic_keys.add(class_key)
-                        changed = True
-                        break
-                    source = info.imports.get(base)
-                    if (
-                        source
-                        and _ClassKey(_file_key(source, output_dir), base)
-                        in pydantic_keys
-                    ):
-                        pydantic_keys.add(class_key)
-                        changed = True
-                        break
+    dependents: dict[_ClassKey, list[_ClassKey]] = {}
+    for stub_file, info in file_infos.items():
+        for class_name, bases in info.class_bases.items():
+            class_key = _ClassKey(stub_file, class_name)
+            for base in bases:
+                base_keys = [_ClassKey(stub_file, base)]
+                source = info.imports.get(base)
+                if source:
+                    base_keys.append(
+                        _ClassKey(_file_key(source, output_dir), base)
+                    )
+                for base_key in base_keys:
+                    dependents.setdefault(base_key, []).append(class_key)
+
+    pending = list(pydantic_keys)
+    while pending:
+        for class_key in dependents.get(pending.pop(), ()):
+            if class_key not in pydantic_keys:
+                pydantic_keys.add(class_key)
+                pending.append(class_key)
 
     registry: dict[_ClassKey, list[_FieldEntry]] = {}
 
@@ -402,6 +401,7 @@ class GenerateStubs(Modifier):
     """
 
     type: Literal["generate-stubs"] = "generate-stubs"
+    whole_corpus: ClassVar[bool] = True
     directories: tuple[Path, ...] = Field(
         min_length=1,
         description="Source directories; only FileData paths under these are stubbed.",
@@ -419,6 +419,11 @@ class GenerateStubs(Modifier):
         ]
         if not files_to_stub:
             return False
+        if is_dry_run():
+            self._output(
+                f"Skipped generating stubs for {len(files_to_stub)} file(s) in a dry run"
+            )
+            return False
         before = self._snapshot_stubs()
         subprocess.run(
             [
@@ -1,27 +1,21 @@
 import re
-from collections.abc import Iterable
-from typing import Literal, cast
+from typing import ClassVar, Literal, cast
 
 from libcst import (
     Attribute,
-    ClassDef,
     CSTVisitor,
-    Expr,
     Import,
     ImportFrom,
     ImportStar,
     Index,
-    Module,
     Name,
-    SimpleStatementLine,
     Subscript,
 )
-from libcst.metadata import MetadataWrapper, PositionProvider
 from pydantic import Field
 
 from any_hook._file_data import FileData
-from any_hook.files_modifiers._base import Modifier
-from any_hook.services import ClassHierarchyDetector, ImportPathTracker
+from any_hook.files_modifiers.checker_modifier import CheckerModifier
+from any_hook.services import shared_import_path_tracker
 
 
 def _dotted_name(node: Name | Attribute) -> str:
@@ -34,8 +28,6 @@ def _dotted_name(node: Name | Attribute) -> str:
 
 
 class _InstanceOfVisitor(CSTVisitor):
-    METADATA_DEPENDENCIES = (PositionProvider,)
-
     def __init__(
         self,
         file_data: FileData,
@@ -46,7 +38,9 @@ class _InstanceOfVisitor(CSTVisitor):
         super().__init__()
         self._file_data = file_data
         self._ignore_pattern = ignore_pattern
-        self._tracker = ImportPathTracker(source_roots, extra_sys_path)
+        self._tracker = shared_import_path_tracker(
+            source_roots, extra_sys_path
+        )
         self._instance_of_names: set[str] = set()
         self._pydantic_module_names: set[str] = set()
         self.violations: list[tuple[str, int]] = []
@@ -88,7 +82,7 @@ class _InstanceOfVisitor(CSTVisitor):
         if self._has_ignore_comment(node):
             return True
         if self._is_pydantic_model(class_name):
-            line_num = self.get_metadata(PositionProvider, node).start.line
+            line_num = self._file_data.position(node).start.line
             self.violations.append((class_name, line_num))
         return True
 
@@ -116,30 +110,17 @@ class _InstanceOfVisitor(CSTVisitor):
         return None
 
     def _is_pydantic_model(self, name: str) -> bool:
-        class_definitions = {
-            node.name.value: node
-            for node in self._file_data.module.body
-            if isinstance(node, ClassDef)
-        }
-        if name in class_definitions:
-            if ClassHierarchyDetector(class_definitions).is_subclass_of(
-                class_definitions[name], {"BaseModel"}
-            ):
-                return True
         return self._tracker.is_subclass_via_imports(
             name, self._file_data.module, self._file_data.path, {"BaseModel"}
         )
 
     def _has_ignore_comment(self, node: Subscript) -> bool:
-        statement = SimpleStatementLine(body=[Expr(value=node)])
-        code = Module(body=[statement]).code.strip()
-        return any(
-            code in line and self._ignore_pattern.search(line)
-            for line in self._file_data.content.splitlines()
+        return self._file_data.line_index.is_ignored(
+            self._ignore_pattern, self._file_data.position(node)
         )
 
 
-class InstanceOfPydanticModelDetector(Modifier):
+class InstanceOfPydanticModelDetector(CheckerModifier[_InstanceOfVisitor]):
     """Detects unneeded `InstanceOf[Model]` usages where `Model` is already
     a Pydantic `BaseModel` subclass.
 
@@ -167,7 +148,8 @@ class InstanceOfPydanticModelDetector(Modifier):
         Resolution follows imports across project files and installed
         packages to determine whether the referenced class is a Pydantic
         model. If the target class cannot be resolved, no violation is
-        reported.
+        reported. Because the verdict depends on other files, runs that
+        include this modifier bypass the result cache.
         Use ignore_pattern to suppress specific violations.
         Use excluded_paths or included_paths (inherited from Modifier) to filter files.
     """
@@ -175,6 +157,7 @@ class InstanceOfPydanticModelDetector(Modifier):
     type: Literal["instance-of-pydantic-model-detector"] = (
         "instance-of-pydantic-model-detector"
     )
+    cacheable: ClassVar[bool] = False
     source_roots: tuple[str, ...] = Field(
         default=(".",),
         description="Source root directories used to resolve imported modules to files.",
@@ -184,17 +167,18 @@ class InstanceOfPydanticModelDetector(Modifier):
         description="Additional directories (e.g. '.venv/lib/python3.12/site-packages') to search when resolving imported modules from installed packages.",
     )
 
-    def modify(self, data: Iterable[FileData]) -> bool:
-        return any(list(map(self._check_file, data)))
+    def required_tokens(self) -> tuple[str, ...]:
+        return ("InstanceOf",)
 
-    def _check_file(self, file_data: FileData) -> bool:
-        if not self.should_process_file(file_data.path):
-            return False
-        compiled_pattern = re.compile(self.ignore_pattern, re.IGNORECASE)
-        visitor = _InstanceOfVisitor(
-            file_data, compiled_pattern, self.source_roots, self.extra_sys_path
+    def create_visitor(self, file_data: FileData) -> _InstanceOfVisitor:
+        return _InstanceOfVisitor(
+            file_data,
+            self.ignore_regex,
+            self.source_roots,
+            self.extra_sys_path,
         )
-        MetadataWrapper(file_data.module).visit(visitor)
+
+    def report(self, file_data: FileData, visitor: _InstanceOfVisitor) -> bool:
         if not visitor.violations:
             return False
         for class_name, line_num in visitor.violations:
@@ -1,5 +1,4 @@
 import re
-from collections.abc import Iterable
 from typing import Literal
 
 from libcst import (
@@ -19,10 +18,9 @@ from libcst import (
     SubscriptElement,
 )
 from libcst.helpers import get_absolute_module_for_import
-from libcst.metadata import MetadataWrapper, PositionProvider
 
 from any_hook._file_data import FileData
-from any_hook.files_modifiers._base import Modifier
+from any_hook.files_modifiers.checker_modifier import CheckerModifier
 
 _STATIC_LEAKY_VALUES: frozenset[str] = frozenset({"object", "Any"})
 _STATIC_MAPPING_NAMES: frozenset[str] = frozenset(
@@ -32,6 +30,7 @@ _STATIC_DICT_NAMES: frozenset[str] = frozenset({"dict", "Dict"})
 _TRACKED_MODULES: frozenset[str] = frozenset(
     {"typing", "collections.abc", "typing_extensions"}
 )
+_PREFILTER_NAMES = ("Mapping", "dict", "Dict")
 
 
 def _get_base_name(node: BaseExpression) -> str | None:
@@ -80,16 +79,14 @@ def _contains_leaky_type(
 
 
 class _LeakyMappingTypingVisitor(CSTVisitor):
-    METADATA_DEPENDENCIES = (PositionProvider,)
-
     def __init__(
         self,
-        content: str,
+        file_data: FileData,
         module: Module,
         ignore_pattern: re.Pattern[str],
     ) -> None:
         super().__init__()
-        self._content = content
+        self._file_data = file_data
         self._module = module
         self._ignore_pattern = ignore_pattern
         self._leaky_values: set[str] = set(_STATIC_LEAKY_VALUES)
@@ -144,20 +141,16 @@ class _LeakyMappingTypingVisitor(CSTVisitor):
             node, self._leaky_values, self._mapping_names, self._dict_names
         ):
             return
-        annotation_text = self._module.code_for_node(node)
-        if self._has_ignore_comment(annotation_text):
+        position = self._file_data.position(node)
+        if self._file_data.line_index.is_ignored(
+            self._ignore_pattern, position
+        ):
             return
-        line_num = self.get_metadata(PositionProvider, node).start.line
-        self.violations.append((annotation_text, line_num))
-
-    def _has_ignore_comment(self, annotation_text: str) -> bool:
-        for line in self._content.splitlines():
-            if annotation_text in line and self._ignore_pattern.search(line):
-                return True
-        return False
+        annotation_text = self._module.code_for_node(node)
+        self.violations.append((annotation_text, position.start.line))
 
 
-class LeakyMappingTyping(Modifier):
+class LeakyMappingTyping(CheckerModifier[_LeakyMappingTypingVisitor]):
     """Detects leaky dict/Mapping type hints in function signatures.
 
     Flags type annotations on function and method parameters and return types
@@ -193,17 +186,19 @@ class LeakyMappingTyping(Modifier):
 
     type: Literal["leaky-mapping-typing"] = "leaky-mapping-typing"
 
-    def modify(self, data: Iterable[FileData]) -> bool:
-        return any(list(map(self._check_file, data)))
+    def required_tokens(self) -> tuple[str, ...]:
+        return _PREFILTER_NAMES
 
-    def _check_file(self, file_data: FileData) -> bool:
-        if not self.should_process_file(file_data.path):
-            return False
-        compiled_pattern = re.compile(self.ignore_pattern, re.IGNORECASE)
-        visitor = _LeakyMappingTypingVisitor(
-            file_data.content, file_data.module, compiled_pattern
+    def create_visitor(
+        self, file_data: FileData
+    ) -> _LeakyMappingTypingVisitor:
+        return _LeakyMappingTypingVisitor(
+            file_data, file_data.module, self.ignore_regex
         )
-        MetadataWrapper(file_data.module).visit(visitor)
+
+    def report(
+        self, file_data: FileData, visitor: _LeakyMappingTypingVisitor
+    ) -> bool:
         if visitor.violations:
             for annotation_text, line_num in visitor.violations:
                 self._output(
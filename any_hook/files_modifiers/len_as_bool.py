@@ -12,7 +12,6 @@ from libcst import (
     While,
 )
 
-from any_hook._file_data import FileData
 from any_hook.files_modifiers._ignore_aware_transformer import (
     IgnoreAwareTransformer,
 )
@@ -99,7 +98,5 @@ class LenAsBool(SeparateModifier[_LenAsBoolTransformer]):
     ) -> _LenAsBoolTransformer:
         return _LenAsBoolTransformer(ignore_pattern)
 
-    def _modify_file(self, file_data: FileData) -> bool:
-        if "len(" not in file_data.content:
-            return False
-        return super()._modify_file(file_data)
+    def required_tokens(self) -> tuple[str, ...]:
+        return ("len(",)
@@ -1,5 +1,4 @@
 import re
-from collections.abc import Iterable
 from typing import Literal
 
 from libcst import (
@@ -11,18 +10,17 @@ from libcst import (
     Module,
     SimpleStatementLine,
 )
-from libcst.metadata import MetadataWrapper, PositionProvider
 
 from any_hook._file_data import FileData
-from any_hook.files_modifiers._base import Modifier
+from any_hook.files_modifiers.checker_modifier import CheckerModifier
 
 
 class _LocalImportVisitor(CSTVisitor):
-    METADATA_DEPENDENCIES = (PositionProvider,)
-
-    def __init__(self, content: str, ignore_pattern: re.Pattern[str]) -> None:
+    def __init__(
+        self, file_data: FileData, ignore_pattern: re.Pattern[str]
+    ) -> None:
         super().__init__()
-        self._content = content
+        self._file_data = file_data
         self._ignore_pattern = ignore_pattern
         self._depth = 0
         self.violations: list[tuple[str, int]] = []
@@ -42,27 +40,21 @@ class _LocalImportVisitor(CSTVisitor):
         self._depth -= 1
 
     def visit_Import(self, node: Import) -> bool:
-        if self._depth > 0 and not self._has_ignore_comment(node):
-            import_text = self._format_import(node)
-            line_num = self.get_metadata(PositionProvider, node).start.line
-            self.violations.append((import_text, line_num))
+        if self._depth > 0:
+            self._report(node, self._format_import(node))
         return True
 
     def visit_ImportFrom(self, node: ImportFrom) -> bool:
-        if self._depth > 0 and not self._has_ignore_comment(node):
-            import_text = self._format_import_from(node)
-            line_num = self.get_metadata(PositionProvider, node).start.line
-            self.violations.append((import_text, line_num))
+        if self._depth > 0:
+            self._report(node, self._format_import_from(node))
         return True
 
-    def _has_ignore_comment(self, node: Import | ImportFrom) -> bool:
-        statement = SimpleStatementLine(body=[node])
-        temp_module = Module(body=[statement])
-        code = temp_module.code.strip()
-        for line in self._content.splitlines():
-            if code in line and self._ignore_pattern.search(line):
-                return True
-        return False
+    def _report(self, node: Import | ImportFrom, import_text: str) -> None:
+        position = self._file_data.position(node)
+        if not self._file_data.line_index.is_ignored(
+            self._ignore_pattern, position
+        ):
+            self.violations.append((import_text, position.start.line))
 
     @staticmethod
     def _format_import(node: Import) -> str:
@@ -77,7 +69,7 @@ class _LocalImportVisitor(CSTVisitor):
         return temp_module.code.strip()
 
 
-class LocalImports(Modifier):
+class LocalImports(CheckerModifier[_LocalImportVisitor]):
     """Detects import statements inside functions or classes.
 
     Reports any import or from-import statements that appear inside function
@@ -108,15 +100,15 @@ class LocalImports(Modifier):
 
     type: Literal["local-imports"] = "local-imports"
 
-    def modify(self, data: Iterable[FileData]) -> bool:
-        return any(list(map(self._check_file, data)))
+    def required_tokens(self) -> tuple[str, ...]:
+        return ("import",)
+
+    def create_visitor(self, file_data: FileData) -> _LocalImportVisitor:
+        return _LocalImportVisitor(file_data, self.ignore_regex)
 
-    def _check_file(self, file_data: FileData) -> bool:
-        if not self.should_process_file(file_data.path):
-            return False
-        compiled_pattern = re.compile(self.ignore_pattern, re.IGNORECASE)
-        visitor = _LocalImportVisitor(file_data.content, compiled_pattern)
-        MetadataWrapper(file_data.module).visit(visitor)
+    def report(
+        self, file_data: FileData, visitor: _LocalImportVisitor
+    ) -> bool:
         if visitor.violations:
             for import_text, line_num in visitor.violations:
                 self._output(
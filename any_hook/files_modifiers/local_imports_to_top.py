@@ -1,8 +1,7 @@
-import importlib.util
 import re
 import sys
 from pathlib import Path
-from typing import Literal, NamedTuple
+from typing import ClassVar, Literal, NamedTuple
 
 from libcst import (
     BaseString,
@@ -19,11 +18,11 @@ from libcst import (
 )
 from pydantic import Field
 
-from any_hook._file_data import FileData
 from any_hook.files_modifiers._ignore_aware_transformer import (
     IgnoreAwareTransformer,
 )
 from any_hook.files_modifiers.separate_modifier import SeparateModifier
+from any_hook.services import shared_module_index
 
 
 class ImportLine(NamedTuple):
@@ -178,13 +177,11 @@ class _LocalImportsToTopTransformer(IgnoreAwareTransformer):
     def _is_external_import(self, module_name: str) -> bool:
         if self._is_stdlib(module_name):
             return True
-        spec = importlib.util.find_spec(module_name)
-        if spec is None:
-            return True
-        if spec.origin is None:
+        origin = shared_module_index().find((module_name,))
+        if origin is None:
             return True
         try:
-            origin_path = Path(spec.origin).resolve()
+            origin_path = origin.resolve()
             if "site-packages" in str(origin_path):
                 return True
             cwd = Path.cwd().resolve()
@@ -229,9 +226,14 @@ class LocalImportsToTop(SeparateModifier[_LocalImportsToTopTransformer]):
             >>> from . import utils
             >>> def process():
             ...     return json.dumps({})
+
+    Note:
+        Whether an import is external depends on the modules installed, so
+        runs that include this modifier bypass the result cache.
     """
 
     type: Literal["local-imports-to-top"] = "local-imports-to-top"
+    cacheable: ClassVar[bool] = False
     include_src_imports: bool = Field(default=False)
 
     def create_transformer(
@@ -241,9 +243,5 @@ class LocalImportsToTop(SeparateModifier[_LocalImportsToTopTransformer]):
             ignore_pattern, self.include_src_imports
         )
 
-    def _modify_file(self, file_data: FileData) -> bool:
-        if not any(
-            keyword in file_data.content for keyword in ("import ", "from ")
-        ):
-            return False
-        return super()._modify_file(file_data)
+    def required_tokens(self) -> tuple[str, ...]:
+        return ("import ", "from ")
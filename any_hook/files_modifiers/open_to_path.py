@@ -26,7 +26,6 @@ from libcst import (
 from libcst.helpers import get_absolute_module_for_import
 from pydantic import Field
 
-from any_hook._file_data import FileData
 from any_hook.files_modifiers._ignore_aware_transformer import (
     IgnoreAwareTransformer,
 )
@@ -278,7 +277,5 @@ class OpenToPath(SeparateModifier[_OpenToPathTransformer]):
     ) -> _OpenToPathTransformer:
         return _OpenToPathTransformer(ignore_pattern, self.import_adder)
 
-    def _modify_file(self, file_data: FileData) -> bool:
-        if "open(" not in file_data.content:
-            return False
-        return super()._modify_file(file_data)
+    def required_tokens(self) -> tuple[str, ...]:
+        return ("open(",)
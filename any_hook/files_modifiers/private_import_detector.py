@@ -1,5 +1,4 @@
 import re
-from collections.abc import Iterable
 from pathlib import Path
 from typing import TYPE_CHECKING, Literal
 
@@ -13,7 +12,6 @@ from libcst import (
     Name,
     SimpleStatementLine,
 )
-from libcst.metadata import MetadataWrapper, PositionProvider
 from pydantic import Field
 
 if TYPE_CHECKING:
@@ -22,7 +20,7 @@ else:
     ImportAttribute = cst.Attribute
 
 from any_hook._file_data import FileData
-from any_hook.files_modifiers._base import Modifier
+from any_hook.files_modifiers.checker_modifier import CheckerModifier
 
 
 def _dotted_name(node: "ImportAttribute | Name") -> str:
@@ -63,17 +61,15 @@ def _file_package(path: Path) -> str:
 
 
 class _PrivateImportVisitor(CSTVisitor):
-    METADATA_DEPENDENCIES = (PositionProvider,)
-
     def __init__(
         self,
         file_package: str,
-        content: str,
+        file_data: FileData,
         ignore_pattern: re.Pattern[str],
     ) -> None:
         super().__init__()
         self._file_package = file_package
-        self._content = content
+        self._file_data = file_data
         self._ignore_pattern = ignore_pattern
         self.violations: list[tuple[str, int]] = []
 
@@ -85,7 +81,7 @@ class _PrivateImportVisitor(CSTVisitor):
             if not self._is_sibling(
                 module_str
             ) and not self._has_ignore_comment(node):
-                line_num = self.get_metadata(PositionProvider, node).start.line
+                line_num = self._file_data.position(node).start.line
                 self.violations.append((self._format(node), line_num))
         elif not isinstance(node.names, ImportStar):
             for alias in node.names:
@@ -98,9 +94,7 @@ class _PrivateImportVisitor(CSTVisitor):
                     if not _is_allowed(
                         self._file_package, parent
                     ) and not self._has_ignore_comment(node):
-                        line_num = self.get_metadata(
-                            PositionProvider, node
-                        ).start.line
+                        line_num = self._file_data.position(node).start.line
                         self.violations.append((self._format(node), line_num))
                         break
         return True
@@ -112,9 +106,7 @@ class _PrivateImportVisitor(CSTVisitor):
                 module_str
             ):
                 if not self._has_ignore_comment(node):
-                    line_num = self.get_metadata(
-                        PositionProvider, node
-                    ).start.line
+                    line_num = self._file_data.position(node).start.line
                     self.violations.append((self._format(node), line_num))
                 break
         return True
@@ -123,12 +115,8 @@ class _PrivateImportVisitor(CSTVisitor):
         return _is_allowed(self._file_package, _target_parent(module_str))
 
     def _has_ignore_comment(self, node: Import | ImportFrom) -> bool:
-        statement = SimpleStatementLine(body=[node])
-        temp_module = Module(body=[statement])
-        code = temp_module.code.strip()
-        return any(
-            code in line and self._ignore_pattern.search(line)
-            for line in self._content.splitlines()
+        return self._file_data.line_index.is_ignored(
+            self._ignore_pattern, self._file_data.position(node)
         )
 
     @staticmethod
@@ -138,7 +126,7 @@ class _PrivateImportVisitor(CSTVisitor):
         return temp_module.code.strip()
 
 
-class PrivateImportDetector(Modifier):
+class PrivateImportDetector(CheckerModifier[_PrivateImportVisitor]):
     """Detects imports of private elements from outside their directory."""
 
     type: Literal["private-import-detector"] = "private-import-detector"
@@ -147,18 +135,16 @@ class PrivateImportDetector(Modifier):
         description="Source root directories used to derive package paths from file paths.",
     )
 
-    def modify(self, data: Iterable[FileData]) -> bool:
-        return any(list(map(self._check_file, data)))
+    def required_tokens(self) -> tuple[str, ...]:
+        return ("import",)
 
-    def _check_file(self, file_data: FileData) -> bool:
-        if not self.should_process_file(file_data.path):
-            return False
+    def create_visitor(self, file_data: FileData) -> _PrivateImportVisitor:
         pkg = self._resolve_package(file_data.path)
-        compiled_pattern = re.compile(self.ignore_pattern, re.IGNORECASE)
-        visitor = _PrivateImportVisitor(
-            pkg, file_data.content, compiled_pattern
-        )
-        MetadataWrapper(file_data.module).visit(visitor)
+        return _PrivateImportVisitor(pkg, file_data, self.ignore_regex)
+
+    def report(
+        self, file_data: FileData, visitor: _PrivateImportVisitor
+    ) -> bool:
         if visitor.violations:
             for import_text, line_num in visitor.violations:
                 self._output(
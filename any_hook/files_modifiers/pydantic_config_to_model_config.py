@@ -30,7 +30,6 @@ from libcst import (
 )
 from pydantic import ConfigDict, Field
 
-from any_hook._file_data import FileData
 from any_hook.files_modifiers._ignore_aware_transformer import (
     IgnoreAwareTransformer,
 )
@@ -470,13 +469,14 @@ class PydanticConfigToModelConfig(
             ignore_pattern, self.config_class_name, self.import_adder
         )
 
-    def _modify_file(self, file_data: FileData) -> bool:
-        if f"class {self.config_class_name}" not in file_data.content:
-            has_inline_kwargs = any(
-                "(" in line and "=" in line
-                for line in file_data.content.splitlines()
-                if line.startswith("class ")
-            )
-            if not has_inline_kwargs:
-                return False
-        return super()._modify_file(file_data)
+    def required_tokens(self) -> tuple[str, ...]:
+        return ("class ",)
+
+    def should_process_content(self, content: str) -> bool:
+        if f"class {self.config_class_name}" in content:
+            return True
+        return any(
+            "(" in line and "=" in line
+            for line in content.splitlines()
+            if line.startswith("class ")
+        )
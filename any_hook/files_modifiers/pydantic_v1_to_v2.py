@@ -15,7 +15,6 @@ if TYPE_CHECKING:
 else:
     ImportAttribute = Attribute
 
-from any_hook._file_data import FileData
 from any_hook.files_modifiers._ignore_aware_transformer import (
     IgnoreAwareTransformer,
 )
@@ -142,7 +141,5 @@ class PydanticV1ToV2(SeparateModifier[_PydanticV1ToV2Transformer]):
     ) -> _PydanticV1ToV2Transformer:
         return _PydanticV1ToV2Transformer(ignore_pattern)
 
-    def _modify_file(self, file_data: FileData) -> bool:
-        if "pydantic.v1" not in file_data.content:
-            return False
-        return super()._modify_file(file_data)
+    def required_tokens(self) -> tuple[str, ...]:
+        return ("pydantic.v1",)
@@ -8,12 +8,18 @@ from libcst import (
     SimpleString,
 )
 
-from any_hook._file_data import FileData
 from any_hook.files_modifiers._ignore_aware_transformer import (
     IgnoreAwareTransformer,
 )
 from any_hook.files_modifiers.separate_modifier import SeparateModifier
 
+_F_STRING_TOKENS = tuple(
+    f"{prefix}{quote}"
+    for prefix in ("f", "F", "fr", "fR", "Fr", "FR")
+    for quote in ('"', "'")
+)
+_DROP_F = str.maketrans("", "", "fF")
+
 
 class _RemoveFPrefixTransformer(IgnoreAwareTransformer):
     def leave_FormattedString(
@@ -27,16 +33,18 @@ class _RemoveFPrefixTransformer(IgnoreAwareTransformer):
         ):
             return updated_node
         quote = updated_node.end
+        prefix = updated_node.start[: -len(quote)].translate(_DROP_F)
         text = "".join(
             part.value
             for part in updated_node.parts
             if isinstance(part, FormattedStringText)
         )
-        return SimpleString(f"{quote}{text}{quote}")
+        return SimpleString(f"{prefix}{quote}{text}{quote}")
 
 
 class RemoveFPrefix(SeparateModifier[_RemoveFPrefixTransformer]):
-    """Removes f prefix from f-strings that contain no placeholders.
+    """Removes f prefix from f-strings that contain no placeholders. Raw
+    f-strings keep their r prefix.
 
     Examples:
         Before:
@@ -53,7 +61,5 @@ class RemoveFPrefix(SeparateModifier[_RemoveFPrefixTransformer]):
     ) -> _RemoveFPrefixTransformer:
         return _RemoveFPrefixTransformer(ignore_pattern)
 
-    def _modify_file(self, file_data: FileData) -> bool:
-        if 'f"' not in file_data.content and "f'" not in file_data.content:
-            return False
-        return super()._modify_file(file_data)
+    def required_tokens(self) -> tuple[str, ...]:
+        return _F_STRING_TOKENS
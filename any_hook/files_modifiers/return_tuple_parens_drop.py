@@ -7,10 +7,10 @@ from libcst import (
     ParenthesizedWhitespace,
     Return,
     RightParen,
+    SimpleWhitespace,
     Tuple,
 )
 
-from any_hook._file_data import FileData
 from any_hook.files_modifiers._ignore_aware_transformer import (
     IgnoreAwareTransformer,
 )
@@ -33,8 +33,13 @@ class _ReturnTupleParensDropTransformer(IgnoreAwareTransformer):
             return updated_node
         if not self._is_single_line(value):
             return updated_node
+        # "return(a, b)" needs a space once its parentheses are gone
+        whitespace = updated_node.whitespace_after_return
+        if isinstance(whitespace, SimpleWhitespace) and not whitespace.value:
+            whitespace = SimpleWhitespace(" ")
         return updated_node.with_changes(
-            value=value.with_changes(lpar=[], rpar=[])
+            value=value.with_changes(lpar=[], rpar=[]),
+            whitespace_after_return=whitespace,
         )
 
     @staticmethod
@@ -72,7 +77,5 @@ class ReturnTupleParensDrop(
     ) -> _ReturnTupleParensDropTransformer:
         return _ReturnTupleParensDropTransformer(ignore_pattern)
 
-    def _modify_file(self, file_data: FileData) -> bool:
-        if "return (" not in file_data.content:
-            return False
-        return super()._modify_file(file_data)
+    def required_tokens(self) -> tuple[str, ...]:
+        return ("return (", "return(")
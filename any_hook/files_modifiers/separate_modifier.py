@@ -8,6 +8,7 @@ from pydantic import ConfigDict
 
 from any_hook._file_data import FileData
 from any_hook.files_modifiers._base import Modifier
+from any_hook.files_modifiers._fused import FusedTransformer
 
 TransformerType = TypeVar("TransformerType", bound=CSTTransformer)
 
@@ -19,16 +20,21 @@ class SeparateModifier(Modifier, ABC, Generic[TransformerType]):
         return any(list(map(self._modify_file, data)))
 
     def _modify_file(self, file_data: FileData) -> bool:
-        if not self.should_process_file(file_data.path):
+        if not (
+            self.should_process_file(file_data.path)
+            and self.accepts_content(file_data.content)
+        ):
             return False
-        compiled = re.compile(self.ignore_pattern, re.IGNORECASE)
-        new_code = file_data.module.visit(
-            self.create_transformer(compiled)
-        ).code
+        transformer = FusedTransformer(
+            (self.create_transformer(self.ignore_regex),)
+        )
+        new_module = file_data.module.visit(transformer)
+        if not transformer.changed:
+            return False
+        new_code = new_module.code
         if new_code == file_data.content:
             return False
-        file_data.path.write_text(new_code)
-        self._output(f"File {file_data.path} was modified")
+        self._write(file_data, new_code)
         return True
 
     @abstractmethod
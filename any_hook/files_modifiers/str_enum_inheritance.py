@@ -19,7 +19,6 @@ from libcst import (
 from libcst.helpers import get_absolute_module_for_import
 from pydantic import Field
 
-from any_hook._file_data import FileData
 from any_hook.files_modifiers._ignore_aware_transformer import (
     IgnoreAwareTransformer,
 )
@@ -231,15 +230,12 @@ class StrEnumInheritance(SeparateModifier[_StrEnumInheritanceTransformer]):
             import_adder=self.import_adder,
         )
 
-    def _modify_file(self, file_data: FileData) -> bool:
-        has_str_enum_target = (
-            enum.Enum.__name__ in file_data.content
-            and str.__name__ in file_data.content
-        )
+    def required_tokens(self) -> tuple[str, ...]:
+        return (enum.Enum.__name__,)
+
+    def should_process_content(self, content: str) -> bool:
+        has_str_enum_target = str.__name__ in content
         has_existing_str_enum = (
-            self.convert_existing_str_enum
-            and enum.StrEnum.__name__ in file_data.content
+            self.convert_existing_str_enum and enum.StrEnum.__name__ in content
         )
-        if not (has_str_enum_target or has_existing_str_enum):
-            return False
-        return super()._modify_file(file_data)
+        return has_str_enum_target or has_existing_str_enum
@@ -1,5 +1,4 @@
 import re
-from collections.abc import Iterable
 from typing import Literal, Optional, cast
 
 from libcst import (
@@ -13,11 +12,11 @@ from libcst import (
     Name,
     Subscript,
 )
-from libcst.metadata import MetadataWrapper, PositionProvider
 from pydantic import Field
 
 from any_hook._file_data import FileData
-from any_hook.files_modifiers._base import Modifier
+from any_hook.files_modifiers._base import compile_pattern
+from any_hook.files_modifiers.checker_modifier import CheckerModifier
 
 
 def _extract_decorator_name(node: BaseExpression) -> Optional[str]:
@@ -39,15 +38,15 @@ def _extract_decorator_name(node: BaseExpression) -> Optional[str]:
 
 
 class _TestIfVisitor(CSTVisitor):
-    METADATA_DEPENDENCIES = (PositionProvider,)
-
     def __init__(
         self,
+        file_data: FileData,
         ignore_pattern: re.Pattern[str],
         test_function_pattern: re.Pattern[str],
         ignored_decorators: tuple[str, ...],
     ) -> None:
         super().__init__()
+        self._file_data = file_data
         self._ignore_pattern = ignore_pattern
         self._test_function_pattern = test_function_pattern
         self._ignored_decorators = ignored_decorators
@@ -68,14 +67,14 @@ class _TestIfVisitor(CSTVisitor):
 
     def visit_If(self, node: If) -> bool:
         if self._should_report_if(node):
-            pos = self.get_metadata(PositionProvider, node)
+            pos = self._file_data.position(node)
             current = cast(FunctionDef, self._current_function)
             self.violations.append((current.name.value, pos.start.line))
         return True
 
     def visit_IfExp(self, node: IfExp) -> bool:
         if self._should_report_ifexp():
-            pos = self.get_metadata(PositionProvider, node)
+            pos = self._file_data.position(node)
             current = cast(FunctionDef, self._current_function)
             self.violations.append((current.name.value, pos.start.line))
         return True
@@ -118,7 +117,7 @@ class _TestIfVisitor(CSTVisitor):
         return False
 
 
-class TestIfChecker(Modifier):
+class TestIfChecker(CheckerModifier[_TestIfVisitor]):
     """Detects conditional logic in test functions.
 
     Checks that test functions don't contain conditional statements (if/elif/else),
@@ -176,21 +175,22 @@ class TestIfChecker(Modifier):
         description="Paths to include (default includes test directories and test files)",
     )
 
-    def modify(self, data: Iterable[FileData]) -> bool:
-        return any(list(map(self._check_file, data)))
+    def required_tokens(self) -> tuple[str, ...]:
+        return ("if",)
 
-    def _check_file(self, file_data: FileData) -> bool:
-        if not self.should_process_file(file_data.path):
-            return False
-        test_func_re = re.compile(self.test_function_pattern)
-        compiled_pattern = re.compile(self.ignore_pattern, re.IGNORECASE)
-        visitor = _TestIfVisitor(
-            compiled_pattern,
-            test_func_re,
+    def precompile(self) -> None:
+        super().precompile()
+        compile_pattern(self.test_function_pattern)
+
+    def create_visitor(self, file_data: FileData) -> _TestIfVisitor:
+        return _TestIfVisitor(
+            file_data,
+            self.ignore_regex,
+            compile_pattern(self.test_function_pattern),
             self.ignored_decorators,
         )
-        wrapper = MetadataWrapper(file_data.module)
-        wrapper.visit(visitor)
+
+    def report(self, file_data: FileData, visitor: _TestIfVisitor) -> bool:
         if visitor.violations:
             for func_name, line_num in visitor.violations:
                 self._output(
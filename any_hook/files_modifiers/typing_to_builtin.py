@@ -6,7 +6,6 @@ from libcst import Annotation, Attribute, ImportFrom, ImportStar, Module, Name
 from libcst.helpers import get_absolute_module_for_import
 from pydantic import Field
 
-from any_hook._file_data import FileData
 from any_hook.files_modifiers._ignore_aware_transformer import (
     IgnoreAwareTransformer,
 )
@@ -127,7 +126,5 @@ class TypingToBuiltin(SeparateModifier[_TypingToBuiltinTransformer]):
     ) -> _TypingToBuiltinTransformer:
         return _TypingToBuiltinTransformer(ignore_pattern, self.import_adder)
 
-    def _modify_file(self, file_data: FileData) -> bool:
-        if not any(name in file_data.content for name in _TYPING_TO_BUILTIN):
-            return False
-        return super()._modify_file(file_data)
+    def required_tokens(self) -> tuple[str, ...]:
+        return tuple(_TYPING_TO_BUILTIN)
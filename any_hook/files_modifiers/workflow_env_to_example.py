@@ -1,11 +1,12 @@
 from collections.abc import Iterable
 from pathlib import Path
-from typing import Literal
+from typing import ClassVar, Literal
 
 import yaml
 from pydantic import BaseModel, Field
 
 from any_hook._file_data import FileData
+from any_hook._transaction import is_dry_run, unified_diff
 from any_hook.files_modifiers._base import Modifier
 
 
@@ -46,6 +47,7 @@ class WorkflowEnvToExample(Modifier):
     """
 
     type: Literal["workflow-env-to-example"] = "workflow-env-to-example"
+    whole_corpus: ClassVar[bool] = True
     workflow_paths: tuple[Path, ...] = Field(
         description="Paths to workflow files to extract env variables from"
     )
@@ -72,9 +74,6 @@ class WorkflowEnvToExample(Modifier):
         if not state.existing_source_vars and not state.new_source_sections:
             return False
         self._write_updated_env_file(state)
-        self._output(
-            f"Updated {self.output_path} with {len(state.added_vars)} new environment variable(s)"
-        )
         return True
 
     def _collect_env_vars_from_workflows(self, state: _EnvFileState) -> None:
@@ -150,7 +149,17 @@ class WorkflowEnvToExample(Modifier):
                 new_sections_lines.extend(vars_list)
                 new_sections_lines.append("")
             final_content += "\n".join(new_sections_lines)
+        if is_dry_run():
+            self._output(
+                unified_diff(
+                    self.output_path, state.existing_content, final_content
+                )
+            )
+            return
         self.output_path.write_text(final_content)
+        self._output(
+            f"Updated {self.output_path} with {len(state.added_vars)} new environment variable(s)"
+        )
 
     def _extract_env_vars(self, data: object) -> dict[str, str]:
         env_vars: dict[str, str] = {}
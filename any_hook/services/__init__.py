@@ -4,5 +4,26 @@ from any_hook.services._class_hierarchy_detector import (
 from any_hook.services._import_path_tracker import (
     _ImportPathTracker as ImportPathTracker,
 )
+from any_hook.services._import_path_tracker import (
+    refresh_shared_import_path_trackers,
+    reset_shared_import_path_trackers,
+    shared_import_path_tracker,
+)
+from any_hook.services._module_index import _ModuleIndex as ModuleIndex
+from any_hook.services._module_index import (
+    refresh_shared_module_indexes,
+    reset_shared_module_indexes,
+    shared_module_index,
+)
 
-__all__ = ["ClassHierarchyDetector", "ImportPathTracker"]
+__all__ = [
+    "ClassHierarchyDetector",
+    "ImportPathTracker",
+    "ModuleIndex",
+    "refresh_shared_import_path_trackers",
+    "refresh_shared_module_indexes",
+    "reset_shared_import_path_trackers",
+    "reset_shared_module_indexes",
+    "shared_import_path_tracker",
+    "shared_module_index",
+]
@@ -0,0 +1,215 @@
+import hashlib
+import json
+import os
+from collections.abc import Callable, Iterable, Sequence
+from pathlib import Path
+from typing import NamedTuple, Optional, TypedDict, TypeVar, final
+
+from pydantic import TypeAdapter, ValidationError
+
+from any_hook._atomic_write import write_cache_entry
+from any_hook._version import package_version
+from any_hook.services._module_summary import _ImportRecord, _ModuleSummary
+
+
+class _Closure(NamedTuple):
+    """The names a class goes by and inherits from, with the files they
+    were found in and the directories of the imports that could not be
+    followed."""
+
+    names: frozenset[str]
+    files: frozenset[Path]
+
+
+class _Unresolved(NamedTuple):
+    """Why an import could not be followed, with the directories in which
+    a module would have to appear for it to be followed."""
+
+    reason: str
+    directories: tuple[Path, ...]
+
+
+_Signatures = dict[str, Optional[list[int]]]
+_Key = Sequence[str | Sequence[str]]
+_EntryT = TypeVar("_EntryT")
+
+
+# Shapes of the entries on disk, validated on load so that a corrupt or
+# outdated entry is recomputed instead of failing the run
+class _SummaryEntry(TypedDict):
+    stat: Optional[list[int]]
+    classes: dict[str, tuple[str, ...]]
+    imports: dict[str, tuple[_ImportRecord, ...]]
+
+
+@final
+class _ModuleEntry(TypedDict):
+    path: str
+    stat: Optional[list[int]]
+
+
+@final
+class _UnresolvedEntry(TypedDict):
+    reason: str
+    directories: _Signatures
+
+
+class _ClosureEntry(TypedDict):
+    names: list[str]
+    files: _Signatures
+
+
+_SUMMARY_ENTRY = TypeAdapter(_SummaryEntry)
+_MODULE_ENTRY: TypeAdapter[_ModuleEntry | _UnresolvedEntry] = TypeAdapter(
+    _ModuleEntry | _UnresolvedEntry
+)
+_CLOSURE_ENTRY = TypeAdapter(_ClosureEntry)
+
+
+def _signature(path: Path) -> Optional[list[int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _signatures(paths: Iterable[Path]) -> _Signatures:
+    return {str(path): _signature(path) for path in paths}
+
+
+def _unchanged(signatures: _Signatures) -> bool:
+    return all(
+        _signature(Path(path)) == signature
+        for path, signature in signatures.items()
+    )
+
+
+class _ImportCache:
+    """On-disk store of what import path trackers learn about modules, so
+    later runs neither locate nor parse the same dependencies again.
+
+    It holds the summary of every parsed module, the file every absolute
+    import resolved to, or why it did not resolve, and the closure of every
+    class. Each entry records the modification time and size of the files
+    and directories it was derived from and is discarded once one of them
+    changes. Entries are also keyed by the working directory and the
+    any-hook version.
+
+    Note:
+        Only the resolved file is validated: a module that later shadows it
+        from an earlier root goes unnoticed until the entry is cleared.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self._directory = directory
+        self._salt = hashlib.sha256(
+            f"{package_version()}\0{os.getcwd()}".encode()
+        ).digest()
+
+    def summary(
+        self, path: Path, compute: Callable[[], _ModuleSummary]
+    ) -> _ModuleSummary:
+        key = ["summary", str(path)]
+        signature = _signature(path)
+        entry = self._load(key, _SUMMARY_ENTRY)
+        if entry is not None and entry["stat"] == signature:
+            return _ModuleSummary(entry["classes"], entry["imports"])
+        summary = compute()
+        self._store(
+            key,
+            _SUMMARY_ENTRY,
+            _SummaryEntry(
+                stat=signature,
+                classes=summary.classes,
+                imports=summary.imports,
+            ),
+        )
+        return summary
+
+    def module_file(
+        self,
+        roots: tuple[tuple[str, ...], tuple[str, ...]],
+        module_parts: list[str],
+        compute: Callable[[], Path | _Unresolved],
+    ) -> Path | _Unresolved:
+        key = ["module", *roots, module_parts]
+        entry = self._load(key, _MODULE_ENTRY)
+        if entry is not None and "reason" in entry:
+            if _unchanged(entry["directories"]):
+                return _Unresolved(
+                    entry["reason"], tuple(map(Path, entry["directories"]))
+                )
+        elif entry is not None:
+            path = Path(entry["path"])
+            if entry["stat"] == _signature(path):
+                return path
+        location = compute()
+        if isinstance(location, _Unresolved):
+            self._store(
+                key,
+                _MODULE_ENTRY,
+                _UnresolvedEntry(
+                    reason=location.reason,
+                    directories=_signatures(location.directories),
+                ),
+            )
+        else:
+            self._store(
+                key,
+                _MODULE_ENTRY,
+                _ModuleEntry(path=str(location), stat=_signature(location)),
+            )
+        return location
+
+    def closure(
+        self,
+        roots: tuple[tuple[str, ...], tuple[str, ...]],
+        path: Path,
+        name: str,
+    ) -> Optional[_Closure]:
+        entry = self._load(
+            ["closure", *roots, str(path), name], _CLOSURE_ENTRY
+        )
+        if entry is None or not _unchanged(entry["files"]):
+            return None
+        return _Closure(
+            frozenset(entry["names"]), frozenset(map(Path, entry["files"]))
+        )
+
+    def store_closure(
+        self,
+        roots: tuple[tuple[str, ...], tuple[str, ...]],
+        path: Path,
+        name: str,
+        closure: _Closure,
+    ) -> None:
+        self._store(
+            ["closure", *roots, str(path), name],
+            _CLOSURE_ENTRY,
+            _ClosureEntry(
+                names=sorted(closure.names),
+                files=_signatures(sorted(closure.files)),
+            ),
+        )
+
+    def _load(
+        self, key: _Key, adapter: TypeAdapter[_EntryT]
+    ) -> Optional[_EntryT]:
+        try:
+            return adapter.validate_json(self._entry(key).read_bytes())
+        except (OSError, ValidationError):
+            return None
+
+    def _store(
+        self, key: _Key, adapter: TypeAdapter[_EntryT], value: _EntryT
+    ) -> None:
+        write_cache_entry(
+            self._directory, self._entry(key), adapter.dump_json(value)
+        )
+
+    def _entry(self, key: _Key) -> Path:
+        digest = hashlib.sha256(
+            self._salt + json.dumps(key).encode()
+        ).hexdigest()
+        return self._directory / digest[:2] / f"{digest}.json"
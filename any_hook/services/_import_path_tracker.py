@@ -1,38 +1,65 @@
-import importlib.util
+import logging
+import os
+import sys
+import threading
+from collections.abc import Callable, Hashable, Iterable, Sequence
 from pathlib import Path
-from typing import cast
-
-import libcst as cst
-from libcst import (
-    Attribute,
-    ClassDef,
-    Import,
-    ImportAlias,
-    ImportFrom,
-    ImportStar,
-    Module,
-    Name,
+from typing import Optional, TypeVar
+
+from libcst import Module
+
+from any_hook.services._import_cache import (
+    _Closure,
+    _ImportCache,
+    _signature,
+    _Unresolved,
+)
+from any_hook.services._module_index import shared_module_index
+from any_hook.services._module_summary import (
+    _ModuleSummary,
+    _summarize_source,
 )
 
-from any_hook.services._class_hierarchy_detector import (
-    _ClassHierarchyDetector,
-    _extract_base_name,
+_logger = logging.getLogger(__name__)
+
+_Key = TypeVar("_Key", bound=Hashable)
+_Value = TypeVar("_Value")
+_Location = TypeVar(
+    "_Location", tuple[str, Path] | _Unresolved, Path | _Unresolved
 )
 
+_NOT_IMPORTED = "not imported"
+_NOT_FOUND = "not found"
+_NAMESPACE_PACKAGE = "namespace package"
+_BUILT_IN = "built-in module"
+
 
-def _dotted_name(node: Name | Attribute) -> str:
-    if isinstance(node, Name):
-        return node.value
-    return (
-        f"{_dotted_name(cast(Name | Attribute, node.value))}"
-        f".{node.attr.value}"
-    )
+def _watched_directories(
+    directories: Iterable[str | Path], module_parts: Sequence[str]
+) -> tuple[Path, ...]:
+    """The deepest existing directory on the way to the module in each of
+    `directories`: the one that changes when the module is added."""
+    watched: list[Path] = []
+    for directory in map(Path, directories):
+        if not directory.is_dir():
+            continue
+        for part in module_parts:
+            if not (directory / part).is_dir():
+                break
+            directory = directory / part
+        watched.append(directory)
+    return tuple(watched)
 
 
-def _alias_local_name(alias: ImportAlias) -> str:
-    if alias.asname is not None:
-        return cast(Name, alias.asname.name).value
-    return _dotted_name(alias.name)
+def _location_files(
+    location: tuple[str, Path] | Path | _Unresolved,
+) -> tuple[Path, ...]:
+    """The files or directories a located module or import depends on."""
+    if isinstance(location, _Unresolved):
+        return location.directories
+    if isinstance(location, Path):
+        return (location,)
+    return (location[1],)
 
 
 class _ImportPathTracker:
@@ -43,21 +70,60 @@ class _ImportPathTracker:
     `extra_sys_path` allows resolving packages installed in a target
     project's virtual environment (e.g. ".venv/lib/python3.12/site-packages")
     that aren't visible to the current interpreter, such as when running as
-    an isolated pre-commit hook.
+    an isolated pre-commit hook. Modules outside the source roots are looked
+    up in a shared index of those directories and `sys.path`, so nothing is
+    ever imported. Modules without Python source, such as compiled ones,
+    are read from their `.pyi` stubs, next to them or in a stub-only
+    `<package>-stubs` package.
+
+    Note: Resolution stops at names whose import cannot be followed (e.g.
+    one guarded by `if TYPE_CHECKING:`, or from a compiled module without a
+    stub), so a literal target base name such as "BaseModel" is recognized
+    without the module that defines it. Why each absolute import could not
+    be followed is remembered like any other lookup, and logged at debug
+    level whenever it leaves a closure incomplete.
 
-    Note: Resolution terminates as soon as a literal target base name is
-    encountered (e.g. "BaseModel"), without needing to inspect the source
-    of the module that defines it.
+    Imported modules are parsed once, with the stdlib `ast` parser rather
+    than libcst, into summaries of their class headers and imports. Where
+    absolute imports lead, as well as the imports of every parsed module,
+    are looked up once. Every class then gets its closure: the names of all
+    the classes it inherits from, across modules. As it does not depend on
+    the target bases, one closure answers any subclass question about the
+    class with a set intersection. A tracker shared by all files of a run
+    (see `shared_import_path_tracker`) thus reads each dependency only
+    once; its caches are safe to fill from several threads. With
+    `cache_dir` set, summaries, absolute import locations and closures are
+    also kept on disk for later runs. Each is dropped as soon as one of the
+    files it was derived from changes, or, for an import that could not be
+    followed, one of the directories the module would appear in, so only
+    the hierarchies that go through edited files are worked out again.
+    `refresh` applies the same rule to what the tracker holds in memory,
+    so that it can serve several runs.
     """
 
     def __init__(
         self,
         source_roots: tuple[str, ...] = (".",),
         extra_sys_path: tuple[str, ...] = (),
+        cache_dir: Optional[Path] = None,
     ) -> None:
         self._source_roots = source_roots
         self._extra_sys_path = extra_sys_path
-        self._module_cache: dict[Path, Module] = {}
+        self._roots = (source_roots, extra_sys_path)
+        self._disk_cache = (
+            _ImportCache(cache_dir) if cache_dir is not None else None
+        )
+        self._lock = threading.Lock()
+        self._summaries: dict[Path, _ModuleSummary] = {}
+        self._module_files: dict[tuple[str, ...], Path | _Unresolved] = {}
+        self._imports: dict[
+            tuple[Path, str], tuple[str, Path] | _Unresolved
+        ] = {}
+        self._closures: dict[tuple[Path, str], _Closure] = {}
+        self._signatures: dict[Path, Optional[list[int]]] = {}
+        self._current: Optional[
+            tuple[Module, _ModuleSummary, dict[str, frozenset[str]]]
+        ] = None
 
     def is_subclass_via_imports(
         self,
@@ -66,199 +132,378 @@ class _ImportPathTracker:
         file_path: Path,
         target_bases: set[str],
     ) -> bool:
-        return self._resolve(name, module, file_path, target_bases, set())
+        return not self.ancestors(name, module, file_path).isdisjoint(
+            target_bases
+        )
+
+    def ancestors(
+        self, name: str, module: Module, file_path: Path
+    ) -> frozenset[str]:
+        """The names `name` goes by, in `module` and the modules it is
+        imported from, and the names of all the classes it inherits from."""
+        summary, closures = self._current_module(module)
+        if name not in closures:
+            closures[name] = self._closure(
+                name, file_path, summary, frozenset(), []
+            ).names
+        return closures[name]
+
+    def refresh(self) -> None:
+        """Forgets what was derived from the files and directories that
+        changed since, so a new run sees their current content."""
+        with self._lock:
+            self._current = None
+            changed = {
+                path
+                for path, signature in self._signatures.items()
+                if _signature(path) != signature
+            }
+            if not changed:
+                return
+            for path in changed:
+                del self._signatures[path]
+            for path in changed & self._summaries.keys():
+                del self._summaries[path]
+            self._module_files = {
+                key: location
+                for key, location in self._module_files.items()
+                if changed.isdisjoint(_location_files(location))
+            }
+            self._imports = {
+                key: location
+                for key, location in self._imports.items()
+                if key[0] not in changed
+                and changed.isdisjoint(_location_files(location))
+            }
+            self._closures = {
+                key: closure
+                for key, closure in self._closures.items()
+                if changed.isdisjoint(closure.files)
+            }
 
-    def _resolve(
+    def _current_module(
+        self, module: Module
+    ) -> tuple[_ModuleSummary, dict[str, frozenset[str]]]:
+        current = self._current
+        if current is None or current[0] is not module:
+            current = (module, _summarize_source(module.bytes), {})
+            self._current = current
+        return current[1], current[2]
+
+    def _closure(
         self,
         name: str,
-        module: Module,
-        file_path: Path,
-        target_bases: set[str],
-        visited: set[tuple[Path, str]],
-    ) -> bool:
-        if name in target_bases:
-            return True
-        class_definitions = {
-            node.name.value: node
-            for node in module.body
-            if isinstance(node, ClassDef)
-        }
-        if name in class_definitions:
-            return self._resolve_local_class(
-                class_definitions[name],
-                class_definitions,
-                module,
-                file_path,
-                target_bases,
-                visited,
+        path: Path,
+        summary: Optional[_ModuleSummary],
+        visiting: frozenset[tuple[Path, str]],
+        cuts: list[tuple[Path, str]],
+    ) -> _Closure:
+        """The closure of `name` as referred to in the module at `path`,
+        whose summary is loaded on demand unless given."""
+        key = (path, name)
+        if key in visiting:
+            cuts.append(key)
+            return _Closure(frozenset({name}), frozenset({path}))
+        if summary is not None:
+            return self._compute_closure(
+                name, path, summary, visiting | {key}, cuts
             )
-        return self._follow_import(
-            name, module, file_path, target_bases, visited
-        )
+        if key in self._closures:
+            return self._closures[key]
+        closure = self._load_closure(key)
+        if closure is None:
+            first_cut = len(cuts)
+            closure = self._compute_closure(
+                name, path, self._summary(path), visiting | {key}, cuts
+            )
+            # A closure cut short by a cycle through a class further up
+            # only holds for this walk
+            if any(cut != key for cut in cuts[first_cut:]):
+                return closure
+            self._store_closure(key, closure)
+        self._watch(closure.files)
+        with self._lock:
+            return self._closures.setdefault(key, closure)
 
-    def _resolve_local_class(
-        self,
-        classdef: ClassDef,
-        class_definitions: dict[str, ClassDef],
-        module: Module,
-        file_path: Path,
-        target_bases: set[str],
-        visited: set[tuple[Path, str]],
-    ) -> bool:
-        detector = _ClassHierarchyDetector(class_definitions)
-        if detector.is_subclass_of(classdef, target_bases):
-            return True
-        for base in classdef.bases:
-            base_name = _extract_base_name(base.value)
-            if (
-                base_name is None
-                or base_name in target_bases
-                or base_name in class_definitions
-            ):
-                continue
-            if self._follow_import(
-                base_name, module, file_path, target_bases, visited
-            ):
-                return True
-        return False
-
-    def _follow_import(
+    def _compute_closure(
         self,
         name: str,
-        module: Module,
-        file_path: Path,
-        target_bases: set[str],
-        visited: set[tuple[Path, str]],
-    ) -> bool:
-        resolved = self._resolve_import(name, module, file_path)
-        if resolved is None:
-            return False
-        resolved_name, resolved_module, resolved_path = resolved
-        key = (resolved_path, resolved_name)
-        if key in visited:
-            return False
-        return self._resolve(
-            resolved_name,
-            resolved_module,
-            resolved_path,
-            target_bases,
-            visited | {key},
-        )
-
-    def _resolve_import(
-        self, name: str, module: Module, file_path: Path
-    ) -> tuple[str, Module, Path] | None:
-        first_segment, *rest = name.split(".")
-        for node in module.body:
-            if not isinstance(node, cst.SimpleStatementLine):
-                continue
-            for statement in node.body:
-                if isinstance(statement, ImportFrom):
-                    resolved = self._resolve_import_from(
-                        statement, name, file_path
-                    )
-                elif isinstance(statement, Import):
-                    resolved = self._resolve_import_statement(
-                        statement, first_segment, rest, file_path
+        path: Path,
+        summary: _ModuleSummary,
+        visiting: frozenset[tuple[Path, str]],
+        cuts: list[tuple[Path, str]],
+    ) -> _Closure:
+        references: list[tuple[str, Path, Optional[_ModuleSummary]]]
+        names = {name}
+        files = {path}
+        if name in summary.classes:
+            local = None if self._summaries.get(path) is summary else summary
+            references = [
+                (base, path, local) for base in summary.classes[name]
+            ]
+        else:
+            resolved = self._resolve_import(name, summary, path)
+            if isinstance(resolved, _Unresolved):
+                if resolved.reason != _NOT_IMPORTED:
+                    _logger.debug(
+                        "%s: cannot follow the import of %s: %s",
+                        path,
+                        name,
+                        resolved.reason,
                     )
-                else:
-                    continue
-                if resolved is not None:
-                    return resolved
-        return None
-
-    def _resolve_import_from(
-        self, node: ImportFrom, name: str, file_path: Path
-    ) -> tuple[str, Module, Path] | None:
-        if isinstance(node.names, ImportStar):
-            return None
-        for alias in node.names:
-            if _alias_local_name(alias) != name:
-                continue
-            module_parts = (
-                _dotted_name(node.module).split(".") if node.module else []
-            )
-            target_file = self._resolve_module_file(
-                module_parts, len(node.relative), file_path
-            )
-            if target_file is None:
-                return None
-            return (
-                _dotted_name(alias.name),
-                self._parse(target_file),
-                target_file,
+                references = []
+                files.update(resolved.directories)
+            else:
+                references = [(*resolved, None)]
+        for reference, reference_path, reference_summary in references:
+            closure = self._closure(
+                reference, reference_path, reference_summary, visiting, cuts
             )
-        return None
+            names |= closure.names
+            files |= closure.files
+        return _Closure(frozenset(names), frozenset(files))
 
-    def _resolve_import_statement(
-        self,
-        node: Import,
-        first_segment: str,
-        rest: list[str],
-        file_path: Path,
-    ) -> tuple[str, Module, Path] | None:
-        if not rest:
+    def _load_closure(self, key: tuple[Path, str]) -> Optional[_Closure]:
+        if self._disk_cache is None:
             return None
-        for alias in node.names:
-            module_parts = _dotted_name(alias.name).split(".")
-            local_name = (
-                cast(Name, alias.asname.name).value
-                if alias.asname is not None
-                else module_parts[0]
-            )
-            if local_name != first_segment:
-                continue
-            target_module_parts = module_parts + rest[:-1]
-            target_name = rest[-1]
+        return self._disk_cache.closure(self._roots, *key)
+
+    def _store_closure(self, key: tuple[Path, str], closure: _Closure) -> None:
+        if self._disk_cache is not None:
+            self._disk_cache.store_closure(self._roots, *key, closure)
+
+    def _resolve_import(
+        self, name: str, summary: _ModuleSummary, file_path: Path
+    ) -> tuple[str, Path] | _Unresolved:
+        if self._summaries.get(file_path) is not summary:
+            return self._find_import(name, summary, file_path)
+        return self._memoize(
+            self._imports,
+            (file_path, name),
+            lambda: self._watch_location(
+                self._find_import(name, summary, file_path)
+            ),
+        )
+
+    def _find_import(
+        self, name: str, summary: _ModuleSummary, file_path: Path
+    ) -> tuple[str, Path] | _Unresolved:
+        first_segment, *rest = name.split(".")
+        reason = _NOT_IMPORTED
+        watched: list[Path] = []
+        for record in summary.imports.get(first_segment, ()):
+            if record.name is not None:
+                if rest:
+                    continue
+                module_parts = list(record.module_parts)
+                target_name = record.name
+            else:
+                if not rest:
+                    continue
+                module_parts = list(record.module_parts) + rest[:-1]
+                target_name = rest[-1]
             target_file = self._resolve_module_file(
-                target_module_parts, 0, file_path
+                module_parts, record.level, file_path
             )
-            if target_file is None:
-                return None
-            return target_name, self._parse(target_file), target_file
-        return None
+            if not isinstance(target_file, _Unresolved):
+                return target_name, target_file
+            reason = target_file.reason
+            watched.extend(target_file.directories)
+        return _Unresolved(reason, tuple(watched))
 
     def _resolve_module_file(
         self, module_parts: list[str], relative_dots: int, file_path: Path
-    ) -> Path | None:
+    ) -> Path | _Unresolved:
         if relative_dots:
             base = file_path.parent
             for _ in range(relative_dots - 1):
                 base = base.parent
-            return self._module_parts_to_file(base, module_parts)
-        for root in self._source_roots + self._extra_sys_path:
+            resolved = self._module_parts_to_file(base, module_parts)
+            if resolved is None:
+                return _Unresolved(
+                    _NOT_FOUND, _watched_directories((base,), module_parts)
+                )
+            return resolved
+        return self._memoize(
+            self._module_files,
+            tuple(module_parts),
+            lambda: self._locate_module_file(module_parts),
+        )
+
+    def _locate_module_file(
+        self, module_parts: list[str]
+    ) -> Path | _Unresolved:
+        if self._disk_cache is None:
+            return self._watch_location(self._find_module_file(module_parts))
+        return self._watch_location(
+            self._disk_cache.module_file(
+                self._roots,
+                module_parts,
+                lambda: self._find_module_file(module_parts),
+            )
+        )
+
+    def _find_module_file(self, module_parts: list[str]) -> Path | _Unresolved:
+        for root in self._source_roots:
             resolved = self._module_parts_to_file(Path(root), module_parts)
             if resolved is not None:
                 return resolved
-        return self._find_spec_file(module_parts)
+        index = shared_module_index(self._extra_sys_path)
+        origin = index.find(module_parts)
+        if origin is not None and origin.suffix == ".py":
+            return origin
+        if origin is not None:
+            stub = origin.with_name(f"{origin.name.partition('.')[0]}.pyi")
+            if stub.is_file():
+                return stub
+        stub_parts = [f"{module_parts[0]}-stubs", *module_parts[1:]]
+        for directory in index.directories:
+            package_stub = self._stub_file(Path(directory), stub_parts)
+            if package_stub is not None:
+                return package_stub
+        if origin is not None:
+            reason = f"no source or stub for {origin.name}"
+        elif index.is_namespace_package(module_parts):
+            reason = _NAMESPACE_PACKAGE
+        elif module_parts[0] in sys.builtin_module_names:
+            reason = _BUILT_IN
+        else:
+            reason = _NOT_FOUND
+        watched = _watched_directories(
+            (*self._source_roots, *index.directories), module_parts
+        ) + _watched_directories(index.directories, stub_parts)
+        return _Unresolved(reason, tuple(dict.fromkeys(watched)))
+
+    @staticmethod
+    def _stub_file(base: Path, stub_parts: list[str]) -> Path | None:
+        target = base.joinpath(*stub_parts)
+        if len(stub_parts) > 1 and target.with_suffix(".pyi").is_file():
+            return target.with_suffix(".pyi")
+        init_file = target / "__init__.pyi"
+        return init_file if init_file.is_file() else None
 
     @staticmethod
     def _module_parts_to_file(
         base: Path, module_parts: list[str]
     ) -> Path | None:
+        candidates: tuple[Path, ...]
         if not module_parts:
-            init_file = base / "__init__.py"
-            return init_file if init_file.exists() else None
-        target = base.joinpath(*module_parts)
-        py_file = target.with_suffix(".py")
-        if py_file.exists():
-            return py_file
-        init_file = target / "__init__.py"
-        return init_file if init_file.exists() else None
+            candidates = (base / "__init__.py", base / "__init__.pyi")
+        else:
+            target = base.joinpath(*module_parts)
+            candidates = (
+                target.with_suffix(".py"),
+                target / "__init__.py",
+                target.with_suffix(".pyi"),
+                target / "__init__.pyi",
+            )
+        for candidate in candidates:
+            if candidate.exists():
+                return candidate
+        return None
+
+    def _summary(self, path: Path) -> _ModuleSummary:
+        return self._memoize(
+            self._summaries, path, lambda: self._load_summary(path)
+        )
+
+    def _load_summary(self, path: Path) -> _ModuleSummary:
+        self._watch((path,))
+        if self._disk_cache is None:
+            return self._parse(path)
+        return self._disk_cache.summary(path, lambda: self._parse(path))
 
     @staticmethod
-    def _find_spec_file(module_parts: list[str]) -> Path | None:
-        module_str = ".".join(module_parts)
-        try:
-            spec = importlib.util.find_spec(module_str)
-        except (ImportError, ModuleNotFoundError, ValueError):
-            return None
-        if spec is None or spec.origin is None:
-            return None
-        origin = Path(spec.origin)
-        return origin if origin.suffix == ".py" else None
+    def _parse(path: Path) -> _ModuleSummary:
+        return _summarize_source(path.read_bytes())
+
+    def _watch_location(self, location: _Location) -> _Location:
+        self._watch(_location_files(location))
+        return location
+
+    def _watch(self, paths: Iterable[Path]) -> None:
+        """Records the signature of the files and directories an entry is
+        derived from, unless already known, for `refresh` to check."""
+        for path in paths:
+            if path not in self._signatures:
+                signature = _signature(path)
+                with self._lock:
+                    self._signatures.setdefault(path, signature)
+
+    def _memoize(
+        self,
+        cache: dict[_Key, _Value],
+        key: _Key,
+        compute: Callable[[], _Value],
+    ) -> _Value:
+        if key in cache:
+            return cache[key]
+        value = compute()
+        with self._lock:
+            return cache.setdefault(key, value)
+
+
+_shared_trackers: dict[
+    tuple[tuple[str, ...], tuple[str, ...]], _ImportPathTracker
+] = {}
+_shared_lock = threading.Lock()
+_shared_cache_dir: Optional[Path] = None
+_shared_cwd: Optional[str] = None
+
+
+def shared_import_path_tracker(
+    source_roots: tuple[str, ...] = (".",),
+    extra_sys_path: tuple[str, ...] = (),
+) -> _ImportPathTracker:
+    """The tracker for the given roots shared by every file and modifier
+    of the current run in this process."""
+    key = (source_roots, extra_sys_path)
+    with _shared_lock:
+        if key not in _shared_trackers:
+            _shared_trackers[key] = _ImportPathTracker(
+                *key, cache_dir=_shared_cache_dir
+            )
+        return _shared_trackers[key]
+
+
+def reset_shared_import_path_trackers(
+    cache_dir: Optional[Path] = None,
+) -> None:
+    """Drops the shared trackers, so a new run sees the current content of
+    the files the previous one parsed. The trackers of the new run keep
+    what they learn in `cache_dir`, if set."""
+    global _shared_cache_dir, _shared_cwd
+    with _shared_lock:
+        _shared_trackers.clear()
+        _shared_cache_dir = cache_dir
+        _shared_cwd = os.getcwd()
+
+
+def refresh_shared_import_path_trackers(
+    cache_dir: Optional[Path] = None,
+) -> None:
+    """Prepares the shared trackers for a new run, which sees the current
+    content of the files the previous one parsed. Trackers are refreshed
+    rather than dropped, so what they know of unchanged files is kept, as
+    long as the run keeps its working directory and `cache_dir`."""
+    if (cache_dir, os.getcwd()) != (_shared_cache_dir, _shared_cwd):
+        reset_shared_import_path_trackers(cache_dir)
+        return
+    with _shared_lock:
+        for tracker in _shared_trackers.values():
+            tracker.refresh()
+
+
+def _reset_after_fork() -> None:
+    global _shared_lock
+    _shared_lock = threading.Lock()
+    _shared_trackers.clear()
+
+
+def _register_fork_handler() -> None:
+    # Windows cannot fork: its pool workers are spawned and import afresh.
+    if sys.platform != "win32":
+        os.register_at_fork(after_in_child=_reset_after_fork)
+
 
-    def _parse(self, path: Path) -> Module:
-        if path not in self._module_cache:
-            self._module_cache[path] = cst.parse_module(path.read_text())
-        return self._module_cache[path]
+_register_fork_handler()
@@ -0,0 +1,157 @@
+import importlib.machinery
+import os
+import sys
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Optional
+
+_SUFFIXES = (
+    *importlib.machinery.EXTENSION_SUFFIXES,
+    *importlib.machinery.SOURCE_SUFFIXES,
+    *importlib.machinery.BYTECODE_SUFFIXES,
+)
+
+_Location = tuple[Optional[Path], tuple[str, ...]]
+
+
+def _mtime(directory: str) -> Optional[int]:
+    try:
+        return os.stat(directory).st_mtime_ns
+    except OSError:
+        return None
+
+
+class _ModuleIndex:
+    """Locates modules in a list of directories the way the path based
+    finder of the import system does, without importing anything.
+
+    Every directory is listed once, so locating a module takes a few set
+    lookups plus, for a package, a check for its `__init__` file. `refresh`
+    lists again only the directories modified since. A module
+    is reported by its file: the source, bytecode or extension module, or
+    the `__init__` file of a package. Namespace packages have no file and
+    are reported as None, like modules that are not found.
+
+    Note:
+        Unlike `importlib.util.find_spec`, neither meta path hooks nor zip
+        archives on the path are consulted.
+    """
+
+    def __init__(self, directories: Sequence[str]) -> None:
+        self._directories = tuple(directories)
+        self._listings: dict[str, frozenset[str]] = {}
+        self._mtimes: dict[str, Optional[int]] = {}
+        self._locations: dict[tuple[tuple[str, ...], str], _Location] = {}
+
+    @property
+    def directories(self) -> tuple[str, ...]:
+        return self._directories
+
+    def find(self, module_parts: Sequence[str]) -> Optional[Path]:
+        return self._walk(module_parts)[0]
+
+    def is_namespace_package(self, module_parts: Sequence[str]) -> bool:
+        origin, portions = self._walk(module_parts)
+        return origin is None and bool(portions)
+
+    def _walk(self, module_parts: Sequence[str]) -> _Location:
+        location: _Location = (None, self._directories)
+        for part in module_parts:
+            if not location[1]:
+                return None, ()
+            location = self._locate(location[1], part)
+        return location
+
+    def _locate(self, directories: tuple[str, ...], name: str) -> _Location:
+        key = (directories, name)
+        if key not in self._locations:
+            self._locations[key] = self._scan(directories, name)
+        return self._locations[key]
+
+    def _scan(self, directories: tuple[str, ...], name: str) -> _Location:
+        portions: list[str] = []
+        for directory in directories:
+            listing = self._listing(directory)
+            if name in listing:
+                package = os.path.join(directory, name)
+                for suffix in _SUFFIXES:
+                    init_file = os.path.join(package, f"__init__{suffix}")
+                    if os.path.isfile(init_file):
+                        return Path(init_file), (package,)
+                if os.path.isdir(package):
+                    portions.append(package)
+            for suffix in _SUFFIXES:
+                if f"{name}{suffix}" in listing:
+                    return Path(directory, f"{name}{suffix}"), ()
+        return None, tuple(portions)
+
+    def refresh(self) -> None:
+        """Forgets the listings of the directories modified since they were
+        listed, and where modules were found."""
+        for directory, mtime in list(self._mtimes.items()):
+            if _mtime(directory) != mtime:
+                del self._mtimes[directory]
+                del self._listings[directory]
+        self._locations.clear()
+
+    def _listing(self, directory: str) -> frozenset[str]:
+        if directory not in self._listings:
+            self._mtimes[directory] = _mtime(directory)
+            try:
+                listing = frozenset(os.listdir(directory))
+            except OSError:
+                listing = frozenset()
+            self._listings[directory] = listing
+        return self._listings[directory]
+
+
+_shared_indexes: dict[tuple[str, ...], _ModuleIndex] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_module_index(
+    extra_directories: tuple[str, ...] = (),
+) -> _ModuleIndex:
+    """The index of `extra_directories` followed by the current `sys.path`,
+    shared by every file and modifier of the current run in this process.
+    """
+    directories = tuple(
+        os.path.abspath(directory)
+        for directory in (*extra_directories, *sys.path)
+    )
+    with _shared_lock:
+        if directories not in _shared_indexes:
+            _shared_indexes[directories] = _ModuleIndex(directories)
+        return _shared_indexes[directories]
+
+
+def refresh_shared_module_indexes() -> None:
+    """Prepares the shared indexes for a new run, which sees the modules
+    installed or removed since the previous one without listing every
+    directory again."""
+    with _shared_lock:
+        for index in _shared_indexes.values():
+            index.refresh()
+
+
+def reset_shared_module_indexes() -> None:
+    """Drops the shared indexes, so a new run sees the modules installed
+    or removed since the previous one."""
+    with _shared_lock:
+        _shared_indexes.clear()
+
+
+def _reset_after_fork() -> None:
+    global _shared_lock
+    _shared_lock = threading.Lock()
+    _shared_indexes.clear()
+
+
+def _register_fork_handler() -> None:
+    # Windows cannot fork: its pool workers are spawned and import afresh.
+    if sys.platform != "win32":
+        os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+_register_fork_handler()
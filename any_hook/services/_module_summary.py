@@ -0,0 +1,74 @@
+import ast
+from typing import NamedTuple, Optional
+
+
+class _ImportRecord(NamedTuple):
+    """Where a name bound by a top-level import statement comes from.
+
+    `name` is the imported name of a `from` import, or None for a plain
+    `import` statement, which binds the top-level package of
+    `module_parts`. `level` counts the leading dots of relative imports.
+    """
+
+    module_parts: tuple[str, ...]
+    level: int
+    name: Optional[str]
+
+
+class _ModuleSummary(NamedTuple):
+    """What the import path tracker needs to know about a module: the base
+    names of its top-level classes, and the imports binding each local
+    name, in order."""
+
+    classes: dict[str, tuple[str, ...]]
+    imports: dict[str, tuple[_ImportRecord, ...]]
+
+
+def _ast_base_name(node: ast.expr) -> Optional[str]:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def _summarize_source(source: bytes) -> _ModuleSummary:
+    """Summarizes a module from its source with the stdlib `ast` parser,
+    which is several times faster than building a libcst tree. Only the
+    top-level class headers and imports are read, so a module the caller
+    already parsed with libcst is summarized from its source as well.
+    """
+    classes: dict[str, tuple[str, ...]] = {}
+    imports: dict[str, list[_ImportRecord]] = {}
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.ClassDef):
+            classes[node.name] = tuple(
+                name
+                for name in map(_ast_base_name, node.bases)
+                if name is not None
+            )
+        elif isinstance(node, ast.ImportFrom):
+            module_parts = tuple(node.module.split(".")) if node.module else ()
+            for alias in node.names:
+                if alias.name == "*":
+                    continue
+                imports.setdefault(alias.asname or alias.name, []).append(
+                    _ImportRecord(module_parts, node.level, alias.name)
+                )
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                module_parts = tuple(alias.name.split("."))
+                imports.setdefault(alias.asname or module_parts[0], []).append(
+                    _ImportRecord(module_parts, 0, None)
+                )
+    return _freeze(classes, imports)
+
+
+def _freeze(
+    classes: dict[str, tuple[str, ...]],
+    imports: dict[str, list[_ImportRecord]],
+) -> _ModuleSummary:
+    return _ModuleSummary(
+        classes,
+        {name: tuple(records) for name, records in imports.items()},
+    )
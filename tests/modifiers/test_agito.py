@@ -1,19 +1,28 @@
+import re
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from unittest.mock import MagicMock, patch
+from typing import Literal
+from unittest.mock import MagicMock, PropertyMock, patch
 
 import pytest
-from libcst import parse_module
+from libcst import CSTTransformer, Module, Name, parse_module
+from libcst.metadata import MetadataWrapper
 
 from any_hook import FileData
-from any_hook.files_modifiers.agito import Agito
+from any_hook.files_modifiers._prefilter import TokenMatcher
+from any_hook.files_modifiers.agito import Agito, split_whole_corpus
 from any_hook.files_modifiers.check_untracked import CheckUntracked
+from any_hook.files_modifiers.checker_modifier import run_visitors
+from any_hook.files_modifiers.comment_detector import CommentDetector
+from any_hook.files_modifiers.forbidden_functions import ForbiddenFunctions
 from any_hook.files_modifiers.len_as_bool import LenAsBool
 from any_hook.files_modifiers.local_imports import LocalImports
 from any_hook.files_modifiers.local_imports_to_top import LocalImportsToTop
+from any_hook.files_modifiers.output.recording import RecordingOutput
 from any_hook.files_modifiers.return_tuple_parens_drop import (
     ReturnTupleParensDrop,
 )
+from any_hook.files_modifiers.separate_modifier import SeparateModifier
 from any_hook.files_modifiers.typing_to_builtin import TypingToBuiltin
 from any_hook.files_modifiers.workflow_env_to_example import (
     WorkflowEnvToExample,
@@ -23,11 +32,26 @@ _CHECK_UNTRACKED_MODULE = f"{CheckUntracked.__module__}.subprocess.run"
 _CHECK_UNTRACKED_GIT_ROOT = (
     f"{CheckUntracked.__module__}.{CheckUntracked.__name__}._git_root"
 )
+_METADATA_WRAPPER = f"{run_visitors.__module__}.{MetadataWrapper.__name__}"
 _WORKFLOW_MODIFY = (
     f"{WorkflowEnvToExample.__module__}.{WorkflowEnvToExample.__name__}.modify"
 )
 
 
+class _RebuildNamesTransformer(CSTTransformer):
+    def leave_Name(self, original_node: Name, updated_node: Name) -> Name:
+        return Name(updated_node.value)
+
+
+class _RebuildNames(SeparateModifier[_RebuildNamesTransformer]):
+    type: Literal["agito-test-rebuild-names"] = "agito-test-rebuild-names"
+
+    def create_transformer(
+        self, ignore_pattern: re.Pattern[str]
+    ) -> _RebuildNamesTransformer:
+        return _RebuildNamesTransformer()
+
+
 def _make_file_data(name: str = "a.py") -> FileData:
     content = "x = 1\n"
     return FileData(
@@ -160,3 +184,163 @@ class TestAgitoGlobalModifiers:
             assert agito.modify([file_data])
             assert "import os\n" in test_file.read_text()
             assert "    import os" not in test_file.read_text()
+
+
+class TestAgitoChangeDetection:
+    def test_untouched_file_skips_code_generation(self, tmp_path: Path):
+        test_file = tmp_path / "test.py"
+        code = "if x:\n    pass\n"
+        test_file.write_text(code)
+        agito = Agito(modifiers=(LenAsBool(), ReturnTupleParensDrop()))
+        file_data = FileData(test_file, code)
+        with patch.object(
+            Module, "code", new_callable=PropertyMock
+        ) as mock_code:
+            assert not agito.modify([file_data])
+        mock_code.assert_not_called()
+        assert not file_data.modified
+
+    def test_transformers_leaving_the_tree_alone(self):
+        code = "def f():\n    return (x)\n"
+        agito = Agito(modifiers=(LenAsBool(), ReturnTupleParensDrop()))
+        file_data = FileData(Path("test.py"), code)
+        with patch.object(
+            Module, "code", new_callable=PropertyMock
+        ) as mock_code:
+            assert not agito.modify([file_data])
+        mock_code.assert_not_called()
+        assert not file_data.modified
+
+    def test_rebuilt_but_identical_code_is_not_written(self):
+        file_data = FileData(Path("test.py"), "x = 1\n")
+        assert not Agito(modifiers=(_RebuildNames(),)).modify([file_data])
+        assert not file_data.modified
+
+
+class TestAgitoCheckers:
+    def test_checkers_share_one_traversal(self, tmp_path):
+        recorder = RecordingOutput()
+        code = "def f():\n    import os  # TODO\n    print(os)\n"
+        file_data = FileData(tmp_path / "a.py", code)
+        agito = Agito(
+            modifiers=(
+                ForbiddenFunctions(
+                    forbidden_functions=("print",), outputs=(recorder,)
+                ),
+                LocalImports(outputs=(recorder,)),
+                CommentDetector(patterns=("TODO",), outputs=(recorder,)),
+            )
+        )
+        with patch(_METADATA_WRAPPER, wraps=MetadataWrapper) as mock_wrapper:
+            assert agito.modify([file_data])
+        mock_wrapper.assert_called_once()
+        assert [message.split(": ")[1] for message in recorder.messages] == [
+            "print usage detected",
+            "Local import detected",
+            "Forbidden comment detected",
+        ]
+
+    def test_file_no_checker_accepts_is_not_parsed(self):
+        file_data = FileData(Path("a.py"), "x = 1\n")
+        agito = Agito(
+            modifiers=(ForbiddenFunctions(forbidden_functions=("print",)),)
+        )
+        assert not agito.modify([file_data])
+        assert file_data._module is None
+
+    def test_other_modifiers_run_per_file(self, tmp_path):
+        test_file = tmp_path / "test.py"
+        code = "if len(x):\n    pass\n"
+        test_file.write_text(code)
+        agito = Agito(modifiers=(Agito(modifiers=(LenAsBool(),)),))
+        assert agito.modify([FileData(test_file, code)])
+        assert test_file.read_text() == "if x:\n    pass\n"
+
+
+class TestAgitoContentPrefilter:
+    def test_rejected_transformers_are_not_created(self, tmp_path):
+        test_file = tmp_path / "test.py"
+        code = "if len(x):\n    pass\n"
+        test_file.write_text(code)
+        agito = Agito(modifiers=(LenAsBool(), ReturnTupleParensDrop()))
+        with patch.object(
+            ReturnTupleParensDrop, "create_transformer"
+        ) as mock_create:
+            assert agito.modify([FileData(test_file, code)])
+        mock_create.assert_not_called()
+        assert test_file.read_text() == "if x:\n    pass\n"
+
+    def test_file_rejected_by_every_transformer_is_not_parsed(self):
+        file_data = FileData(Path("a.py"), "x = 1\n")
+        agito = Agito(modifiers=(LenAsBool(), ReturnTupleParensDrop()))
+        assert not agito.modify([file_data])
+        assert file_data._module is None
+
+    def test_required_tokens_are_matched_once_per_file(self, tmp_path):
+        test_file = tmp_path / "test.py"
+        code = "if len(x):\n    print(x)\n"
+        test_file.write_text(code)
+        checker = ForbiddenFunctions(
+            forbidden_functions=("print",), outputs=(RecordingOutput(),)
+        )
+        agito = Agito(
+            modifiers=(LenAsBool(), ReturnTupleParensDrop(), checker)
+        )
+        with patch.object(
+            TokenMatcher, "find", autospec=True, side_effect=TokenMatcher.find
+        ) as mock_find:
+            assert agito.modify([FileData(test_file, code)])
+        mock_find.assert_called_once()
+        assert test_file.read_text() == "if x:\n    print(x)\n"
+
+
+class TestAgitoStreaming:
+    def test_each_file_is_done_before_the_next_is_read(self, tmp_path):
+        paths = [tmp_path / "a.py", tmp_path / "b.py"]
+        for path in paths:
+            path.write_text("if len(x):\n    pass\n")
+
+        def stream():
+            for index, path in enumerate(paths):
+                if index:
+                    assert paths[index - 1].read_text() == "if x:\n    pass\n"
+                yield FileData(path, path.read_text())
+
+        assert Agito(modifiers=(LenAsBool(), LocalImports())).modify(stream())
+
+    def test_whole_corpus_members_see_every_file(self):
+        files = [_make_file_data("a.py"), _make_file_data("b.py")]
+        modifier = WorkflowEnvToExample(
+            workflow_paths=(), output_path=Path("nonexistent.example")
+        )
+        with patch(_WORKFLOW_MODIFY, return_value=True) as mock_modify:
+            assert Agito(modifiers=(LenAsBool(), modifier)).modify(iter(files))
+        (data,), _ = mock_modify.call_args
+        assert list(data) == files
+
+
+class TestSplitWholeCorpus:
+    def test_plain_modifiers_are_partitioned(self):
+        len_as_bool = LenAsBool()
+        check_untracked = CheckUntracked(directories=("src",))
+        per_file, whole_corpus = split_whole_corpus(
+            (len_as_bool, check_untracked)
+        )
+        assert per_file == (len_as_bool,)
+        assert whole_corpus == (check_untracked,)
+
+    def test_agito_members_are_lifted_out(self):
+        len_as_bool = LenAsBool()
+        check_untracked = CheckUntracked(directories=("src",))
+        agito = Agito(modifiers=(len_as_bool, check_untracked))
+        per_file, whole_corpus = split_whole_corpus((agito,))
+        assert whole_corpus == (check_untracked,)
+        assert len(per_file) == 1
+        assert isinstance(per_file[0], Agito)
+        assert per_file[0].modifiers == (len_as_bool,)
+        assert agito.modifiers == (len_as_bool, check_untracked)
+
+    def test_agito_without_per_file_members_is_dropped(self):
+        check_untracked = CheckUntracked(directories=("src",))
+        agito = Agito(modifiers=(Agito(modifiers=(check_untracked,)),))
+        assert split_whole_corpus((agito,)) == ((), (check_untracked,))
@@ -0,0 +1,63 @@
+from pathlib import Path
+from typing import Literal
+
+from libcst import CSTVisitor, Name, parse_module
+from libcst.metadata import PositionProvider
+
+from any_hook import FileData
+from any_hook.files_modifiers.checker_modifier import (
+    CheckerModifier,
+    run_visitors,
+)
+from any_hook.files_modifiers.output.recording import RecordingOutput
+
+
+class _NameLines(CSTVisitor):
+    METADATA_DEPENDENCIES = (PositionProvider,)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.lines: list[int] = []
+
+    def visit_Name(self, node: Name) -> None:
+        self.lines.append(self.get_metadata(PositionProvider, node).start.line)
+
+
+class _NameChecker(CheckerModifier[_NameLines]):
+    type: Literal["checker-modifier-test-names"] = (
+        "checker-modifier-test-names"
+    )
+
+    def create_visitor(self, file_data: FileData) -> _NameLines:
+        return _NameLines()
+
+    def report(self, file_data: FileData, visitor: _NameLines) -> bool:
+        for line in visitor.lines:
+            self._output(f"{file_data.path}:{line}: name")
+        return bool(visitor.lines)
+
+
+class _RejectingNameChecker(_NameChecker):
+    def should_process_content(self, content: str) -> bool:
+        return False
+
+
+class TestRunVisitors:
+    def test_visitors_share_one_traversal(self):
+        module = parse_module("x = 1\ny = x\n")
+        first, second = _NameLines(), _NameLines()
+        run_visitors(module, (first, second))
+        assert first.lines == second.lines == [1, 2, 2]
+
+
+class TestCheckerModifier:
+    def test_accepts_every_file_by_default(self):
+        recorder = RecordingOutput()
+        file_data = FileData(Path("a.py"), "x = 1\n")
+        assert _NameChecker(outputs=(recorder,)).modify([file_data])
+        assert recorder.messages == ["a.py:1: name"]
+
+    def test_rejected_file_is_not_parsed(self):
+        file_data = FileData(Path("a.py"), "x = 1\n")
+        assert not _RejectingNameChecker().modify([file_data])
+        assert file_data._module is None
@@ -113,6 +113,19 @@ class TestCombineWith(TransformerTestCase):
         """).lstrip()
         self._assert_transformation(code, expected)
 
+    def test_with_without_space(self):
+        code = dedent("""
+            with(A):
+                with B:
+                    body
+        """).lstrip()
+        expected = dedent("""
+            with(A, B):
+                body
+        """).lstrip()
+        self._assert_transformation(code, expected)
+        assert CombineWith().accepts_content(code)
+
     def test_modifier_skips_file_without_with(self):
         code = "x = 1\ny = 2"
         modifier = CombineWith()
@@ -3,6 +3,7 @@ from pathlib import Path
 from pathlib import Path as PathlibPath
 from tempfile import TemporaryDirectory
 from textwrap import dedent
+from unittest.mock import call, patch
 
 from libcst import parse_module
 
@@ -10,6 +11,8 @@ from any_hook import FileData
 from any_hook.files_modifiers.comment_detector import CommentDetector
 from tests.modifiers._base import RecordingOutput, TransformerTestCase
 
+_COMPILE_PATTERN = f"{CommentDetector.__module__}.compile_pattern"
+
 
 class TestCommentDetector(TransformerTestCase):
     def test_detects_inline_comment_matching_pattern(self):
@@ -117,5 +120,10 @@ class TestCommentDetector(TransformerTestCase):
             r"test\.py:\d+: Forbidden comment detected:", recorder.messages[0]
         )
 
+    def test_precompile_compiles_patterns(self):
+        with patch(_COMPILE_PATTERN) as mock_compile:
+            CommentDetector(patterns=("TODO", "FIXME")).precompile()
+        mock_compile.assert_has_calls([call("TODO"), call("FIXME")])
+
     def _create_transformer(self):
         raise NotImplementedError
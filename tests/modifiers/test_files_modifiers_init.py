@@ -2,6 +2,8 @@ import logging
 import sys
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 
 def _reimport_files_modifiers(blocked_submodule: str) -> object:
     modifiers = "any_hook.files_modifiers"
@@ -24,7 +26,10 @@ def test_workflow_env_to_example_import_error_logs_warning() -> None:
             logging, logging.getLogger.__name__, return_value=mock_logger
         ),
     ):
-        _reimport_files_modifiers(blocked)
+        package = _reimport_files_modifiers(blocked)
+        with pytest.raises(AttributeError):
+            package.WorkflowEnvToExample
+        package.AnyModifier
         mock_logger.warning.assert_called_once()
         assert "workflow-env-to-example" in mock_logger.warning.call_args[0][0]
 
@@ -38,6 +43,17 @@ def test_generate_stubs_import_error_logs_warning() -> None:
             logging, logging.getLogger.__name__, return_value=mock_logger
         ),
     ):
-        _reimport_files_modifiers(blocked)
+        package = _reimport_files_modifiers(blocked)
+        package.AnyModifier
         mock_logger.warning.assert_called_once()
         assert "generate-stubs" in mock_logger.warning.call_args[0][0]
+
+
+def test_modifier_modules_are_imported_on_first_access() -> None:
+    module = "any_hook.files_modifiers.len_as_bool"
+    with patch.dict(sys.modules):
+        package = _reimport_files_modifiers("")
+        assert module not in sys.modules
+        assert package.LenAsBool.__module__ == module
+        with pytest.raises(AttributeError):
+            package.NoSuchModifier
@@ -51,6 +51,22 @@ class TestForbiddenFunctions(TransformerTestCase):
         """).lstrip()
         assert not self._check_code(code)
 
+    def test_ignore_comment_applies_to_its_own_line_only(self):
+        recorder = RecordingOutput()
+        code = dedent("""
+            hasattr(obj, "name")  # ignore
+            hasattr(obj, "name")
+            text = '# ignore'; hasattr(obj, "name")
+        """).lstrip()
+        modifier = ForbiddenFunctions(
+            forbidden_functions=(hasattr.__name__,), outputs=(recorder,)
+        )
+        assert self._check_code_with_modifier(code, modifier)
+        assert [message.split(":")[1] for message in recorder.messages] == [
+            "2",
+            "3",
+        ]
+
     def test_ignores_hasattr_with_custom_pattern(self):
         code = dedent("""
             def check(obj):
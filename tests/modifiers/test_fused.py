@@ -0,0 +1,119 @@
+from libcst import (
+    CSTNode,
+    CSTTransformer,
+    CSTVisitor,
+    FunctionDef,
+    Name,
+    parse_module,
+)
+
+from any_hook.files_modifiers._fused import FusedTransformer, dispatch
+
+
+class _NameVisitor(CSTVisitor):
+    def visit_Name(self, node: Name) -> None:
+        pass
+
+
+class _FunctionVisitor(_NameVisitor):
+    def leave_FunctionDef(self, original_node: FunctionDef) -> None:
+        pass
+
+
+class _EveryNodeVisitor(CSTVisitor):
+    def on_visit(self, node: CSTNode) -> bool:
+        return True
+
+
+class _RenameNames(CSTTransformer):
+    def leave_Name(self, original_node: Name, updated_node: Name) -> Name:
+        return updated_node.with_changes(value=f"{updated_node.value}_")
+
+
+class _SkipFunctions(_RenameNames):
+    def visit_FunctionDef(self, node: FunctionDef) -> bool:
+        return False
+
+
+class _RecordNames(CSTTransformer):
+    def __init__(self) -> None:
+        super().__init__()
+        self.names: list[str] = []
+
+    def visit_Name(self, node: Name) -> None:
+        self.names.append(node.value)
+
+
+class _RecordNamesOutsideFunctions(_RecordNames):
+    def visit_FunctionDef(self, node: FunctionDef) -> bool:
+        return False
+
+
+class _CountEveryLeave(CSTTransformer):
+    def __init__(self) -> None:
+        super().__init__()
+        self.left = 0
+
+    def on_leave(
+        self, original_node: CSTNode, updated_node: CSTNode
+    ) -> CSTNode:
+        self.left += 1
+        return updated_node
+
+
+class TestDispatch:
+    def test_only_members_handling_a_node_type_are_listed(self):
+        table = dispatch((_NameVisitor, _FunctionVisitor))
+        assert [i for i, _ in table.handlers("visit", "Name")] == [0, 1]
+        assert [i for i, _ in table.handlers("leave", "FunctionDef")] == [1]
+        assert table.handlers("visit", "Integer") == ()
+
+    def test_generic_hooks_handle_every_node_type(self):
+        table = dispatch((_NameVisitor, _EveryNodeVisitor))
+        assert [i for i, _ in table.handlers("visit", "Integer")] == [1]
+        assert table.handlers("leave", "Integer") == ()
+
+    def test_table_is_shared_by_member_sets(self):
+        assert dispatch((_NameVisitor,)) is dispatch((_NameVisitor,))
+
+
+class TestFusedTransformer:
+    def test_children_skipped_when_every_transformer_declines(self):
+        module = parse_module("def f():\n    x\n")
+        fused = FusedTransformer((_SkipFunctions(),))
+        assert module.visit(fused).code == "def f():\n    x\n"
+
+    def test_pruned_subtree_is_skipped_only_by_its_transformer(self):
+        module = parse_module("def f():\n    x\ny\n")
+        fused = FusedTransformer((_SkipFunctions(), _RenameNames()))
+        assert module.visit(fused).code == "def f_():\n    x_\ny__\n"
+
+    def test_pruned_transformer_is_not_called_inside_the_subtree(self):
+        pruned, other = _RecordNamesOutsideFunctions(), _RecordNames()
+        parse_module("def f():\n    x\ny\n").visit(
+            FusedTransformer((pruned, other))
+        )
+        assert pruned.names == ["y"]
+        assert other.names == ["f", "x", "y"]
+
+    def test_subtree_pruned_by_every_transformer_is_not_walked(self):
+        (function,) = parse_module("def f():\n    x\n").body
+        fused = FusedTransformer((_SkipFunctions(), _SkipFunctions()))
+        assert not fused.on_visit(function)
+        assert not fused.on_visit(function.name)
+
+    def test_generic_hooks_see_every_node(self):
+        counter = _CountEveryLeave()
+        module = parse_module("x = 1\n")
+        module.visit(FusedTransformer((_RenameNames(), counter)))
+        assert counter.left > 2
+
+    def test_unchanged_tree_is_not_marked_changed(self):
+        fused = FusedTransformer((_SkipFunctions(),))
+        parse_module("def f():\n    x\n").visit(fused)
+        assert not fused.changed
+
+    def test_replaced_node_marks_tree_changed(self):
+        fused = FusedTransformer((_RenameNames(),))
+        parse_module("x\n").visit(fused)
+        assert fused.changed
@@ -9,7 +9,9 @@ import libcst as cst
 import pytest
 
 from any_hook import FileData
+from any_hook._transaction import dry_run
 from any_hook.files_modifiers.generate_stubs import GenerateStubs
+from any_hook.files_modifiers.output.recording import RecordingOutput
 
 _MODULE = f"{GenerateStubs.__module__}.subprocess.run"
 
@@ -271,6 +273,24 @@ class TestPydanticStubTransformer:
             in result
         )
 
+    def test_same_file_diamond_inheritance_includes_both_parents(
+        self, transform
+    ):
+        code = dedent("""\
+            from pydantic import BaseModel
+            class A(BaseModel):
+                a: int
+            class B(BaseModel):
+                b: str
+            class C(A, B):
+                c: float
+        """)
+        result = transform(code)
+        assert (
+            "def __init__(self, *, a: int, b: str, c: float) -> None: ..."
+            in result
+        )
+
     def test_cross_file_parent_fields_included(self, transform_files):
         base_stub = dedent("""\
             from pydantic import BaseModel
@@ -481,6 +501,19 @@ class TestGenerateStubs:
         mock_run.assert_not_called()
         assert not result
 
+    def test_dry_run_skips_stubgen(self):
+        recorder = RecordingOutput()
+        modifier = GenerateStubs(
+            directories=(Path("src"),), outputs=(recorder,)
+        )
+        with patch(_MODULE) as mock_run, dry_run([]):
+            result = modifier.modify([_make_file_data(Path("src/user.py"))])
+        mock_run.assert_not_called()
+        assert not result
+        assert recorder.messages == [
+            "Skipped generating stubs for 1 file(s) in a dry run"
+        ]
+
     def test_returns_false_when_no_matching_files(self):
         modifier = GenerateStubs(directories=(Path("src"),))
         with patch(_MODULE) as mock_run:
@@ -252,6 +252,13 @@ class TestLeakyMappingTyping(TransformerTestCase):
         """).lstrip()
         assert not self._check_code(code)
 
+    def test_no_flag_callable_ellipsis_returning_dict(self):
+        code = dedent("""
+            from typing import Callable
+            def f() -> Callable[..., dict[str, int]]: ...
+        """).lstrip()
+        assert not self._check_code(code)
+
     def test_no_flag_no_annotations(self):
         code = dedent("""
             def f(x, y):
@@ -368,7 +375,9 @@ class TestLeakyMappingTyping(TransformerTestCase):
         code = ""
         module = parse_module(code)
         visitor = _LeakyMappingTypingVisitor(
-            code, module, re.compile(r"#\s*ignore", re.IGNORECASE)
+            FileData(Path("a.py"), code, module),
+            module,
+            re.compile(r"#\s*ignore", re.IGNORECASE),
         )
         visitor.visit_ImportFrom(synthetic)
         assert not visitor.violations
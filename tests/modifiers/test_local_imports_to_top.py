@@ -13,6 +13,8 @@ from any_hook import FileData
 from any_hook.files_modifiers.local_imports_to_top import LocalImportsToTop
 from tests.modifiers._base import TransformerTestCase
 
+_MODULE_INDEX = f"{LocalImportsToTop.__module__}.shared_module_index"
+
 
 class TestLocalImportsToTop(TransformerTestCase):
     def test_moves_simple_import_from_function(self):
@@ -1279,7 +1281,7 @@ class TestLocalImportsToTop(TransformerTestCase):
         """).lstrip()
         self._assert_transformation(code, expected)
 
-    def test_spec_origin_none_treated_as_external(self):
+    def test_namespace_package_treated_as_external(self):
 
         code = dedent("""
             def process():
@@ -1291,13 +1293,10 @@ class TestLocalImportsToTop(TransformerTestCase):
             def process():
                 return somemodule
         """).lstrip()
-        mock_spec = MagicMock()
-        mock_spec.origin = None
-        with patch(
-            "any_hook.files_modifiers.local_imports_to_top.importlib.util.find_spec",
-            return_value=mock_spec,
-        ):
+        with patch(_MODULE_INDEX) as mock_index:
+            mock_index.return_value.find.return_value = None
             self._assert_transformation(code, expected)
+        mock_index.return_value.find.assert_called_once_with(("somemodule",))
 
     def test_exception_in_path_resolve(self):
 
@@ -1311,20 +1310,9 @@ class TestLocalImportsToTop(TransformerTestCase):
             def process():
                 return somepackage.foo()
         """).lstrip()
-        mock_spec = MagicMock()
-        mock_spec.origin = "/some/path/somepackage/__init__.py"
-        with (
-            patch(
-                "any_hook.files_modifiers.local_imports_to_top.importlib.util.find_spec",
-                return_value=mock_spec,
-            ),
-            patch(
-                "any_hook.files_modifiers.local_imports_to_top.Path"
-            ) as mock_path_class,
-        ):
-            mock_path_instance = MagicMock()
-            mock_path_instance.resolve.side_effect = ValueError("test")
-            mock_path_class.return_value = mock_path_instance
+        with patch(_MODULE_INDEX) as mock_index:
+            origin = mock_index.return_value.find.return_value
+            origin.resolve.side_effect = ValueError("test")
             self._assert_transformation(code, expected)
 
     def test_import_dotted_name_at_top_level(self):
@@ -0,0 +1,61 @@
+import re
+from pathlib import Path
+
+import pytest
+
+from any_hook.files_modifiers._path_filter import PathFilter, path_filter
+
+_PATHS = (
+    Path("a.py"),
+    Path("src/a.py"),
+    Path("src/sub/deep/a.py"),
+    Path("/abs/src/a.py"),
+    Path("tests/x/test_a.py"),
+    Path("src/app/migrations/0001.py"),
+    Path("."),
+)
+_PATTERNS = (
+    "*.py",
+    "*",
+    "src/*",
+    "src/**/*.py",
+    "*/migrations/*",
+    "tests/*/*.py",
+    "/abs/*/a.py",
+    "/abs/*",
+    "test_*.py",
+    "src/[ab].py",
+    "a.?y",
+)
+
+
+class TestPathFilter:
+    @pytest.mark.parametrize("pattern", _PATTERNS)
+    def test_included_matches_like_path_match(self, pattern: str):
+        path_filter_ = PathFilter((pattern,), ())
+        for path in _PATHS:
+            assert path_filter_.accepts(path) == path.match(pattern)
+
+    def test_excluded_patterns_are_combined(self):
+        path_filter_ = PathFilter((), ("tests/*/*.py", "*/migrations/*"))
+        assert [path_filter_.accepts(path) for path in _PATHS] == [
+            not (path.match("tests/*/*.py") or path.match("*/migrations/*"))
+            for path in _PATHS
+        ]
+
+    def test_no_patterns_accept_every_path(self):
+        assert all(map(PathFilter((), ()).accepts, _PATHS))
+
+    def test_verdicts_are_memoized_per_path(self):
+        path_filter_ = PathFilter(("src/*",), ())
+        assert path_filter_.accepts(Path("src/a.py"))
+        path_filter_._included = re.compile("(?!)")
+        assert path_filter_.accepts(Path("src/a.py"))
+        assert not path_filter_.accepts(Path("src/b.py"))
+
+    def test_empty_pattern_is_rejected(self):
+        with pytest.raises(ValueError, match="empty pattern"):
+            PathFilter(("",), ())
+
+    def test_filter_is_shared_by_modifiers_with_same_globs(self):
+        assert path_filter(("src/*",), ()) is path_filter(("src/*",), ())
@@ -0,0 +1,81 @@
+import re
+import timeit
+from pathlib import Path
+
+import any_hook
+from any_hook.files_modifiers._prefilter import TokenMatcher, token_matcher
+
+# Tokens required by the built-in modifiers
+_TOKENS = frozenset(
+    (
+        "pydantic.v1",
+        "Any",
+        "if",
+        "return (",
+        "return(",
+        "open(",
+        "print",
+        "InstanceOf",
+        "utcnow",
+        "import",
+        "import ",
+        "from ",
+        "object",
+        "Enum",
+        "arbitrary_types_allowed",
+        'f"',
+        "f'",
+        "len(",
+        "Dict",
+        "List",
+        "Optional",
+        "#",
+        "class ",
+        "with ",
+        "with(",
+        "field_validator",
+    )
+)
+
+
+class TestTokenMatcher:
+    def test_finds_tokens_present_in_text(self):
+        matcher = TokenMatcher(frozenset(("len(", "import", "pydantic.v1")))
+        assert matcher.find("import os\nlen(os.sep)\n") == {"len(", "import"}
+
+    def test_overlapping_tokens_are_all_found(self):
+        matcher = TokenMatcher(frozenset(("ab", "bc")))
+        assert matcher.find("abc") == {"ab", "bc"}
+
+    def test_tokens_inside_found_tokens_are_found(self):
+        matcher = TokenMatcher(frozenset(("import ", "import", "port")))
+        assert matcher.find("import os") == {"import ", "import", "port"}
+
+    def test_no_tokens(self):
+        assert TokenMatcher(frozenset()).find("x = 1\n") == frozenset()
+
+    def test_matcher_is_shared_by_token_sets(self):
+        tokens = frozenset(("if",))
+        assert token_matcher(tokens) is token_matcher(frozenset(("if",)))
+
+    def test_benchmark_against_a_regex_alternation(self):
+        texts = [
+            path.read_text()
+            for path in Path(any_hook.__file__).parent.rglob("*.py")
+        ]
+        pattern = re.compile(
+            f"(?=({'|'.join(map(re.escape, sorted(_TOKENS)))}))"
+        )
+        matcher = TokenMatcher(_TOKENS)
+
+        def regex() -> None:
+            for text in texts:
+                set(pattern.findall(text))
+
+        def substrings() -> None:
+            for text in texts:
+                matcher.find(text)
+
+        assert min(timeit.repeat(substrings, number=3, repeat=5)) < min(
+            timeit.repeat(regex, number=3, repeat=5)
+        )
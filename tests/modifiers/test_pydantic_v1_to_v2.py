@@ -450,9 +450,11 @@ class TestPydanticV1ToV2(TransformerTestCase):
         assert "from pydantic import BaseModel" == result.code
 
     def test_modify_file_skips_without_v1(self):
-        """Test _modify_file returns False when pydantic.v1 not in content.
+        """Test the content prefilter rejects files without pydantic.v1.
 
-        Covers the early return at line 135 when the file doesn't contain pydantic.v1.
+        Covers the "pydantic.v1" required token being missing, so
+        accepts_content rejects the file and it is neither parsed nor
+        transformed.
         """
 
         modifier = PydanticV1ToV2()
@@ -461,13 +463,14 @@ class TestPydanticV1ToV2(TransformerTestCase):
             content="from pydantic import BaseModel",
             module=parse_module("from pydantic import BaseModel"),
         )
-        # _modify_file should return False because "pydantic.v1" is not in content
+        # The required token "pydantic.v1" is not in the file
         assert modifier.modify([file_data]) is False
 
     def test_modifier_processes_file_with_v1(self):
         """Test that modifier processes files containing pydantic.v1.
 
-        Covers line 136 when pydantic.v1 is in the content.
+        Covers the required token being found, so the file is parsed and
+        transformed.
         """
 
         with TemporaryDirectory() as tmpdir:
@@ -481,8 +484,8 @@ class TestPydanticV1ToV2(TransformerTestCase):
                 content=code,
                 module=parse_module(code),
             )
-            # _modify_file should return True because "pydantic.v1" is in content
-            # and the transformation changes the code
+            # The required token "pydantic.v1" is in the file and the
+            # transformation changes the code
             assert modifier.modify([file_data]) is True
 
     def _create_transformer(self) -> CSTTransformer:
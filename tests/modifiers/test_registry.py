@@ -0,0 +1,122 @@
+import sys
+from collections.abc import Generator, Iterable
+from importlib import import_module
+from typing import Literal
+from unittest.mock import patch
+
+import pytest
+from pydantic import ValidationError
+
+from any_hook import FileData
+from any_hook.files_modifiers import Modifier, _registry
+from any_hook.files_modifiers._registry import (
+    MODIFIER_PATHS,
+    modifier_class,
+    validate_modifiers,
+)
+from any_hook.files_modifiers.agito import Agito
+from any_hook.files_modifiers.forbidden_functions import ForbiddenFunctions
+from any_hook.files_modifiers.len_as_bool import LenAsBool
+
+_IMPORT_MODULE = f"{_registry.__name__}.{import_module.__name__}"
+
+
+class _RegistryTestModifier(Modifier):
+    type: Literal["registry-test-modifier"] = "registry-test-modifier"
+
+    def modify(self, data: Iterable[FileData]) -> bool:
+        return False
+
+
+class _InheritingModifier(_RegistryTestModifier):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches() -> Generator[None, None, None]:
+    modifier_class.cache_clear()
+    _registry._known_types_adapter.cache_clear()
+    yield
+    modifier_class.cache_clear()
+    _registry._known_types_adapter.cache_clear()
+
+
+class TestModifierClass:
+    def test_every_registered_type_matches_its_class(self):
+        for type_ in MODIFIER_PATHS:
+            modifier = modifier_class(type_)
+            assert modifier is not None
+            assert modifier.model_fields["type"].default == type_
+
+    def test_unregistered_type(self):
+        assert modifier_class("no-such-modifier") is None
+
+    def test_missing_optional_dependency(self):
+        blocked = "any_hook.files_modifiers.workflow_env_to_example"
+        with (
+            patch.dict(sys.modules, {blocked: None}),
+            patch.object(_registry, "_logger") as mock_logger,
+        ):
+            assert modifier_class("workflow-env-to-example") is None
+            assert modifier_class("workflow-env-to-example") is None
+        mock_logger.warning.assert_called_once()
+
+
+class TestValidateModifiers:
+    def test_imports_only_configured_types(self):
+        with patch(_IMPORT_MODULE, wraps=import_module) as mock_import:
+            (modifier,) = validate_modifiers(
+                [{"type": "forbidden-functions", "forbidden_functions": ["f"]}]
+            )
+        assert isinstance(modifier, ForbiddenFunctions)
+        mock_import.assert_called_once_with(ForbiddenFunctions.__module__)
+
+    def test_instances_pass_through(self):
+        modifier = LenAsBool()
+        assert validate_modifiers((modifier,)) == (modifier,)
+
+    def test_nested_agito(self):
+        (agito,) = validate_modifiers(
+            [{"type": "agito", "modifiers": [{"type": "len-as-bool"}]}]
+        )
+        assert isinstance(agito, Agito)
+        assert isinstance(agito.modifiers[0], LenAsBool)
+
+    def test_external_modifier(self):
+        (modifier,) = validate_modifiers([{"type": "registry-test-modifier"}])
+        assert isinstance(modifier, _RegistryTestModifier)
+
+    def test_inherited_type_resolves_to_the_defining_class(self):
+        assert _registry._one_per_type(
+            [_InheritingModifier, _RegistryTestModifier]
+        ) == [_RegistryTestModifier]
+        assert _registry._one_per_type(
+            [_RegistryTestModifier, _InheritingModifier]
+        ) == [_RegistryTestModifier]
+
+    def test_unrelated_classes_sharing_a_type_are_logged(self):
+        class First(_RegistryTestModifier):
+            type: Literal["registry-test-clash"] = "registry-test-clash"
+
+        class Second(_RegistryTestModifier):
+            type: Literal["registry-test-clash"] = "registry-test-clash"
+
+        with patch.object(_registry, "_logger") as mock_logger:
+            assert _registry._one_per_type([First, Second]) == [First]
+        (message,), _ = mock_logger.warning.call_args
+        assert "share the type 'registry-test-clash'" in message
+        assert Second.__qualname__ in message
+
+    def test_unknown_type(self):
+        with pytest.raises(ValidationError):
+            validate_modifiers([{"type": "no-such-modifier"}])
+
+    @pytest.mark.parametrize("data", [[], [{}], "len-as-bool"])
+    def test_invalid_configuration(self, data: object):
+        with pytest.raises(ValidationError):
+            validate_modifiers(data)
+
+    def test_agito_serializes_nested_fields(self):
+        checker = ForbiddenFunctions(forbidden_functions=("x",))
+        dumped = Agito(modifiers=(checker,)).model_dump()
+        assert dumped["modifiers"][0]["forbidden_functions"] == ("x",)
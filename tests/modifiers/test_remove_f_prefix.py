@@ -2,6 +2,7 @@ import re
 import tempfile
 from pathlib import Path
 
+import pytest
 from libcst import CSTTransformer, parse_module
 
 from any_hook import FileData
@@ -74,6 +75,19 @@ class TestRemoveFPrefix(TransformerTestCase):
         code = 'x = "hello"'
         self._assert_no_transformation(code)
 
+    def test_keeps_raw_prefix(self):
+        self._assert_transformation(r'x = Rf"\d"', r'x = R"\d"')
+        self._assert_transformation(r"x = fR'\d'", r"x = R'\d'")
+
+    def test_uppercase_f_string(self):
+        self._assert_transformation('x = F"hello"', 'x = "hello"')
+
+    @pytest.mark.parametrize(
+        "code", ['F"a"', "F'a'", 'rF"a"', 'Fr"a"', "FR'a'", 'fr"a"']
+    )
+    def test_every_f_string_prefix_passes_the_prefilter(self, code: str):
+        assert RemoveFPrefix().accepts_content(f"x = {code}\n")
+
     def test_skip_modify_file_without_f_strings(self):
 
         modifier = RemoveFPrefix()
@@ -73,6 +73,10 @@ class TestReturnTupleParensDrop(TransformerTestCase):
         code = "return (a, b)  # ignore\n"
         self._assert_no_transformation(code)
 
+    def test_return_without_space(self):
+        self._assert_transformation("return(a, b)\n", "return a, b\n")
+        assert ReturnTupleParensDrop().accepts_content("return(a, b)\n")
+
     def test_skip_modify_file_without_return_parens(self):
 
         modifier = ReturnTupleParensDrop()
@@ -0,0 +1,132 @@
+import re
+from pathlib import Path
+from typing import Literal
+from unittest.mock import PropertyMock, patch
+
+from libcst import CSTTransformer, Module, Name
+
+from any_hook import FileData
+from any_hook._transaction import dry_run
+from any_hook.files_modifiers.output.recording import RecordingOutput
+from any_hook.files_modifiers.separate_modifier import SeparateModifier
+
+
+class _RenameTransformer(CSTTransformer):
+    def leave_Name(self, original_node: Name, updated_node: Name) -> Name:
+        return updated_node.with_changes(value="y")
+
+
+class _Rename(SeparateModifier[_RenameTransformer]):
+    type: Literal["separate-modifier-test-rename"] = (
+        "separate-modifier-test-rename"
+    )
+
+    def create_transformer(
+        self, ignore_pattern: re.Pattern[str]
+    ) -> _RenameTransformer:
+        return _RenameTransformer()
+
+
+class _RebuildNamesTransformer(CSTTransformer):
+    def leave_Name(self, original_node: Name, updated_node: Name) -> Name:
+        return Name(updated_node.value)
+
+
+class _RebuildNames(SeparateModifier[_RebuildNamesTransformer]):
+    type: Literal["separate-modifier-test-rebuild-names"] = (
+        "separate-modifier-test-rebuild-names"
+    )
+
+    def create_transformer(
+        self, ignore_pattern: re.Pattern[str]
+    ) -> _RebuildNamesTransformer:
+        return _RebuildNamesTransformer()
+
+
+class _Keep(SeparateModifier[CSTTransformer]):
+    type: Literal["separate-modifier-test-keep"] = (
+        "separate-modifier-test-keep"
+    )
+
+    def create_transformer(
+        self, ignore_pattern: re.Pattern[str]
+    ) -> CSTTransformer:
+        return CSTTransformer()
+
+
+class _RenameImports(SeparateModifier[_RenameTransformer]):
+    type: Literal["separate-modifier-test-rename-imports"] = (
+        "separate-modifier-test-rename-imports"
+    )
+
+    def create_transformer(
+        self, ignore_pattern: re.Pattern[str]
+    ) -> _RenameTransformer:
+        return _RenameTransformer()
+
+    def required_tokens(self) -> tuple[str, ...]:
+        return ("import",)
+
+
+class _RejectingRename(SeparateModifier[_RenameTransformer]):
+    type: Literal["separate-modifier-test-rejecting-rename"] = (
+        "separate-modifier-test-rejecting-rename"
+    )
+
+    def create_transformer(
+        self, ignore_pattern: re.Pattern[str]
+    ) -> _RenameTransformer:
+        return _RenameTransformer()
+
+    def should_process_content(self, content: str) -> bool:
+        return False
+
+
+class TestSeparateModifier:
+    def test_accepts_every_file_by_default(self, tmp_path: Path):
+        path = tmp_path / "a.py"
+        path.write_text("x = 1\n")
+        assert _Rename().should_process_content("")
+        assert _Rename().modify([FileData(path, "x = 1\n")])
+        assert path.read_text() == "y = 1\n"
+
+    def test_rejected_file_is_not_parsed(self):
+        file_data = FileData(Path("a.py"), "x = 1\n")
+        assert not _RejectingRename().modify([file_data])
+        assert file_data._module is None
+
+    def test_untouched_file_skips_code_generation(self):
+        file_data = FileData(Path("a.py"), "x = 1\n")
+        with patch.object(
+            Module, "code", new_callable=PropertyMock
+        ) as mock_code:
+            assert not _Keep().modify([file_data])
+        mock_code.assert_not_called()
+
+    def test_rebuilt_but_identical_code_is_not_written(self):
+        file_data = FileData(Path("a.py"), "x = 1\n")
+        assert not _RebuildNames().modify([file_data])
+        assert not file_data.modified
+
+    def test_dry_run_reports_diff_without_writing(self, tmp_path: Path):
+        path = tmp_path / "a.py"
+        path.write_text("x = 1\n")
+        recorder = RecordingOutput()
+        file_data = FileData(path, "x = 1\n")
+        with dry_run([]):
+            assert _Rename(outputs=(recorder,)).modify([file_data])
+        assert path.read_text() == "x = 1\n"
+        assert recorder.messages == [
+            f"--- a/{path}\n+++ b/{path}\n@@ -1 +1 @@\n-x = 1\n+y = 1"
+        ]
+
+    def test_file_without_required_tokens_is_not_parsed(self):
+        file_data = FileData(Path("a.py"), "x = 1\n")
+        assert not _RenameImports().modify([file_data])
+        assert file_data._module is None
+
+    def test_file_with_a_required_token_is_processed(self, tmp_path: Path):
+        path = tmp_path / "a.py"
+        path.write_text("import x\n")
+        assert _RenameImports().modify([FileData(path, "import x\n")])
+        assert path.read_text() == "import y\n"
@@ -1,12 +1,15 @@
 from pathlib import Path
 from tempfile import TemporaryDirectory
 from textwrap import dedent
+from unittest.mock import patch
 
 from libcst import parse_module
 
 from any_hook import FileData
 from any_hook.files_modifiers.test_if_checker import TestIfChecker
 
+_COMPILE_PATTERN = f"{TestIfChecker.__module__}.compile_pattern"
+
 
 class TestTestIfChecker:
     def test_detects_top_level_if_in_test_function(self):
@@ -854,3 +857,8 @@ class TestTestIfChecker:
             )
             result = modifier.modify([file_data])
             assert result is True
+
+    def test_precompile_compiles_test_function_pattern(self):
+        with patch(_COMPILE_PATTERN) as mock_compile:
+            TestIfChecker(test_function_pattern="^check_").precompile()
+        mock_compile.assert_called_once_with("^check_")
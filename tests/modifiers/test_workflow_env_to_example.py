@@ -4,6 +4,8 @@ from textwrap import dedent
 
 import pytest
 
+from any_hook._transaction import dry_run
+from any_hook.files_modifiers.output.recording import RecordingOutput
 from any_hook.files_modifiers.workflow_env_to_example import (
     WorkflowEnvToExample,
 )
@@ -125,6 +127,23 @@ class TestWorkflowEnvToExample:
             assert content.count(str(workflow_file)) == 1
             assert "NEW_VAR=new_value" in content
 
+    def test_dry_run_reports_diff(self, tmp_path: Path):
+        workflow_file = tmp_path / "workflow.yml"
+        workflow_file.write_text("env:\n  NEW_VAR: new_value\n")
+        output_file = tmp_path / ".env.example"
+        output_file.write_text("OLD_VAR=old_value\n")
+        recorder = RecordingOutput()
+        modifier = WorkflowEnvToExample(
+            workflow_paths=(workflow_file,),
+            output_path=output_file,
+            outputs=(recorder,),
+        )
+        with dry_run([]):
+            assert modifier.modify([])
+        assert output_file.read_text() == "OLD_VAR=old_value\n"
+        (diff,) = recorder.messages
+        assert f"+# From: {workflow_file}\n+NEW_VAR=new_value" in diff
+
     def test_handles_multiple_workflow_files(self):
         with TemporaryDirectory() as tmpdir:
             tmpdir_path = Path(tmpdir)
@@ -0,0 +1,182 @@
+import json
+import os
+from pathlib import Path
+from unittest.mock import Mock
+
+from any_hook.services._import_cache import (
+    _Closure,
+    _ImportCache,
+    _Unresolved,
+)
+from any_hook.services._module_summary import _ImportRecord, _ModuleSummary
+
+_SUMMARY = _ModuleSummary(
+    {"Model": ("BaseModel",)},
+    {
+        "BaseModel": (_ImportRecord(("pydantic",), 0, "BaseModel"),),
+        "os": (_ImportRecord(("os",), 0, None),),
+    },
+)
+_ROOTS = ((".",), ())
+_MISSING = _Unresolved("not found", ())
+
+
+def _touch(path: Path, content: str = "x = 1\n") -> Path:
+    path.write_text(content)
+    return path
+
+
+class TestImportCacheSummary:
+    def test_roundtrip(self, tmp_path: Path):
+        path = _touch(tmp_path / "models.py")
+        cache = _ImportCache(tmp_path / "cache")
+        assert cache.summary(path, lambda: _SUMMARY) == _SUMMARY
+        compute = Mock()
+        assert _ImportCache(tmp_path / "cache").summary(path, compute) == (
+            _SUMMARY
+        )
+        compute.assert_not_called()
+        assert (tmp_path / "cache" / ".gitignore").read_text() == "*\n"
+
+    def test_modified_file_is_summarized_again(self, tmp_path: Path):
+        path = _touch(tmp_path / "models.py")
+        cache = _ImportCache(tmp_path / "cache")
+        cache.summary(path, lambda: _SUMMARY)
+        _touch(path, "x = 10\n")
+        other = _ModuleSummary({}, {})
+        assert cache.summary(path, lambda: other) == other
+
+    def test_same_size_with_new_mtime_is_summarized_again(
+        self, tmp_path: Path
+    ):
+        path = _touch(tmp_path / "models.py")
+        cache = _ImportCache(tmp_path / "cache")
+        cache.summary(path, lambda: _SUMMARY)
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        other = _ModuleSummary({}, {})
+        assert cache.summary(path, lambda: other) == other
+
+    def test_corrupt_entry_is_replaced(self, tmp_path: Path):
+        path = _touch(tmp_path / "models.py")
+        cache = _ImportCache(tmp_path / "cache")
+        cache.summary(path, lambda: _SUMMARY)
+        (entry,) = (tmp_path / "cache").glob("*/*.json")
+        stat = path.stat()
+        signature = [stat.st_mtime_ns, stat.st_size]
+        entry.write_text(json.dumps({"stat": signature}))
+        assert cache.summary(path, lambda: _SUMMARY) == _SUMMARY
+        assert _ImportCache(tmp_path / "cache").summary(path, Mock()) == (
+            _SUMMARY
+        )
+
+
+class TestImportCacheModuleFile:
+    def test_roundtrip(self, tmp_path: Path):
+        path = _touch(tmp_path / "models.py")
+        cache = _ImportCache(tmp_path / "cache")
+        assert cache.module_file(_ROOTS, ["models"], lambda: path) == path
+        compute = Mock()
+        assert cache.module_file(_ROOTS, ["models"], compute) == path
+        compute.assert_not_called()
+
+    def test_key_covers_roots_and_module(self, tmp_path: Path):
+        path = _touch(tmp_path / "models.py")
+        cache = _ImportCache(tmp_path / "cache")
+        cache.module_file(_ROOTS, ["models"], lambda: path)
+        assert cache.module_file(_ROOTS, ["other"], lambda: _MISSING) == (
+            _MISSING
+        )
+        other_roots = ((".",), ("venv",))
+        assert (
+            cache.module_file(other_roots, ["models"], lambda: _MISSING)
+            == _MISSING
+        )
+
+    def test_removed_file_is_located_again(self, tmp_path: Path):
+        path = _touch(tmp_path / "models.py")
+        cache = _ImportCache(tmp_path / "cache")
+        cache.module_file(_ROOTS, ["models"], lambda: path)
+        path.unlink()
+        assert cache.module_file(_ROOTS, ["models"], lambda: _MISSING) == (
+            _MISSING
+        )
+
+    def test_unresolved_modules_are_stored_with_reasons(self, tmp_path: Path):
+        watched = tmp_path / "site"
+        watched.mkdir()
+        unresolved = _Unresolved("not found", (watched,))
+        cache = _ImportCache(tmp_path / "cache")
+        assert cache.module_file(_ROOTS, ["missing"], lambda: unresolved) == (
+            unresolved
+        )
+        compute = Mock()
+        assert cache.module_file(_ROOTS, ["missing"], compute) == unresolved
+        compute.assert_not_called()
+
+    def test_unresolved_modules_are_located_again_once_directories_change(
+        self, tmp_path: Path
+    ):
+        watched = tmp_path / "site"
+        watched.mkdir()
+        os.utime(watched, ns=(0, 0))
+        cache = _ImportCache(tmp_path / "cache")
+        cache.module_file(
+            _ROOTS, ["missing"], lambda: _Unresolved("not found", (watched,))
+        )
+        path = _touch(watched / "missing.py")
+        assert cache.module_file(_ROOTS, ["missing"], lambda: path) == path
+
+    def test_corrupt_entry_is_replaced(self, tmp_path: Path):
+        path = _touch(tmp_path / "models.py")
+        cache = _ImportCache(tmp_path / "cache")
+        cache.module_file(_ROOTS, ["models"], lambda: path)
+        (entry,) = (tmp_path / "cache").glob("*/*.json")
+        entry.write_text("[]")
+        assert cache.module_file(_ROOTS, ["models"], lambda: path) == path
+        entry.write_text(json.dumps({"reason": "not found"}))
+        assert cache.module_file(_ROOTS, ["models"], lambda: path) == path
+
+
+class TestImportCacheClosure:
+    def test_roundtrip(self, tmp_path: Path):
+        models = _touch(tmp_path / "models.py")
+        base = _touch(tmp_path / "base.py")
+        closure = _Closure(
+            frozenset({"Model", "Base", "BaseModel"}),
+            frozenset({models, base}),
+        )
+        cache = _ImportCache(tmp_path / "cache")
+        assert cache.closure(_ROOTS, models, "Model") is None
+        cache.store_closure(_ROOTS, models, "Model", closure)
+        assert (
+            _ImportCache(tmp_path / "cache").closure(_ROOTS, models, "Model")
+            == closure
+        )
+        assert cache.closure(_ROOTS, models, "Other") is None
+
+    def test_modified_dependency_invalidates(self, tmp_path: Path):
+        models = _touch(tmp_path / "models.py")
+        base = _touch(tmp_path / "base.py")
+        cache = _ImportCache(tmp_path / "cache")
+        cache.store_closure(
+            _ROOTS,
+            models,
+            "Model",
+            _Closure(frozenset({"Model", "Base"}), frozenset({models, base})),
+        )
+        _touch(base, "x = 10\n")
+        assert cache.closure(_ROOTS, models, "Model") is None
+
+    def test_corrupt_entry_is_ignored(self, tmp_path: Path):
+        models = _touch(tmp_path / "models.py")
+        cache = _ImportCache(tmp_path / "cache")
+        cache.store_closure(
+            _ROOTS,
+            models,
+            "Model",
+            _Closure(frozenset({"Model"}), frozenset({models})),
+        )
+        (entry,) = (tmp_path / "cache").glob("*/*.json")
+        entry.write_text(json.dumps({"names": ["Model"], "files": []}))
+        assert cache.closure(_ROOTS, models, "Model") is None
@@ -1,9 +1,36 @@
+import os
+import sys
+from importlib.machinery import EXTENSION_SUFFIXES
 from pathlib import Path
 from textwrap import dedent
+from unittest.mock import Mock, patch
 
+import pydantic
+import pytest
 from libcst import parse_module
 
-from any_hook.services import ImportPathTracker
+from any_hook.services import (
+    ImportPathTracker,
+    ModuleIndex,
+    _import_path_tracker,
+    refresh_shared_import_path_trackers,
+    reset_shared_import_path_trackers,
+    shared_import_path_tracker,
+)
+from any_hook.services._import_path_tracker import (
+    _register_fork_handler,
+    _reset_after_fork,
+)
+
+_FIND_INSTALLED = f"{ModuleIndex.__module__}.{ModuleIndex.__qualname__}.find"
+
+
+def _logged_reasons(mock_logger: Mock) -> dict[str, str]:
+    """The reasons logged for the imports that could not be followed, by
+    imported name."""
+    return {
+        call.args[2]: call.args[3] for call in mock_logger.debug.call_args_list
+    }
 
 
 class TestImportPathTracker:
@@ -339,3 +366,449 @@ class TestImportPathTracker:
         assert not tracker.is_subclass_via_imports(
             "Something", module, usage_path, {"BaseModel"}
         )
+
+    def test_dotted_name_skips_from_imports_of_its_first_segment(
+        self, tmp_path: Path
+    ):
+        package = tmp_path / "pkg"
+        package.mkdir()
+        (package / "__init__.py").write_text("")
+        (package / "models.py").write_text(
+            "from pydantic import BaseModel\n"
+            "class Model(BaseModel):\n"
+            "    pass\n"
+        )
+        module = parse_module("from other import pkg\nimport pkg\n")
+        tracker = ImportPathTracker(source_roots=(str(tmp_path),))
+        assert tracker.is_subclass_via_imports(
+            "pkg.models.Model", module, tmp_path / "usage.py", {"BaseModel"}
+        )
+
+    def test_dependencies_are_parsed_once_across_files(self, tmp_path: Path):
+        (tmp_path / "base.py").write_text(
+            "from pydantic import BaseModel\n"
+            "class Base(BaseModel):\n"
+            "    pass\n"
+        )
+        (tmp_path / "models.py").write_text(
+            "from base import Base\nclass Model(Base):\n    pass\n"
+        )
+        tracker = ImportPathTracker(source_roots=(str(tmp_path),))
+        with patch.object(
+            ImportPathTracker, "_parse", wraps=ImportPathTracker._parse
+        ) as mock_parse:
+            for name in ("a.py", "b.py"):
+                assert tracker.is_subclass_via_imports(
+                    "Model",
+                    parse_module("from models import Model\n"),
+                    tmp_path / name,
+                    {"BaseModel"},
+                )
+        # The closure follows BaseModel on into the installed package, whose
+        # __init__ is summarized once like the project files
+        assert [call.args[0] for call in mock_parse.call_args_list] == [
+            tmp_path / "models.py",
+            tmp_path / "base.py",
+            Path(pydantic.__file__),
+        ]
+
+    def test_absolute_imports_are_located_once(self, tmp_path: Path):
+        tracker = ImportPathTracker(source_roots=(str(tmp_path),))
+        module = parse_module("from nonexistent_pkg import Something\n")
+        with patch(_FIND_INSTALLED, return_value=None) as mock_find:
+            for _ in range(2):
+                assert not tracker.is_subclass_via_imports(
+                    "Something", module, tmp_path / "a.py", {"BaseModel"}
+                )
+        mock_find.assert_called_once_with(["nonexistent_pkg"])
+
+    def test_extension_modules_are_not_followed(self, tmp_path: Path):
+        extra_root = tmp_path / "extra"
+        extra_root.mkdir()
+        (extra_root / f"native{EXTENSION_SUFFIXES[0]}").write_bytes(b"")
+        module = parse_module("from native import Model\n")
+        tracker = ImportPathTracker(
+            source_roots=(str(tmp_path),), extra_sys_path=(str(extra_root),)
+        )
+        with patch.object(_import_path_tracker, "_logger") as mock_logger:
+            assert not tracker.is_subclass_via_imports(
+                "Model", module, tmp_path / "usage.py", {"BaseModel"}
+            )
+        assert _logged_reasons(mock_logger) == {
+            "Model": f"no source or stub for native{EXTENSION_SUFFIXES[0]}"
+        }
+
+    def test_extension_modules_are_read_from_adjacent_stubs(
+        self, tmp_path: Path
+    ):
+        extra_root = tmp_path / "extra"
+        package = extra_root / "native"
+        package.mkdir(parents=True)
+        (package / f"__init__{EXTENSION_SUFFIXES[0]}").write_bytes(b"")
+        (package / "__init__.pyi").write_text(
+            "from native._core import Base as Base\n"
+        )
+        (package / f"_core{EXTENSION_SUFFIXES[0]}").write_bytes(b"")
+        (package / "_core.pyi").write_text(
+            "from pydantic import BaseModel\n" "class Base(BaseModel): ...\n"
+        )
+        module = parse_module("from native import Base\n")
+        tracker = ImportPathTracker(
+            source_roots=(str(tmp_path),), extra_sys_path=(str(extra_root),)
+        )
+        assert tracker.is_subclass_via_imports(
+            "Base", module, tmp_path / "usage.py", {"BaseModel"}
+        )
+
+    def test_stub_only_packages_are_read(self, tmp_path: Path):
+        extra_root = tmp_path / "extra"
+        stubs = extra_root / "native-stubs"
+        stubs.mkdir(parents=True)
+        (stubs / "__init__.pyi").write_text(
+            "from .models import Model as Model\n"
+        )
+        (stubs / "models.pyi").write_text(
+            "from pydantic import BaseModel\n" "class Model(BaseModel): ...\n"
+        )
+        tracker = ImportPathTracker(
+            source_roots=(str(tmp_path),), extra_sys_path=(str(extra_root),)
+        )
+        for usage_code in (
+            "from native import Model\n",
+            "from native.models import Model\n",
+        ):
+            assert tracker.is_subclass_via_imports(
+                "Model",
+                parse_module(usage_code),
+                tmp_path / "usage.py",
+                {"BaseModel"},
+            )
+        assert not tracker.is_subclass_via_imports(
+            "Other",
+            parse_module("from native.other import Other\n"),
+            tmp_path / "usage.py",
+            {"BaseModel"},
+        )
+
+    def test_stubs_in_source_roots_are_read(self, tmp_path: Path):
+        package = tmp_path / "pkg"
+        package.mkdir()
+        (package / "__init__.pyi").write_text(
+            "from pydantic import BaseModel\n" "class Base(BaseModel): ...\n"
+        )
+        (package / "models.pyi").write_text(
+            "from . import Base\nclass Model(Base): ...\n"
+        )
+        module = parse_module("from pkg.models import Model\n")
+        tracker = ImportPathTracker(source_roots=(str(tmp_path),))
+        assert tracker.is_subclass_via_imports(
+            "Model", module, tmp_path / "usage.py", {"BaseModel"}
+        )
+
+    def test_unresolved_imports_are_logged_with_reasons(self, tmp_path: Path):
+        extra_root = tmp_path / "extra"
+        (extra_root / "namespace").mkdir(parents=True)
+        module = parse_module(dedent("""
+            from namespace import A
+            from sys import B
+            from nonexistent_pkg import C
+            from .nonexistent_sibling import D
+        """))
+        tracker = ImportPathTracker(
+            source_roots=(str(tmp_path), str(tmp_path / "missing")),
+            extra_sys_path=(str(extra_root),),
+        )
+        with patch.object(_import_path_tracker, "_logger") as mock_logger:
+            for name in "ABCDE":
+                assert not tracker.is_subclass_via_imports(
+                    name, module, tmp_path / "usage.py", {"BaseModel"}
+                )
+        # E is not imported at all, so there is no import to follow
+        assert _logged_reasons(mock_logger) == {
+            "A": "namespace package",
+            "B": "built-in module",
+            "C": "not found",
+            "D": "not found",
+        }
+
+    def test_disk_cache_keeps_unresolved_modules_until_they_appear(
+        self, tmp_path: Path
+    ):
+        root = tmp_path / "src"
+        root.mkdir()
+        # Backdated, so adding a module surely changes its timestamp
+        os.utime(root, ns=(0, 0))
+        module = parse_module(
+            "from models import Model\nclass Usage(Model):\n    pass\n"
+        )
+        usage_path = root / "usage.py"
+        cache_dir = tmp_path / "cache"
+        first = ImportPathTracker((str(root),), cache_dir=cache_dir)
+        assert not first.is_subclass_via_imports(
+            "Usage", module, usage_path, {"BaseModel"}
+        )
+        second = ImportPathTracker((str(root),), cache_dir=cache_dir)
+        with (
+            patch.object(second, "_find_module_file") as mock_find,
+            patch.object(_import_path_tracker, "_logger") as mock_logger,
+        ):
+            assert not second.is_subclass_via_imports(
+                "Usage", module, usage_path, {"BaseModel"}
+            )
+        mock_find.assert_not_called()
+        assert _logged_reasons(mock_logger) == {"Model": "not found"}
+        (root / "models.py").write_text(
+            "from pydantic import BaseModel\n"
+            "class Model(BaseModel):\n"
+            "    pass\n"
+        )
+        third = ImportPathTracker((str(root),), cache_dir=cache_dir)
+        assert third.is_subclass_via_imports(
+            "Usage", module, usage_path, {"BaseModel"}
+        )
+
+    def test_disk_cache_serves_later_trackers(self, tmp_path: Path):
+        (tmp_path / "models.py").write_text(
+            "from pydantic import BaseModel\n"
+            "class Model(BaseModel):\n"
+            "    pass\n"
+        )
+        module = parse_module("from models import Model\n")
+        usage_path = tmp_path / "usage.py"
+        cache_dir = tmp_path / "cache"
+        first = ImportPathTracker((str(tmp_path),), cache_dir=cache_dir)
+        assert first.is_subclass_via_imports(
+            "Model", module, usage_path, {"BaseModel"}
+        )
+        second = ImportPathTracker((str(tmp_path),), cache_dir=cache_dir)
+        with (
+            patch.object(ImportPathTracker, "_parse") as mock_parse,
+            patch.object(second, "_find_module_file") as mock_find,
+        ):
+            assert second.is_subclass_via_imports(
+                "Model", module, usage_path, {"BaseModel"}
+            )
+        mock_parse.assert_not_called()
+        mock_find.assert_not_called()
+
+    def test_closures_are_memoized_per_checked_module(self, tmp_path: Path):
+        (tmp_path / "models.py").write_text("class Thing:\n    pass\n")
+        module = parse_module("from models import Thing\n")
+        tracker = ImportPathTracker(source_roots=(str(tmp_path),))
+        assert not tracker.is_subclass_via_imports(
+            "Thing", module, tmp_path / "a.py", {"BaseModel"}
+        )
+        with patch.object(tracker, "_closure") as mock_closure:
+            assert not tracker.is_subclass_via_imports(
+                "Thing", module, tmp_path / "a.py", {"Base", "Other"}
+            )
+        mock_closure.assert_not_called()
+
+    def test_closures_are_shared_across_files(self, tmp_path: Path):
+        (tmp_path / "models.py").write_text("class Thing:\n    pass\n")
+        tracker = ImportPathTracker(source_roots=(str(tmp_path),))
+        for name in ("a.py", "b.py"):
+            module = parse_module("from models import Thing\n")
+            with patch.object(
+                tracker, "_compute_closure", wraps=tracker._compute_closure
+            ) as mock_compute:
+                assert not tracker.is_subclass_via_imports(
+                    "Thing", module, tmp_path / name, {"BaseModel"}
+                )
+        assert mock_compute.call_count == 1
+
+    def test_closures_cut_short_by_a_cycle_are_not_memoized(
+        self, tmp_path: Path
+    ):
+        (tmp_path / "a.py").write_text(
+            "from b import B\nclass A(B):\n    pass\n"
+        )
+        (tmp_path / "b.py").write_text(
+            "from a import A\nclass B(A):\n    pass\n"
+        )
+        tracker = ImportPathTracker(source_roots=(str(tmp_path),))
+        assert not tracker.is_subclass_via_imports(
+            "A",
+            parse_module("from a import A\n"),
+            tmp_path / "usage.py",
+            {"BaseModel"},
+        )
+        assert list(tracker._closures) == [(tmp_path / "a.py", "A")]
+
+    def test_grandparent_imported_through_a_local_base(self, tmp_path: Path):
+        (tmp_path / "base.py").write_text(
+            "from pydantic import BaseModel\n"
+            "class Base(BaseModel):\n"
+            "    pass\n"
+        )
+        module = parse_module(dedent("""
+            from base import Base
+            class Parent(Base):
+                pass
+            class Child(Parent):
+                pass
+        """))
+        tracker = ImportPathTracker(source_roots=(str(tmp_path),))
+        assert tracker.is_subclass_via_imports(
+            "Child", module, tmp_path / "usage.py", {"BaseModel"}
+        )
+
+    def test_ancestors_answer_any_target_bases(self, tmp_path: Path):
+        (tmp_path / "base.py").write_text(
+            "from pydantic import BaseModel\n"
+            "class Base(BaseModel):\n"
+            "    pass\n"
+        )
+        module = parse_module(
+            "from base import Base as Alias\nclass Model(Alias):\n    pass\n"
+        )
+        tracker = ImportPathTracker(source_roots=(str(tmp_path),))
+        assert tracker.ancestors("Model", module, tmp_path / "a.py") >= {
+            "Model",
+            "Alias",
+            "Base",
+            "BaseModel",
+        }
+        with patch.object(tracker, "_compute_closure") as mock_compute:
+            assert tracker.is_subclass_via_imports(
+                "Model", module, tmp_path / "a.py", {"Base"}
+            )
+            assert not tracker.is_subclass_via_imports(
+                "Model", module, tmp_path / "a.py", {"RootModel"}
+            )
+        mock_compute.assert_not_called()
+
+    def test_disk_cache_keeps_closures_of_untouched_files(
+        self, tmp_path: Path
+    ):
+        base = tmp_path / "base.py"
+        base.write_text(
+            "from pydantic import BaseModel\n"
+            "class Base(BaseModel):\n"
+            "    pass\n"
+        )
+        (tmp_path / "models.py").write_text(
+            "from base import Base\nclass Model(Base):\n    pass\n"
+        )
+        module = parse_module("from models import Model\n")
+        cache_dir = tmp_path / "cache"
+        summarized: set[Path] = set()
+
+        def is_model() -> bool:
+            tracker = ImportPathTracker((str(tmp_path),), cache_dir=cache_dir)
+            summarized.clear()
+            with patch.object(
+                tracker, "_summary", wraps=tracker._summary
+            ) as mock_summary:
+                verdict = tracker.is_subclass_via_imports(
+                    "Model", module, tmp_path / "usage.py", {"BaseModel"}
+                )
+            summarized.update(call.args[0] for call in mock_summary.mock_calls)
+            return verdict
+
+        assert is_model()
+        assert is_model()
+        assert summarized == set()
+        base.write_text("class Base:\n    pass\n")
+        assert not is_model()
+        assert summarized == {tmp_path / "models.py", base}
+
+    def test_refresh_keeps_what_untouched_files_gave(self, tmp_path: Path):
+        base = tmp_path / "base.py"
+        base.write_text(
+            "from pydantic import BaseModel\n"
+            "class Base(BaseModel):\n"
+            "    pass\n"
+        )
+        (tmp_path / "models.py").write_text(
+            "from base import Base\nclass Model(Base):\n    pass\n"
+        )
+        usage = tmp_path / "usage.py"
+        tracker = ImportPathTracker(source_roots=(str(tmp_path),))
+
+        def is_model() -> bool:
+            module = parse_module("from models import Model\n")
+            return tracker.is_subclass_via_imports(
+                "Model", module, usage, {"BaseModel"}
+            )
+
+        assert is_model()
+        with patch.object(
+            ImportPathTracker, "_parse", wraps=ImportPathTracker._parse
+        ) as mock_parse:
+            tracker.refresh()
+            assert is_model()
+            mock_parse.assert_not_called()
+            base.write_text("class Base:\n    pass\n")
+            tracker.refresh()
+            assert not is_model()
+        mock_parse.assert_called_once_with(base)
+
+    def test_refresh_sees_modules_that_appear(self, tmp_path: Path):
+        os.utime(tmp_path, ns=(0, 0))
+        module = parse_module("from models import Model\n")
+        tracker = ImportPathTracker(source_roots=(str(tmp_path),))
+        assert not tracker.is_subclass_via_imports(
+            "Model", module, tmp_path / "usage.py", {"Base"}
+        )
+        (tmp_path / "models.py").write_text(
+            "class Base:\n    pass\nclass Model(Base):\n    pass\n"
+        )
+        tracker.refresh()
+        assert tracker.is_subclass_via_imports(
+            "Model", module, tmp_path / "usage.py", {"Base"}
+        )
+
+
+class TestSharedImportPathTracker:
+    def test_shared_per_roots(self):
+        tracker = shared_import_path_tracker(("src",), ())
+        assert shared_import_path_tracker(("src",), ()) is tracker
+        assert shared_import_path_tracker((".",), ()) is not tracker
+
+    def test_reset_starts_a_new_run(self):
+        tracker = shared_import_path_tracker()
+        reset_shared_import_path_trackers()
+        assert shared_import_path_tracker() is not tracker
+
+    def test_refresh_keeps_the_trackers(self):
+        reset_shared_import_path_trackers()
+        tracker = shared_import_path_tracker()
+        with patch.object(ImportPathTracker, "refresh") as mock_refresh:
+            refresh_shared_import_path_trackers()
+        assert shared_import_path_tracker() is tracker
+        mock_refresh.assert_called_once_with()
+
+    def test_refresh_elsewhere_starts_a_new_run(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        reset_shared_import_path_trackers()
+        tracker = shared_import_path_tracker()
+        refresh_shared_import_path_trackers(tmp_path)
+        assert shared_import_path_tracker() is not tracker
+        tracker = shared_import_path_tracker()
+        monkeypatch.chdir(tmp_path)
+        refresh_shared_import_path_trackers(tmp_path)
+        assert shared_import_path_tracker() is not tracker
+        reset_shared_import_path_trackers()
+
+    def test_forked_child_starts_afresh(self):
+        tracker = shared_import_path_tracker()
+        _reset_after_fork()
+        assert shared_import_path_tracker() is not tracker
+
+    def test_fork_handler_is_registered_where_fork_exists(self):
+        with patch.object(os, "register_at_fork") as mock_register:
+            _register_fork_handler()
+            with patch.object(sys, "platform", "win32"):
+                _register_fork_handler()
+        mock_register.assert_called_once_with(after_in_child=_reset_after_fork)
+
+    def test_shared_trackers_use_the_run_cache_dir(self, tmp_path: Path):
+        reset_shared_import_path_trackers(tmp_path)
+        try:
+            tracker = shared_import_path_tracker()
+        finally:
+            reset_shared_import_path_trackers()
+        assert tracker._disk_cache is not None
+        assert shared_import_path_tracker()._disk_cache is None
@@ -0,0 +1,181 @@
+import os
+import sys
+from importlib.machinery import EXTENSION_SUFFIXES
+from pathlib import Path
+from unittest.mock import patch
+
+from any_hook.services import (
+    ModuleIndex,
+    refresh_shared_module_indexes,
+    reset_shared_module_indexes,
+    shared_module_index,
+)
+from any_hook.services._module_index import (
+    _register_fork_handler,
+    _reset_after_fork,
+)
+
+_LISTDIR = f"{ModuleIndex.__module__}.os.listdir"
+
+
+def _package(directory: Path, name: str, init: bool = True) -> Path:
+    package = directory / name
+    package.mkdir(parents=True)
+    if init:
+        (package / "__init__.py").write_text("")
+    return package
+
+
+class TestModuleIndex:
+    def test_module_and_package_files(self, tmp_path: Path):
+        (tmp_path / "single.py").write_text("")
+        package = _package(tmp_path, "pkg")
+        (package / "sub.py").write_text("")
+        _package(package, "nested")
+        index = ModuleIndex((str(tmp_path),))
+        assert index.find(["single"]) == tmp_path / "single.py"
+        assert index.find(["pkg"]) == package / "__init__.py"
+        assert index.find(["pkg", "sub"]) == package / "sub.py"
+        assert index.find(["pkg", "nested"]) == (
+            package / "nested" / "__init__.py"
+        )
+
+    def test_missing_modules(self, tmp_path: Path):
+        (tmp_path / "single.py").write_text("")
+        _package(tmp_path, "pkg")
+        index = ModuleIndex((str(tmp_path), str(tmp_path / "missing")))
+        assert index.find(["absent"]) is None
+        assert index.find(["pkg", "absent"]) is None
+        assert index.find(["single", "sub"]) is None
+        assert index.find([]) is None
+
+    def test_first_directory_wins(self, tmp_path: Path):
+        first, second = tmp_path / "first", tmp_path / "second"
+        first.mkdir()
+        second.mkdir()
+        (first / "mod.py").write_text("")
+        (second / "mod.py").write_text("")
+        index = ModuleIndex((str(first), str(second)))
+        assert index.find(["mod"]) == first / "mod.py"
+
+    def test_packages_shadow_modules(self, tmp_path: Path):
+        (tmp_path / "mod.py").write_text("")
+        package = _package(tmp_path, "mod")
+        assert ModuleIndex((str(tmp_path),)).find(["mod"]) == (
+            package / "__init__.py"
+        )
+
+    def test_extension_and_bytecode_modules(self, tmp_path: Path):
+        native = tmp_path / f"native{EXTENSION_SUFFIXES[0]}"
+        native.write_bytes(b"")
+        (tmp_path / "compiled.pyc").write_bytes(b"")
+        index = ModuleIndex((str(tmp_path),))
+        assert index.find(["native"]) == native
+        assert index.find(["compiled"]) == tmp_path / "compiled.pyc"
+
+    def test_namespace_packages_span_directories(self, tmp_path: Path):
+        first = _package(tmp_path / "first", "ns", init=False)
+        second = _package(tmp_path / "second", "ns", init=False)
+        (first / "a.py").write_text("")
+        (second / "b.py").write_text("")
+        index = ModuleIndex(
+            (str(tmp_path / "first"), str(tmp_path / "second"))
+        )
+        assert index.find(["ns"]) is None
+        assert index.find(["ns", "a"]) == first / "a.py"
+        assert index.find(["ns", "b"]) == second / "b.py"
+        assert index.is_namespace_package(["ns"])
+        assert not index.is_namespace_package(["ns", "a"])
+        assert not index.is_namespace_package(["absent"])
+        assert not index.is_namespace_package(["ns", "a", "deeper"])
+
+    def test_regular_package_beats_earlier_namespace_portion(
+        self, tmp_path: Path
+    ):
+        _package(tmp_path / "first", "pkg", init=False)
+        package = _package(tmp_path / "second", "pkg")
+        (tmp_path / "first" / "plain").write_text("")
+        index = ModuleIndex(
+            (str(tmp_path / "first"), str(tmp_path / "second"))
+        )
+        assert index.find(["pkg"]) == package / "__init__.py"
+        assert index.find(["plain"]) is None
+
+    def test_directories_are_kept_in_order(self, tmp_path: Path):
+        directories = (str(tmp_path / "b"), str(tmp_path / "a"))
+        assert ModuleIndex(directories).directories == directories
+
+    def test_directories_are_listed_once(self, tmp_path: Path):
+        (tmp_path / "a.py").write_text("")
+        index = ModuleIndex((str(tmp_path),))
+        with patch(_LISTDIR, wraps=os.listdir) as mock_listdir:
+            for name in ("a", "a", "b"):
+                index.find([name])
+        mock_listdir.assert_called_once_with(str(tmp_path))
+
+    def test_refresh_lists_modified_directories_again(self, tmp_path: Path):
+        untouched = tmp_path / "untouched"
+        modified = tmp_path / "modified"
+        untouched.mkdir()
+        modified.mkdir()
+        index = ModuleIndex((str(untouched), str(modified)))
+        assert index.find(["late"]) is None
+        (modified / "late.py").write_text("")
+        os.utime(modified, ns=(0, 0))
+        with patch(_LISTDIR, wraps=os.listdir) as mock_listdir:
+            index.refresh()
+            assert index.find(["late"]) == modified / "late.py"
+        mock_listdir.assert_called_once_with(str(modified))
+
+    def test_refresh_forgets_removed_directories(self, tmp_path: Path):
+        directory = tmp_path / "site"
+        directory.mkdir()
+        (directory / "gone.py").write_text("")
+        index = ModuleIndex((str(directory),))
+        assert index.find(["gone"]) == directory / "gone.py"
+        (directory / "gone.py").unlink()
+        directory.rmdir()
+        index.refresh()
+        assert index.find(["gone"]) is None
+
+
+class TestSharedModuleIndex:
+    def test_extra_directories_come_before_sys_path(self, tmp_path: Path):
+        (tmp_path / "json.py").write_text("")
+        index = shared_module_index((str(tmp_path),))
+        assert index.find(["json"]) == tmp_path / "json.py"
+        assert shared_module_index((str(tmp_path),)) is index
+        assert shared_module_index().find(["json"]) != tmp_path / "json.py"
+
+    def test_follows_sys_path_changes(self, tmp_path: Path):
+        (tmp_path / "late_addition.py").write_text("")
+        index = shared_module_index()
+        with patch.object(sys, "path", [str(tmp_path), *sys.path]):
+            assert shared_module_index() is not index
+            assert shared_module_index().find(["late_addition"]) == (
+                tmp_path / "late_addition.py"
+            )
+
+    def test_refresh_keeps_the_indexes(self):
+        index = shared_module_index()
+        with patch.object(ModuleIndex, "refresh") as mock_refresh:
+            refresh_shared_module_indexes()
+        assert shared_module_index() is index
+        mock_refresh.assert_called_with()
+
+    def test_reset_starts_a_new_run(self):
+        index = shared_module_index()
+        reset_shared_module_indexes()
+        assert shared_module_index() is not index
+
+    def test_forked_child_starts_afresh(self):
+        index = shared_module_index()
+        _reset_after_fork()
+        assert shared_module_index() is not index
+
+    def test_fork_handler_is_registered_where_fork_exists(self):
+        with patch.object(os, "register_at_fork") as mock_register:
+            _register_fork_handler()
+            with patch.object(sys, "platform", "win32"):
+                _register_fork_handler()
+        mock_register.assert_called_once_with(after_in_child=_reset_after_fork)
@@ -0,0 +1,76 @@
+from textwrap import dedent
+
+from any_hook.services._module_summary import (
+    _ImportRecord,
+    _ModuleSummary,
+    _summarize_source,
+)
+
+
+def _summarize(source: str) -> _ModuleSummary:
+    return _summarize_source(dedent(source).encode())
+
+
+class TestSummarizeSource:
+    def test_class_headers(self):
+        assert _summarize("""
+            class Model(pydantic.BaseModel, Mixin, metaclass=Meta):
+                class Nested(Other):
+                    pass
+            class Built(make_base()):
+                pass
+        """).classes == {"Model": ("BaseModel", "Mixin"), "Built": ()}
+
+    def test_from_imports(self):
+        assert (
+            _summarize("""
+            from pkg.models import Model, Base as Alias
+            from .. import sibling
+            from star import *
+        """).imports == {
+                "Model": (_ImportRecord(("pkg", "models"), 0, "Model"),),
+                "Alias": (_ImportRecord(("pkg", "models"), 0, "Base"),),
+                "sibling": (_ImportRecord((), 2, "sibling"),),
+            }
+        )
+
+    def test_import_statements(self):
+        assert _summarize("import pkg.models, other as alias\n").imports == {
+            "pkg": (_ImportRecord(("pkg", "models"), 0, None),),
+            "alias": (_ImportRecord(("other",), 0, None),),
+        }
+
+    def test_imports_binding_the_same_name_keep_their_order(self):
+        assert (
+            _summarize("""
+            import pkg.models
+            from other import pkg
+            import pkg.views
+        """).imports == {
+                "pkg": (
+                    _ImportRecord(("pkg", "models"), 0, None),
+                    _ImportRecord(("other",), 0, "pkg"),
+                    _ImportRecord(("pkg", "views"), 0, None),
+                )
+            }
+        )
+
+    def test_only_top_level_statements(self):
+        assert _summarize("""
+            x = 1
+            if TYPE_CHECKING:
+                from models import Model
+            def f():
+                class Local(Base):
+                    pass
+        """) == _ModuleSummary({}, {})
+
+    def test_honors_the_encoding_declaration(self):
+        source = (
+            "# -*- coding: latin-1 -*-\n"
+            "class Caf\u00e9(Base):\n"
+            "    pass\n"
+        )
+        assert _summarize_source(source.encode("latin-1")).classes == {
+            "Caf\u00e9": ("Base",)
+        }
@@ -0,0 +1,37 @@
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+from any_hook._atomic_write import replace_atomically, write_cache_entry
+
+
+class TestReplaceAtomically:
+    def test_syncs_before_replacing(self, tmp_path: Path):
+        path = tmp_path / "a.py"
+        with patch.object(os, "fsync") as mock_fsync:
+            replace_atomically(path, b"x = 1\n")
+        mock_fsync.assert_called_once()
+        assert path.read_bytes() == b"x = 1\n"
+
+    def test_sync_can_be_skipped(self, tmp_path: Path):
+        path = tmp_path / "a.py"
+        with patch.object(os, "fsync") as mock_fsync:
+            replace_atomically(path, "x = 1\n", sync=False)
+        mock_fsync.assert_not_called()
+        assert path.read_text() == "x = 1\n"
+
+
+class TestWriteCacheEntry:
+    def test_creates_the_entry_and_ignores_the_cache(self, tmp_path: Path):
+        entry = tmp_path / "cache" / "ab" / "abcd.json"
+        write_cache_entry(tmp_path / "cache", entry, "{}")
+        assert entry.read_text() == "{}"
+        assert (tmp_path / "cache" / ".gitignore").read_text() == "*\n"
+        assert sorted(path.name for path in entry.parent.iterdir()) == [
+            "abcd.json"
+        ]
+
+    def test_keeps_an_existing_gitignore(self, tmp_path: Path):
+        (tmp_path / ".gitignore").write_text("*.json\n")
+        write_cache_entry(tmp_path, tmp_path / "entry.json", "{}")
+        assert (tmp_path / ".gitignore").read_text() == "*.json\n"
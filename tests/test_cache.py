@@ -0,0 +1,74 @@
+from importlib.metadata import PackageNotFoundError
+from pathlib import Path
+from unittest.mock import patch
+
+from any_hook import _version
+from any_hook._cache import ResultCache
+from any_hook.files_modifiers.agito import Agito
+from any_hook.files_modifiers.forbidden_functions import ForbiddenFunctions
+from any_hook.files_modifiers.len_as_bool import LenAsBool
+from any_hook.files_modifiers.output.recording import RecordingOutput
+
+_VERSION = f"{_version.__name__}.version"
+
+
+class TestResultCache:
+    def test_roundtrip(self, tmp_path: Path):
+        cache = ResultCache(tmp_path, (LenAsBool(),))
+        result = (True, ((0, "a.py:1: message"),))
+        assert cache.load(Path("a.py"), "x = 1\n") is None
+        cache.store(Path("a.py"), "x = 1\n", result)
+        assert cache.load(Path("a.py"), "x = 1\n") == result
+
+    def test_key_covers_path_and_content(self, tmp_path: Path):
+        cache = ResultCache(tmp_path, (LenAsBool(),))
+        cache.store(Path("a.py"), "x = 1\n", (False, ()))
+        assert cache.load(Path("b.py"), "x = 1\n") is None
+        assert cache.load(Path("a.py"), "x = 2\n") is None
+
+    def test_configuration_change_invalidates(self, tmp_path: Path):
+        ResultCache(
+            tmp_path, (ForbiddenFunctions(forbidden_functions=("print",)),)
+        ).store(Path("a.py"), "x = 1\n", (False, ()))
+        other = ResultCache(
+            tmp_path, (ForbiddenFunctions(forbidden_functions=("eval",)),)
+        )
+        assert other.load(Path("a.py"), "x = 1\n") is None
+
+    def test_outputs_are_not_part_of_the_key(self, tmp_path: Path):
+        ResultCache(tmp_path, (Agito(modifiers=(LenAsBool(),)),)).store(
+            Path("a.py"), "x = 1\n", (False, ())
+        )
+        recording = Agito(
+            modifiers=(LenAsBool(outputs=(RecordingOutput(),)),),
+            outputs=(RecordingOutput(),),
+        )
+        assert ResultCache(tmp_path, (recording,)).load(
+            Path("a.py"), "x = 1\n"
+        ) == (False, ())
+
+    def test_version_change_invalidates(self, tmp_path: Path):
+        with patch(_VERSION, return_value="1.0.0"):
+            cache = ResultCache(tmp_path, (LenAsBool(),))
+        cache.store(Path("a.py"), "x = 1\n", (False, ()))
+        with patch(_VERSION, return_value="2.0.0"):
+            other = ResultCache(tmp_path, (LenAsBool(),))
+        assert other.load(Path("a.py"), "x = 1\n") is None
+
+    def test_unknown_version(self, tmp_path: Path):
+        with patch(_VERSION, side_effect=PackageNotFoundError):
+            cache = ResultCache(tmp_path, (LenAsBool(),))
+        cache.store(Path("a.py"), "x = 1\n", (False, ()))
+        assert cache.load(Path("a.py"), "x = 1\n") == (False, ())
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path: Path):
+        cache = ResultCache(tmp_path, (LenAsBool(),))
+        cache.store(Path("a.py"), "x = 1\n", (False, ()))
+        (entry,) = tmp_path.glob("*/*.json")
+        entry.write_text('{"changed": false}')
+        assert cache.load(Path("a.py"), "x = 1\n") is None
+
+    def test_directory_is_git_ignored(self, tmp_path: Path):
+        cache = ResultCache(tmp_path / "cache", (LenAsBool(),))
+        cache.store(Path("a.py"), "x = 1\n", (False, ()))
+        assert (tmp_path / "cache" / ".gitignore").read_text() == "*\n"
@@ -0,0 +1,112 @@
+import json
+import os
+import socketserver
+import sys
+import tempfile
+import threading
+from collections.abc import Generator
+from pathlib import Path
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from any_hook import _client
+from any_hook._client import default_socket_path, main
+
+_DEFAULT_SOCKET_PATH = f"{_client.__name__}.{default_socket_path.__name__}"
+_IMPORT_MODULE = f"{_client.__name__}.import_module"
+
+
+@pytest.fixture
+def socket_path() -> Generator[Path, None, None]:
+    path = Path(tempfile.gettempdir()) / f"ah-{uuid4().hex[:8]}.sock"
+    with patch(_DEFAULT_SOCKET_PATH, return_value=path):
+        yield path
+    path.unlink(missing_ok=True)
+
+
+def _serve_once(
+    socket_path: Path, frames: list[dict[str, object]]
+) -> tuple[threading.Thread, list[dict[str, object]]]:
+    requests: list[dict[str, object]] = []
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            requests.append(json.loads(self.rfile.readline()))
+            for frame in frames:
+                self.wfile.write(json.dumps(frame).encode() + b"\n")
+
+    server = socketserver.UnixStreamServer(str(socket_path), Handler)
+
+    def serve() -> None:
+        with server:
+            server.handle_request()
+
+    thread = threading.Thread(target=serve)
+    thread.start()
+    return thread, requests
+
+
+class TestClient:
+    def test_relays_frames_and_exit_code(self, socket_path: Path, capsys):
+        thread, requests = _serve_once(
+            socket_path,
+            [
+                {"stream": "stdout", "data": "out\n"},
+                {"stream": "stderr", "data": "err\n"},
+                {"exit": 3},
+            ],
+        )
+        with patch.object(sys, "argv", ["any-hook-client", "a.py"]):
+            assert main() == 3
+        thread.join()
+        captured = capsys.readouterr()
+        assert captured.out == "out\n"
+        assert captured.err == "err\n"
+        assert requests[0]["argv"] == ["a.py"]
+        assert requests[0]["cwd"] == str(Path.cwd())
+
+    def test_connection_closed_without_exit(self, socket_path: Path, capsys):
+        thread, _ = _serve_once(socket_path, [])
+        with patch.object(sys, "argv", ["any-hook-client"]):
+            assert main() == 1
+        thread.join()
+        assert "closed the connection" in capsys.readouterr().err
+
+    @pytest.mark.parametrize("platform", [sys.platform, "win32"])
+    def test_falls_back_to_in_process_run(
+        self, socket_path: Path, tmp_path: Path, platform: str
+    ):
+        file = tmp_path / "a.py"
+        file.write_text("x = f'hello'")
+        argv = [
+            "any-hook-client",
+            str(file),
+            "--modifiers",
+            '[{"type":"remove-f-prefix"}]',
+        ]
+        with (
+            patch.object(sys, "argv", argv),
+            patch.object(sys, "platform", platform),
+        ):
+            assert main() == 1
+        assert file.read_text() == "x = 'hello'"
+
+    def test_windows_skips_the_socket_lookup(self):
+        with (
+            patch.object(sys, "platform", "win32"),
+            patch(_DEFAULT_SOCKET_PATH) as mock_socket_path,
+            patch(_IMPORT_MODULE) as mock_import,
+        ):
+            mock_import.return_value.main.return_value = True
+            assert main() == 1
+        mock_socket_path.assert_not_called()
+        mock_import.assert_called_once_with("any_hook")
+
+
+def test_default_socket_path_is_per_user():
+    path = default_socket_path()
+    assert path.parent == Path(tempfile.gettempdir())
+    assert path.name.startswith(f"any-hook-{os.getuid()}-")
+    assert path == default_socket_path()
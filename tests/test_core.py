@@ -1,7 +1,10 @@
+import importlib
 import json
+import re
 import sys
 import tempfile
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 from libcst import parse_module
@@ -9,8 +12,12 @@ from pydantic import ValidationError
 
 from any_hook import FileData, main
 from any_hook.__main__ import Main
+from any_hook.files_modifiers._base import Modifier
 from any_hook.files_modifiers.remove_f_prefix import RemoveFPrefix
 
+_COMPILE_PATTERN = f"{Modifier.__module__}.compile_pattern"
+_PATH_FILTER = f"{Modifier.__module__}.path_filter"
+
 
 def _run_main(
     paths: list[Path], modifiers: list[dict], convert_to_agito: bool = True
@@ -72,6 +79,80 @@ def test_transaction_revert_on_exception_via_main(capsys):
         assert "Changes reverted" in captured.out
 
 
+def test_parallel_jobs_via_main():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        test_dir = Path(tmpdir)
+        files = [test_dir / "a.py", test_dir / "b.py", test_dir / "c.py"]
+        for file in files:
+            file.write_text("x = f'hello'")
+        original_argv = sys.argv
+        try:
+            sys.argv = [
+                "any-hook",
+                *map(str, files),
+                "--modifiers",
+                '[{"type":"remove-f-prefix"}]',
+                "--jobs",
+                "2",
+            ]
+            assert main()
+        finally:
+            sys.argv = original_argv
+        for file in files:
+            assert file.read_text() == "x = 'hello'"
+
+
+def test_cache_dir_via_main():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        test_dir = Path(tmpdir)
+        file = test_dir / "a.py"
+        file.write_text("x = 'hello'")
+        cache_dir = test_dir / ".any_hook_cache"
+        original_argv = sys.argv
+        try:
+            sys.argv = [
+                "any-hook",
+                str(file),
+                "--modifiers",
+                '[{"type":"remove-f-prefix"}]',
+                "--jobs",
+                "1",
+                "--cache_dir",
+                str(cache_dir),
+            ]
+            assert not main()
+            assert not main()
+        finally:
+            sys.argv = original_argv
+        assert list(cache_dir.glob("*/*.json"))
+
+
+def test_check_via_main(capsys):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        test_dir = Path(tmpdir)
+        file = test_dir / "a.py"
+        file.write_text("x = f'hello'\n")
+        journal_dir = test_dir / "journal"
+        original_argv = sys.argv
+        try:
+            sys.argv = [
+                "any-hook",
+                str(file),
+                "--modifiers",
+                '[{"type":"remove-f-prefix"}]',
+                "--journal_dir",
+                str(journal_dir),
+                "--check",
+                "true",
+            ]
+            assert main()
+        finally:
+            sys.argv = original_argv
+        assert file.read_text() == "x = f'hello'\n"
+        assert not journal_dir.exists()
+        assert "-x = f'hello'\n+x = 'hello'" in capsys.readouterr().out
+
+
 def test_main_callable():
     with tempfile.TemporaryDirectory() as tmpdir:
         test_dir = Path(tmpdir)
@@ -147,3 +228,31 @@ def test_modifier_with_included_paths():
         test_file2 = Path(tmpdir) / "test2.py"
         test_file2.write_text("x = f'hello'")
         assert modifier.should_process_file(test_file2) is False
+
+
+def test_ignore_regex_is_compiled_once():
+    modifier = RemoveFPrefix(ignore_pattern=r"#\s*keep")
+    assert (
+        modifier.ignore_regex is RemoveFPrefix(
+            ignore_pattern=r"#\s*keep"
+        ).ignore_regex
+    )
+    assert modifier.ignore_regex.search("x  # KEEP")
+
+
+def test_precompile_compiles_patterns_and_path_filter():
+    modifier = RemoveFPrefix(excluded_paths=("tests/*",))
+    with (
+        patch(_COMPILE_PATTERN) as mock_compile,
+        patch(_PATH_FILTER) as mock_path_filter,
+    ):
+        modifier.precompile()
+    mock_compile.assert_called_once_with(r"#\s*ignore", re.IGNORECASE)
+    mock_path_filter.assert_called_once_with((), ("tests/*",))
+
+
+def test_package_attributes_are_lazy():
+    package = importlib.import_module("any_hook")
+    assert package.Main is Main
+    with pytest.raises(AttributeError, match="no_such_name"):
+        package.no_such_name
@@ -0,0 +1,163 @@
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Generator
+from io import BytesIO
+from pathlib import Path
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from any_hook import main
+from any_hook._daemon import Daemon, _exit_code, _FrameWriter
+
+
+@pytest.fixture
+def socket_path() -> Generator[Path, None, None]:
+    path = Path(tempfile.gettempdir()) / f"ah-{uuid4().hex[:8]}.sock"
+    yield path
+    path.unlink(missing_ok=True)
+
+
+def _start(socket_path: Path, idle_timeout: float = 1) -> threading.Thread:
+    daemon = Daemon(
+        _cli_parse_args=False,
+        socket_path=socket_path,
+        idle_timeout=idle_timeout,
+    )
+    thread = threading.Thread(target=daemon.cli_cmd)
+    thread.start()
+    while not socket_path.exists():
+        time.sleep(0.01)
+    return thread
+
+
+def _request(
+    socket_path: Path, argv: list[str], cwd: Path
+) -> tuple[int, list[dict[str, str]]]:
+    request = {"argv": argv, "cwd": str(cwd), "env": dict(os.environ)}
+    frames = []
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(str(socket_path))
+        with connection.makefile("rwb") as stream:
+            stream.write(json.dumps(request).encode() + b"\n")
+            stream.flush()
+            for line in stream:
+                message = json.loads(line)
+                if "exit" in message:
+                    return message["exit"], frames
+                frames.append(message)
+    raise AssertionError("no exit frame")
+
+
+class TestDaemon:
+    def test_runs_in_client_directory(self, socket_path: Path, tmp_path):
+        (tmp_path / "a.py").write_text("x = f'hello'")
+        thread = _start(socket_path)
+        cwd = os.getcwd()
+        code, _ = _request(
+            socket_path,
+            [
+                "a.py",
+                "--modifiers",
+                '[{"type":"remove-f-prefix"}]',
+                "--jobs",
+                "1",
+            ],
+            tmp_path,
+        )
+        thread.join()
+        assert code == 1
+        assert (tmp_path / "a.py").read_text() == "x = 'hello'"
+        assert os.getcwd() == cwd
+        assert not socket_path.exists()
+
+    def test_streams_output(self, socket_path: Path, tmp_path):
+        (tmp_path / "a.py").write_text("print(1)\n")
+        thread = _start(socket_path)
+        code, frames = _request(
+            socket_path,
+            [
+                "a.py",
+                "--modifiers",
+                '[{"type":"forbidden-functions",'
+                '"forbidden_functions":["print"]}]',
+            ],
+            tmp_path,
+        )
+        thread.join()
+        assert code == 1
+        stdout = "".join(
+            frame["data"] for frame in frames if frame["stream"] == "stdout"
+        )
+        assert "print usage detected" in stdout
+
+    def test_argument_error_exit_code(self, socket_path: Path, tmp_path):
+        thread = _start(socket_path)
+        code, frames = _request(socket_path, ["--bogus"], tmp_path)
+        thread.join()
+        assert code == 2
+        assert any(frame["stream"] == "stderr" for frame in frames)
+
+    def test_exception_is_reported(self, socket_path: Path, tmp_path):
+        thread = _start(socket_path)
+        code, frames = _request(
+            socket_path,
+            ["missing.py", "--modifiers", '[{"type":"len-as-bool"}]'],
+            tmp_path,
+        )
+        thread.join()
+        assert code == 1
+        stderr = "".join(
+            frame["data"] for frame in frames if frame["stream"] == "stderr"
+        )
+        assert "Traceback" in stderr
+
+    def test_refuses_second_daemon(self, socket_path: Path):
+        thread = _start(socket_path, idle_timeout=0.2)
+        with pytest.raises(ValueError, match="already listening"):
+            Daemon(_cli_parse_args=False, socket_path=socket_path).cli_cmd()
+        thread.join()
+
+    def test_replaces_stale_socket(self, socket_path: Path):
+        socket_path.write_text("")
+        Daemon(
+            _cli_parse_args=False, socket_path=socket_path, idle_timeout=0.01
+        ).cli_cmd()
+        assert not socket_path.exists()
+
+    def test_started_through_main(self, socket_path: Path):
+        argv = [
+            "any-hook",
+            "daemon",
+            "--socket_path",
+            str(socket_path),
+            "--idle_timeout",
+            "0.01",
+        ]
+        with patch.object(sys, "argv", argv):
+            assert not main()
+        assert not socket_path.exists()
+
+
+@pytest.mark.parametrize(
+    "code,expected", [(None, 0), (0, 0), (2, 2), ("message", 1)]
+)
+def test_exit_code(code, expected):
+    assert _exit_code(SystemExit(code)) == expected
+
+
+def test_frame_writer_sends_each_write_as_a_frame():
+    wfile = BytesIO()
+    writer = _FrameWriter(wfile, "stderr")
+    assert writer.writable()
+    assert writer.write("err\n") == 4
+    assert json.loads(wfile.getvalue()) == {
+        "stream": "stderr",
+        "data": "err\n",
+    }
@@ -1,6 +1,13 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
+from unittest.mock import patch
+
+import pytest
 
 from any_hook import Main
+from any_hook._pipeline import run_pipeline
 
 _EXTERNAL = Path(__file__).parent / "_external_modules.py"
 _KWARGS = {"_cli_parse_args": False, "paths": ()}
@@ -34,3 +41,47 @@ class TestExternalPath:
             convert_to_agito=False,
             **_KWARGS,
         ).cli_cmd()
+
+    @pytest.mark.parametrize("start_method,jobs", [("spawn", 1), ("fork", 4)])
+    def test_external_modifiers_run_in_process_unless_forked(
+        self, start_method: str, jobs: int
+    ):
+        with (
+            patch.object(
+                multiprocessing, "get_start_method", return_value=start_method
+            ),
+            patch(f"{Main.__module__}.run_pipeline") as mock_run,
+        ):
+            Main(
+                external_modifiers_path=_EXTERNAL,
+                modifiers=[{"type": "external_modifier"}],
+                jobs=4,
+                **_KWARGS,
+            ).cli_cmd()
+        (_, _, run_jobs, _), _ = mock_run.call_args
+        assert run_jobs == jobs
+
+    def test_spawned_run_with_external_modifiers(self, tmp_path: Path):
+        paths = [tmp_path / "a.py", tmp_path / "b.py"]
+        for path in paths:
+            path.write_text("x = 1\n")
+        # A spawned worker could not unpickle the external modifier
+        spawn_pool = partial(
+            ProcessPoolExecutor,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        with (
+            patch.object(
+                multiprocessing, "get_start_method", return_value="spawn"
+            ),
+            patch(
+                f"{run_pipeline.__module__}.ProcessPoolExecutor", spawn_pool
+            ),
+        ):
+            assert not Main(
+                _cli_parse_args=False,
+                paths=paths,
+                external_modifiers_path=_EXTERNAL,
+                modifiers=[{"type": "external_modifier"}],
+                jobs=2,
+            ).cli_cmd()
@@ -0,0 +1,68 @@
+from pathlib import Path
+from unittest.mock import patch
+
+from libcst import parse_module
+
+from any_hook import FileData
+from any_hook.files_modifiers.forbidden_functions import ForbiddenFunctions
+
+_PARSE_MODULE = f"{FileData.__module__}.{parse_module.__name__}"
+
+
+class TestFileData:
+    def test_module_is_parsed_lazily_and_memoized(self):
+        file_data = FileData(Path("a.py"), "x = 1\n")
+        with patch(_PARSE_MODULE, wraps=parse_module) as mock_parse:
+            first = file_data.module
+            second = file_data.module
+        assert first is second
+        assert first.code == "x = 1\n"
+        assert mock_parse.call_count == 1
+
+    def test_given_module_is_not_reparsed(self):
+        module = parse_module("x = 1\n")
+        file_data = FileData(Path("a.py"), "x = 1\n", module)
+        with patch(_PARSE_MODULE) as mock_parse:
+            assert file_data.module is module
+        mock_parse.assert_not_called()
+
+    def test_prefiltered_file_is_never_parsed(self):
+        file_data = FileData(Path("a.py"), "x = 1\n")
+        modifier = ForbiddenFunctions(forbidden_functions=(print.__name__,))
+        with patch(_PARSE_MODULE) as mock_parse:
+            assert not modifier.modify([file_data])
+        mock_parse.assert_not_called()
+
+    def test_line_index_is_built_lazily_and_memoized(self):
+        file_data = FileData(Path("a.py"), "x = 1  # note\n")
+        assert file_data._line_index is None
+        assert file_data.line_index is file_data.line_index
+        assert file_data.line_index.comments == {1: "# note"}
+
+    def test_positions_are_resolved_lazily_and_memoized(self):
+        file_data = FileData(Path("a.py"), "x = 1\ny = 2\n")
+        assert file_data._positions is None
+        second = file_data.module.body[1]
+        assert file_data.position(second).start.line == 2
+        positions = file_data._positions
+        assert file_data.position(file_data.module.body[0]).start.line == 1
+        assert file_data._positions is positions
+
+    def test_clean_file_never_resolves_positions(self):
+        file_data = FileData(Path("a.py"), "print_count = 1\n")
+        modifier = ForbiddenFunctions(forbidden_functions=(print.__name__,))
+        assert not modifier.modify([file_data])
+        assert file_data._module is not None
+        assert file_data._positions is None
+
+    def test_write_marks_file_modified(self, tmp_path: Path):
+        path = tmp_path / "a.py"
+        file_data = FileData(path, "x = 1\n")
+        assert not file_data.modified
+        file_data.write("x = 2\n")
+        assert file_data.modified
+        assert path.read_text() == "x = 2\n"
+
+    def test_repr_shows_path(self):
+        path = Path("a.py")
+        assert repr(FileData(path, "")) == f"FileData(path={path!r})"
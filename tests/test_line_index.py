@@ -0,0 +1,32 @@
+import re
+
+from libcst.metadata import CodePosition, CodeRange
+
+from any_hook._line_index import LineIndex
+
+_IGNORE = re.compile(r"#\s*ignore", re.IGNORECASE)
+
+
+def _lines(start: int, end: int) -> CodeRange:
+    return CodeRange(CodePosition(start, 0), CodePosition(end, 0))
+
+
+class TestLineIndex:
+    def test_collects_comments_by_line(self):
+        index = LineIndex("x = '# not a comment'\ny = 1  # note\n")
+        assert index.comments == {2: "# note"}
+
+    def test_falls_back_to_line_scan_on_tokenize_error(self):
+        index = LineIndex("x = (\n    1  # note\n")
+        assert index.comments == {2: "# note"}
+
+    def test_ignored_lines_are_memoized_per_pattern(self):
+        index = LineIndex("x = 1  # ignore\ny = 2  # keep\n")
+        assert index.ignored_lines(_IGNORE) == {1}
+        assert index.ignored_lines(_IGNORE) is index.ignored_lines(_IGNORE)
+
+    def test_is_ignored_checks_every_spanned_line(self):
+        index = LineIndex("f(\n    1,\n)  # IGNORE\ng()\n")
+        assert index.is_ignored(_IGNORE, _lines(1, 3))
+        assert not index.is_ignored(_IGNORE, _lines(1, 2))
+        assert not index.is_ignored(_IGNORE, _lines(4, 4))
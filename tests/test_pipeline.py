@@ -0,0 +1,331 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from any_hook._pipeline import (
+    ExecutionPlan,
+    _FilePipeline,
+    _FileResult,
+    _in_file_order,
+    _init_worker,
+    _replay,
+    _run_in_worker,
+    run_pipeline,
+)
+from any_hook._transaction import dry_run, is_dry_run, set_dry_run
+from any_hook.files_modifiers.agito import Agito
+from any_hook.files_modifiers.check_untracked import CheckUntracked
+from any_hook.files_modifiers.forbidden_functions import ForbiddenFunctions
+from any_hook.files_modifiers.generate_stubs import GenerateStubs
+from any_hook.files_modifiers.instance_of_pydantic_model_detector import (
+    InstanceOfPydanticModelDetector,
+)
+from any_hook.files_modifiers.len_as_bool import LenAsBool
+from any_hook.files_modifiers.local_imports_to_top import LocalImportsToTop
+from any_hook.files_modifiers.output.recording import RecordingOutput
+from any_hook.files_modifiers.pydantic_config_to_model_config import (
+    PydanticConfigToModelConfig,
+)
+from any_hook.services import ImportPathTracker
+
+_UNTRACKED_FILES = (
+    f"{CheckUntracked.__module__}.{CheckUntracked.__name__}._untracked_files"
+)
+
+_RESET_TRACKERS = (
+    f"{run_pipeline.__module__}.reset_shared_import_path_trackers"
+)
+_REFRESH_TRACKERS = (
+    f"{run_pipeline.__module__}.refresh_shared_import_path_trackers"
+)
+
+
+def _write_files(
+    directory: Path, code: str, names: tuple[str, ...] = ("a.py", "b.py")
+) -> list[Path]:
+    paths = [directory / name for name in names]
+    for path in paths:
+        path.write_text(code)
+    return paths
+
+
+class TestFilePipeline:
+    def test_records_messages_with_modifier_index(self, tmp_path: Path):
+        (path,) = _write_files(
+            tmp_path, "if len(x):\n    print(x)\n", ("a.py",)
+        )
+        checker = ForbiddenFunctions(forbidden_functions=(print.__name__,))
+        plan = ExecutionPlan((Agito(modifiers=(LenAsBool(), checker)),))
+        pipeline = _FilePipeline(plan)
+        result = pipeline(path)
+        assert result.changed
+        assert [index for index, _ in result.messages] == [2, 0]
+        assert "print usage detected" in result.messages[0][1]
+        assert path.read_text() == "if x:\n    print(x)\n"
+
+    def test_worker_entry_points(self, tmp_path: Path):
+        (path,) = _write_files(tmp_path, "x = 1\n", ("a.py",))
+        _init_worker(ExecutionPlan((LenAsBool(),)))
+        result = _run_in_worker(path)
+        assert not result.changed
+        assert result.messages == ()
+
+    def test_worker_inherits_dry_run(self, tmp_path: Path):
+        (path,) = _write_files(tmp_path, "if len(x):\n    pass\n", ("a.py",))
+        _init_worker(ExecutionPlan((LenAsBool(),)), dry_run=True)
+        try:
+            result = _run_in_worker(path)
+            assert is_dry_run()
+        finally:
+            set_dry_run(False)
+        assert result.changed
+        assert "+if x:" in result.messages[0][1]
+        assert path.read_text() == "if len(x):\n    pass\n"
+
+    def test_worker_keeps_import_resolution_in_cache_dir(self, tmp_path: Path):
+        with patch(_RESET_TRACKERS) as mock_reset:
+            _init_worker(
+                ExecutionPlan((LenAsBool(),)), import_cache_dir=tmp_path
+            )
+        mock_reset.assert_called_once_with(tmp_path)
+
+
+class TestExecutionPlan:
+    def test_splits_and_indexes_modifiers(self):
+        checker = ForbiddenFunctions(forbidden_functions=(print.__name__,))
+        untracked = CheckUntracked(directories=("src",))
+        agito = Agito(modifiers=(LenAsBool(), checker, untracked))
+        plan = ExecutionPlan((agito,))
+        assert plan.whole_corpus == (untracked,)
+        (per_file,) = plan.per_file
+        assert plan.modifiers_by_index == (per_file, *per_file.modifiers)
+        assert plan.cacheable
+
+    def test_precompiles_every_modifier(self):
+        with patch.object(LenAsBool, "precompile") as mock_precompile:
+            ExecutionPlan((Agito(modifiers=(LenAsBool(),)),))
+        mock_precompile.assert_called_once_with()
+
+    def test_non_cacheable_modifier(self):
+        plan = ExecutionPlan((InstanceOfPydanticModelDetector(),))
+        assert not plan.cacheable
+
+    def test_import_placement_depends_on_installed_modules(self):
+        plan = ExecutionPlan((Agito(modifiers=(LocalImportsToTop(),)),))
+        assert not plan.cacheable
+
+    def test_schedules_largest_files_first(self, tmp_path: Path):
+        small, large, equal = _write_files(
+            tmp_path, "x = 1\n", ("small.py", "large.py", "equal.py")
+        )
+        large.write_text("x = 1\n" * 10)
+        missing = tmp_path / "missing.py"
+        paths = (small, large, equal, missing)
+        assert ExecutionPlan.schedule(paths) == [1, 0, 2, 3]
+
+    def test_results_are_yielded_in_file_order(self):
+        results = [_FileResult(False, ((index, ""),)) for index in (2, 0, 1)]
+        assert [
+            result.messages[0][0]
+            for result in _in_file_order([2, 0, 1], results)
+        ] == [0, 1, 2]
+
+
+class TestReplay:
+    def test_replays_through_modifier_outputs(self):
+        recorder = RecordingOutput()
+        _replay((LenAsBool(outputs=(recorder,)),), 0, "message")
+        assert recorder.messages == ["message"]
+
+    def test_unknown_modifier_goes_to_stdout(self, capsys):
+        _replay((), -1, "orphan message")
+        assert "orphan message" in capsys.readouterr().out
+
+
+class TestRunPipeline:
+    def test_merges_results_in_file_order(self, tmp_path: Path):
+        recorder = RecordingOutput()
+        paths = _write_files(tmp_path, "print(x)\n", ("a.py", "b.py", "c.py"))
+        checker = ForbiddenFunctions(
+            forbidden_functions=(print.__name__,), outputs=(recorder,)
+        )
+        assert run_pipeline((Agito(modifiers=(checker,)),), paths, 2)
+        assert [message.split(":")[0] for message in recorder.messages] == [
+            str(path) for path in paths
+        ]
+
+    def test_writes_transformed_files(self, tmp_path: Path):
+        paths = _write_files(tmp_path, "if len(x):\n    pass\n")
+        assert run_pipeline((LenAsBool(),), paths, 2)
+        for path in paths:
+            assert path.read_text() == "if x:\n    pass\n"
+
+    def test_accepts_a_stream_of_paths(self, tmp_path: Path):
+        paths = _write_files(tmp_path, "if len(x):\n    pass\n")
+        assert run_pipeline((LenAsBool(),), iter(paths), 2)
+        for path in paths:
+            assert path.read_text() == "if x:\n    pass\n"
+
+    def test_dry_run_leaves_files_unchanged(self, tmp_path: Path):
+        recorder = RecordingOutput()
+        paths = _write_files(tmp_path, "if len(x):\n    pass\n")
+        with dry_run(paths):
+            assert run_pipeline((LenAsBool(outputs=(recorder,)),), paths, 2)
+        for path, diff in zip(paths, recorder.messages, strict=True):
+            assert path.read_text() == "if len(x):\n    pass\n"
+            assert diff.startswith(f"--- a/{path}\n")
+
+    def test_only_whole_corpus_modifiers(self, tmp_path: Path):
+        paths = _write_files(tmp_path, "x = 1\n", ("a.py",))
+        modifier = CheckUntracked(directories=("src",))
+        with patch(_UNTRACKED_FILES, return_value=[]) as mock_untracked:
+            assert not run_pipeline((modifier,), paths, 2)
+        assert mock_untracked.call_count == 1
+
+    def test_whole_corpus_modifiers_read_every_file(self, tmp_path: Path):
+        recorder = RecordingOutput()
+        paths = _write_files(tmp_path, "if len(x):\n    pass\n")
+        stubs = GenerateStubs(directories=(tmp_path,), outputs=(recorder,))
+        with dry_run(paths):
+            assert run_pipeline((stubs, LenAsBool()), paths, 2)
+        assert recorder.messages == [
+            "Skipped generating stubs for 2 file(s) in a dry run"
+        ]
+
+    def test_no_files(self):
+        assert not run_pipeline((LenAsBool(),), (), 2)
+
+    def test_worker_exception_propagates(self, tmp_path: Path):
+        (path,) = _write_files(
+            tmp_path,
+            "from pydantic import BaseModel, ConfigDict\n"
+            "class Foo(BaseModel, frozen=True):\n"
+            "    model_config = ConfigDict(frozen=False)\n",
+            ("a.py",),
+        )
+        (other,) = _write_files(tmp_path, "x = 1\n", ("b.py",))
+        with pytest.raises(ValueError, match="Conflicting model_config"):
+            run_pipeline((PydanticConfigToModelConfig(),), [path, other], 2)
+
+    def test_each_run_refreshes_import_trackers(self):
+        with patch(_REFRESH_TRACKERS) as mock_refresh:
+            run_pipeline((LenAsBool(),), (), 2)
+        mock_refresh.assert_called_once_with(None)
+
+    def test_each_run_refreshes_module_indexes(self):
+        with patch(
+            f"{run_pipeline.__module__}.refresh_shared_module_indexes"
+        ) as mock_refresh:
+            run_pipeline((LenAsBool(),), (), 2)
+        mock_refresh.assert_called_once_with()
+
+    def test_import_trackers_persist_under_the_cache_dir(self, tmp_path: Path):
+        with patch(_REFRESH_TRACKERS) as mock_refresh:
+            run_pipeline((LenAsBool(),), (), 2, tmp_path)
+        mock_refresh.assert_called_once_with(tmp_path / "imports")
+
+    def test_import_resolution_stays_warm_across_runs(self, tmp_path: Path):
+        models = tmp_path / "models.py"
+        models.write_text(
+            "from pydantic import BaseModel\n"
+            "class Model(BaseModel):\n"
+            "    pass\n"
+        )
+        paths = _write_files(
+            tmp_path,
+            "from pydantic import InstanceOf\n"
+            "from models import Model\n"
+            "x: InstanceOf[Model]\n",
+            ("a.py",),
+        )
+        modifier = InstanceOfPydanticModelDetector(
+            source_roots=(str(tmp_path),)
+        )
+        assert run_pipeline((modifier,), paths, 1)
+        with patch.object(
+            ImportPathTracker, "_parse", wraps=ImportPathTracker._parse
+        ) as mock_parse:
+            assert run_pipeline((modifier,), paths, 1)
+            mock_parse.assert_not_called()
+            models.write_text("class Model:\n    pass\n")
+            assert not run_pipeline((modifier,), paths, 1)
+        mock_parse.assert_called_once_with(models)
+
+    def test_single_job_runs_in_process(self, tmp_path: Path):
+        paths = _write_files(tmp_path, "if len(x):\n    pass\n")
+        with patch(f"{run_pipeline.__module__}.ProcessPoolExecutor") as pool:
+            assert run_pipeline((LenAsBool(),), paths, 1)
+        pool.assert_not_called()
+        for path in paths:
+            assert path.read_text() == "if x:\n    pass\n"
+
+
+class TestRunPipelineCache:
+    def test_cached_messages_are_replayed(self, tmp_path: Path):
+        paths = _write_files(tmp_path, "print(x)\n", ("a.py",))
+        cache_dir = tmp_path / "cache"
+        first = RecordingOutput()
+        checker = ForbiddenFunctions(
+            forbidden_functions=(print.__name__,), outputs=(first,)
+        )
+        assert run_pipeline((checker,), paths, 1, cache_dir)
+        second = RecordingOutput()
+        checker = checker.model_copy(update={"outputs": (second,)})
+        with patch.object(_FilePipeline, "_run") as mock_run:
+            assert run_pipeline((checker,), paths, 1, cache_dir)
+        mock_run.assert_not_called()
+        assert second.messages == first.messages
+
+    def test_only_misses_are_processed(self, tmp_path: Path):
+        paths = _write_files(tmp_path, "x = 1\n")
+        cache_dir = tmp_path / "cache"
+        assert not run_pipeline((LenAsBool(),), paths[:1], 1, cache_dir)
+        with patch.object(
+            _FilePipeline, "_run", return_value=_FileResult(False, ())
+        ) as mock_run:
+            assert not run_pipeline((LenAsBool(),), paths, 1, cache_dir)
+        (file_data,), _ = mock_run.call_args
+        assert mock_run.call_count == 1
+        assert file_data.path == paths[1]
+
+    def test_modified_files_are_not_stored(self, tmp_path: Path):
+        paths = _write_files(tmp_path, "if len(x):\n    pass\n", ("a.py",))
+        cache_dir = tmp_path / "cache"
+        assert run_pipeline((LenAsBool(),), paths, 1, cache_dir)
+        assert not cache_dir.exists()
+
+    def test_workers_share_the_cache(self, tmp_path: Path):
+        paths = _write_files(tmp_path, "x = 1\n")
+        cache_dir = tmp_path / "cache"
+        assert not run_pipeline((LenAsBool(),), paths, 2, cache_dir)
+        assert len(list(cache_dir.glob("*/*.json"))) == 2
+
+    def test_non_cacheable_modifier_bypasses_cache(self, tmp_path: Path):
+        paths = _write_files(tmp_path, "x = 1\n", ("a.py",))
+        cache_dir = tmp_path / "cache"
+        modifier = InstanceOfPydanticModelDetector()
+        assert not run_pipeline((modifier,), paths, 1, cache_dir)
+        assert not cache_dir.exists()
+
+    def test_import_resolution_persists_across_runs(self, tmp_path: Path):
+        (tmp_path / "models.py").write_text(
+            "from pydantic import BaseModel\n"
+            "class Model(BaseModel):\n"
+            "    pass\n"
+        )
+        paths = _write_files(
+            tmp_path,
+            "from pydantic import InstanceOf\n"
+            "from models import Model\n"
+            "x: InstanceOf[Model]\n",
+            ("a.py",),
+        )
+        cache_dir = tmp_path / "cache"
+        modifier = InstanceOfPydanticModelDetector(
+            source_roots=(str(tmp_path),)
+        )
+        assert run_pipeline((modifier,), paths, 1, cache_dir)
+        with patch.object(ImportPathTracker, "_parse") as mock_parse:
+            assert run_pipeline((modifier,), paths, 1, cache_dir)
+        mock_parse.assert_not_called()
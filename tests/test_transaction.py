@@ -0,0 +1,276 @@
+import ctypes
+import os
+import sys
+from collections.abc import Generator
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from any_hook import _transaction
+from any_hook._transaction import (
+    Journal,
+    _is_running,
+    current_journal,
+    default_journal_dir,
+    dry_run,
+    is_dry_run,
+    set_dry_run,
+    set_journal,
+    transaction,
+    unified_diff,
+    write_file,
+)
+
+_DEAD_PID = 2**22 + 1
+
+
+class TestWriteFile:
+    def test_replaces_content_and_keeps_mode(self, tmp_path: Path):
+        path = tmp_path / "a.py"
+        path.write_text("x = 1\n")
+        path.chmod(0o751)
+        write_file(path, "x = 2\n")
+        assert path.read_text() == "x = 2\n"
+        assert path.stat().st_mode & 0o777 == 0o751
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_writes_through_symlinks(self, tmp_path: Path):
+        target = tmp_path / "a.py"
+        target.write_text("x = 1\n")
+        link = tmp_path / "link.py"
+        link.symlink_to(target)
+        write_file(link, "x = 2\n")
+        assert link.is_symlink()
+        assert target.read_text() == "x = 2\n"
+
+    def test_failed_write_leaves_file_intact(self, tmp_path: Path):
+        path = tmp_path / "a.py"
+        path.write_text("x = 1\n")
+        with (
+            patch.object(os, "replace", side_effect=OSError("disk full")),
+            pytest.raises(OSError, match="disk full"),
+        ):
+            write_file(path, "x = 2\n")
+        assert path.read_text() == "x = 1\n"
+        assert list(tmp_path.iterdir()) == [path]
+
+
+class TestJournal:
+    def test_backs_up_original_once(self, tmp_path: Path):
+        path = tmp_path / "a.py"
+        path.write_text("x = 1\n")
+        journal = Journal(tmp_path / "journal")
+        journal.directory.mkdir()
+        journal.write(path, "x = 2\n")
+        journal.write(path, "x = 3\n")
+        assert len(list(journal.directory.iterdir())) == 3
+        assert journal.roll_back()
+        assert path.read_text() == "x = 1\n"
+
+    def test_files_changed_since_written_are_not_restored(
+        self, tmp_path: Path, capsys
+    ):
+        edited, removed = tmp_path / "a.py", tmp_path / "b.py"
+        edited.write_text("x = 1\n")
+        removed.write_text("y = 1\n")
+        journal = Journal(tmp_path / "journal")
+        journal.directory.mkdir()
+        journal.write(edited, "x = 2\n")
+        journal.write(removed, "y = 2\n")
+        edited.write_text("x = 3\n")
+        removed.unlink()
+        assert not journal.roll_back()
+        assert edited.read_text() == "x = 3\n"
+        assert not removed.exists()
+        out = capsys.readouterr().out
+        assert f"{edited} was changed after any-hook wrote it" in out
+        assert f"{removed} was changed after any-hook wrote it" in out
+        assert sorted(
+            backup.read_text() for backup in journal.directory.glob("*.bak")
+        ) == ["x = 1\n", "y = 1\n"]
+
+    def test_set_journal(self, tmp_path: Path):
+        journal = Journal(tmp_path)
+        assert current_journal() is None
+        set_journal(journal)
+        try:
+            assert current_journal() is journal
+        finally:
+            set_journal(None)
+
+
+class TestTransaction:
+    def test_yields_python_files_only(self, tmp_path: Path):
+        paths = [tmp_path / "a.py", tmp_path / "b.txt"]
+        with transaction(paths, tmp_path / "journal") as python_paths:
+            assert list(python_paths) == paths[:1]
+
+    def test_backs_up_only_written_files(self, tmp_path: Path):
+        written, untouched = tmp_path / "a.py", tmp_path / "b.py"
+        written.write_text("x = 1\n")
+        untouched.write_text("y = 1\n")
+        journal_dir = tmp_path / "journal"
+        with transaction([written, untouched], journal_dir):
+            write_file(written, "x = 2\n")
+            (directory,) = journal_dir.iterdir()
+            assert len(list(directory.glob("*.bak"))) == 1
+        assert written.read_text() == "x = 2\n"
+        assert list(journal_dir.iterdir()) == []
+        assert current_journal() is None
+
+    def test_rolls_back_on_exception(self, tmp_path: Path, capsys):
+        path = tmp_path / "a.py"
+        path.write_text("x = 1\n")
+        journal_dir = tmp_path / "journal"
+        with pytest.raises(KeyboardInterrupt):
+            with transaction([path], journal_dir):
+                write_file(path, "x = 2\n")
+                raise KeyboardInterrupt
+        assert path.read_text() == "x = 1\n"
+        assert list(journal_dir.iterdir()) == []
+        assert "Changes reverted" in capsys.readouterr().out
+
+    def test_recovers_interrupted_runs(self, tmp_path: Path, capsys):
+        path = tmp_path / "a.py"
+        path.write_text("x = 1\n")
+        journal_dir = tmp_path / "journal"
+        interrupted = Journal(journal_dir / f"{_DEAD_PID}-run")
+        interrupted.directory.mkdir(parents=True)
+        interrupted.write(path, "x = 2\n")
+        running = journal_dir / f"{os.getpid()}-run"
+        running.mkdir()
+        foreign = journal_dir / "not-a-journal"
+        foreign.mkdir()
+        with transaction([path], journal_dir):
+            assert path.read_text() == "x = 1\n"
+        assert not interrupted.directory.exists()
+        assert running.exists()
+        assert foreign.exists()
+        assert "interrupted run" in capsys.readouterr().out
+
+    def test_keeps_backups_of_files_edited_after_a_crash(
+        self, tmp_path: Path, capsys
+    ):
+        path = tmp_path / "a.py"
+        path.write_text("x = 1\n")
+        journal_dir = tmp_path / "journal"
+        interrupted = Journal(journal_dir / f"{_DEAD_PID}-run")
+        interrupted.directory.mkdir(parents=True)
+        interrupted.write(path, "x = 2\n")
+        path.write_text("x = 3\n")
+        for _ in range(2):
+            with transaction([path], journal_dir):
+                pass
+        assert path.read_text() == "x = 3\n"
+        (kept,) = journal_dir.iterdir()
+        assert kept.name == f"kept-{_DEAD_PID}-run"
+        (backup,) = kept.glob("*.bak")
+        assert backup.read_text() == "x = 1\n"
+        assert capsys.readouterr().out.count("was changed after") == 1
+
+    def test_foreign_process_counts_as_running(self, tmp_path: Path):
+        journal_dir = tmp_path / "journal"
+        (journal_dir / f"{_DEAD_PID}-run").mkdir(parents=True)
+        with (
+            patch.object(os, "kill", side_effect=PermissionError),
+            transaction([], journal_dir),
+        ):
+            pass
+        assert (journal_dir / f"{_DEAD_PID}-run").exists()
+
+    def test_default_journal_dir(self):
+        with patch.object(
+            _transaction, "default_journal_dir", wraps=default_journal_dir
+        ) as mock_default:
+            with transaction([]):
+                pass
+        mock_default.assert_called_once()
+
+    def test_default_journal_dir_is_per_user_and_repository(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        here = default_journal_dir()
+        assert here.name.startswith(f"any-hook-journal-{os.getuid()}-")
+        assert default_journal_dir() == here
+        monkeypatch.chdir(tmp_path)
+        assert default_journal_dir() != here
+
+    def test_default_journal_dir_on_windows(self):
+        with (
+            patch.object(sys, "platform", "win32"),
+            patch.object(os, "getuid", side_effect=AttributeError),
+        ):
+            name = default_journal_dir().name
+        assert name.startswith("any-hook-journal-")
+        assert name.count("-") == 3
+
+
+class TestIsRunningOnWindows:
+    @pytest.fixture
+    def kernel32(self) -> Generator[Mock, None, None]:
+        with (
+            patch.object(sys, "platform", "win32"),
+            patch.object(ctypes, "windll", create=True) as mock_windll,
+            patch.object(os, "kill", side_effect=AssertionError),
+        ):
+            yield mock_windll.kernel32
+
+    @pytest.mark.parametrize("exit_code,running", [(259, True), (0, False)])
+    def test_exit_code_of_the_process(
+        self, kernel32: Mock, exit_code: int, running: bool
+    ):
+        def get_exit_code(handle: int, reference: ctypes.c_ulong) -> int:
+            reference.value = exit_code
+            return 1
+
+        kernel32.OpenProcess.return_value = 7
+        kernel32.GetExitCodeProcess.side_effect = get_exit_code
+        # Hands the exit code variable itself to the fake kernel32
+        with patch.object(ctypes, "byref", side_effect=lambda value: value):
+            assert _is_running(1234) is running
+        kernel32.CloseHandle.assert_called_once_with(7)
+
+    @pytest.mark.parametrize("error,running", [(5, True), (87, False)])
+    def test_process_that_cannot_be_opened(
+        self, kernel32: Mock, error: int, running: bool
+    ):
+        kernel32.OpenProcess.return_value = 0
+        kernel32.GetLastError.return_value = error
+        assert _is_running(1234) is running
+
+
+class TestDryRun:
+    def test_suppresses_writes(self, tmp_path: Path):
+        path = tmp_path / "a.py"
+        path.write_text("x = 1\n")
+        paths = [path, tmp_path / "b.txt"]
+        with dry_run(paths) as python_paths:
+            assert list(python_paths) == paths[:1]
+            assert is_dry_run()
+            write_file(path, "x = 2\n")
+        assert not is_dry_run()
+        assert path.read_text() == "x = 1\n"
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_set_dry_run(self):
+        set_dry_run(True)
+        try:
+            assert is_dry_run()
+        finally:
+            set_dry_run(False)
+
+
+class TestUnifiedDiff:
+    def test_diff_of_file(self):
+        diff = unified_diff(Path("a.py"), "x = 1\ny = 2\n", "x = 1\ny = 3\n")
+        assert diff == (
+            "--- a/a.py\n+++ b/a.py\n@@ -1,2 +1,2 @@\n x = 1\n-y = 2\n+y = 3"
+        )
+
+    def test_missing_final_newline_is_marked(self):
+        assert unified_diff(Path("a.py"), "x = 1", "x = 2") == (
+            "--- a/a.py\n+++ b/a.py\n@@ -1 +1 @@\n-x = 1\n"
+            "\\ No newline at end of file\n+x = 2\n"
+            "\\ No newline at end of file"
+        )